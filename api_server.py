@@ -0,0 +1,298 @@
+"""
+Hotel Management System - HTTP API
+A small JSON API over database.py for the channel manager and kiosks,
+built on the standard library http.server.
+
+Requests run on a fixed pool of worker threads. database.py keeps one
+SQLite connection per thread, so the pool doubles as the connection pool.
+GET responses carry an ETag and answer If-None-Match with 304.
+When HOTEL_API_TOKEN (or --token) is set, every request needs
+"Authorization: Bearer <token>".
+
+Run: python api_server.py --port 8080 [--workers 8] [--db hotel.db]
+
+  GET  /rooms[?status=available]           GET  /bookings[?status=active&limit=100]
+  GET  /rooms/available?from=...&to=...    GET  /bookings/<id>
+  GET  /guests?q=<name/phone/NID>          POST /bookings            {room_id, guest_id, check_in, check_out, ...}
+  POST /guests   {full_name, phone, ...}   POST /bookings/<id>/cancel
+  GET  /stats                              POST /bookings/<id>/checkout
+  GET  /stats/queries[?top=20]              GET  /bookings/<id>/invoice
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import database
+import query_stats
+from money import Money, json_default
+
+MAX_BODY = 64 * 1024
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _arg(query, name, default=None, required=False):
+    value = query.get(name, [default])[0]
+    if required and not value:
+        raise HTTPError(400, f"missing query parameter '{name}'")
+    return value
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"'{name}' must be an integer")
+
+
+def _found(value, what):
+    if value is None:
+        raise HTTPError(404, f"{what} not found")
+    return value
+
+
+# ── Handlers: (query, body, *path groups) -> (status, payload) ───────────────
+def list_rooms(q, body):
+    status = _arg(q, "status")
+    return 200, [r for r in database.get_all_rooms() if status in (None, r["status"])]
+
+
+def available_rooms(q, body):
+    return 200, database.get_available_rooms(_arg(q, "from", required=True),
+                                             _arg(q, "to", required=True))
+
+
+def search_guests(q, body):
+    limit = _int(_arg(q, "limit", 50), "limit")
+    query = _arg(q, "q", "")
+    if not query:
+        return 200, database.get_guests_page(limit=limit)[0]
+    return 200, database.search_guests(query, limit=limit)
+
+
+def add_guest(q, body):
+    if not str(body.get("full_name", "")).strip():
+        raise HTTPError(400, "full_name is required")
+    gid = database.add_guest(body["full_name"].strip(), body.get("phone", ""), body.get("email", ""),
+                             body.get("nid", ""), body.get("address", ""))
+    return 201, {"id": gid}
+
+
+def list_bookings(q, body):
+    limit = min(_int(_arg(q, "limit", 100), "limit"), 1000)
+    return 200, database.get_bookings_page(limit=limit, status=_arg(q, "status"))[0]
+
+
+def get_booking(q, body, bid):
+    return 200, _found(database.get_booking(int(bid)), f"booking {bid}")
+
+
+def create_booking(q, body):
+    try:
+        room_id, guest_id = int(body["room_id"]), int(body["guest_id"])
+        check_in, check_out = str(body["check_in"]), str(body["check_out"])
+        nights = (date.fromisoformat(check_out) - date.fromisoformat(check_in)).days
+    except (KeyError, TypeError, ValueError):
+        raise HTTPError(400, "room_id, guest_id, check_in and check_out (YYYY-MM-DD) are required")
+    room = _found(database.get_room(room_id), f"room {room_id}")
+    total = Money.parse(body.get("total_amount", nights * room["price_per_night"]))
+    bid = database.create_booking(room_id, guest_id, check_in, check_out, nights, total,
+                                  Money.parse(body.get("advance_paid", 0)), body.get("notes", ""))
+    return 201, database.get_booking(bid)
+
+
+def cancel_booking(q, body, bid):
+    _found(database.get_booking(int(bid)), f"booking {bid}")
+    database.cancel_booking(int(bid))
+    return 200, database.get_booking(int(bid))
+
+
+def checkout_booking(q, body, bid):
+    _found(database.get_booking(int(bid)), f"booking {bid}")
+    database.checkout_booking(int(bid))
+    return 200, database.get_booking(int(bid))
+
+
+def get_invoice(q, body, bid):
+    return 200, _found(database.get_invoice_by_booking(int(bid)), f"invoice for booking {bid}")
+
+
+def stats(q, body):
+    return 200, database.get_dashboard_stats()
+
+
+def query_timings(q, body):
+    return 200, query_stats.snapshot(top=_int(_arg(q, "top", 20), "top"))
+
+
+ROUTES = [
+    ("GET",  r"/rooms",                      list_rooms),
+    ("GET",  r"/rooms/available",            available_rooms),
+    ("GET",  r"/guests",                     search_guests),
+    ("POST", r"/guests",                     add_guest),
+    ("GET",  r"/bookings",                   list_bookings),
+    ("POST", r"/bookings",                   create_booking),
+    ("GET",  r"/bookings/(\d+)",             get_booking),
+    ("POST", r"/bookings/(\d+)/cancel",      cancel_booking),
+    ("POST", r"/bookings/(\d+)/checkout",    checkout_booking),
+    ("GET",  r"/bookings/(\d+)/invoice",     get_invoice),
+    ("GET",  r"/stats",                      stats),
+    ("GET",  r"/stats/queries",              query_timings),
+]
+ROUTES = [(m, re.compile(p + r"/?"), fn) for m, p, fn in ROUTES]
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "HotelAPI/1.0"
+    token = None
+    quiet = True
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        try:
+            if self.token and self.headers.get("Authorization") != f"Bearer {self.token}":
+                raise HTTPError(401, "missing or wrong bearer token")
+            fn, groups = self._route(method, url.path)
+            body = self._read_json() if method == "POST" else {}
+            status, payload = fn(parse_qs(url.query), body, *groups)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except database.BookingConflict as e:
+            status, payload = 409, {"error": str(e)}
+        except (ValueError, database.sqlite3.IntegrityError) as e:
+            status, payload = 400, {"error": str(e)}    # e.g. FOREIGN KEY: unknown guest_id
+        except database.sqlite3.OperationalError as e:
+            if not database._is_lock_error(e):
+                self.log_error("%s %s failed: %r", method, self.path, e)
+                status, payload = 500, {"error": "internal error"}
+            else:
+                status, payload = 503, {"error": "database busy, retry"}
+        except Exception as e:
+            self.log_error("%s %s failed: %r", method, self.path, e)
+            status, payload = 500, {"error": "internal error"}
+        self._send(method, status, payload)
+
+    def _route(self, method, path):
+        allowed = False
+        for m, pattern, fn in ROUTES:
+            match = pattern.fullmatch(path)
+            if match:
+                if m == method:
+                    return fn, match.groups()
+                allowed = True
+        raise HTTPError(405 if allowed else 404, f"{method} {path} not supported")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise HTTPError(413, "request body too large")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body must be JSON")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return body
+
+    def _send(self, method, status, payload):
+        data = json.dumps(payload, ensure_ascii=False, default=json_default).encode()
+        etag = None
+        if method == "GET" and status == 200:
+            etag = '"%s"' % hashlib.blake2b(data, digest_size=12).hexdigest()
+            if etag in self.headers.get("If-None-Match", ""):
+                status, data = 304, b""
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands each request to a fixed ThreadPoolExecutor."""
+
+    request_queue_size = 128    # the default backlog of 5 drops bursts (1 s SYN retry)
+
+    def __init__(self, address, handler, workers=8):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def make_server(host="127.0.0.1", port=8080, workers=8, token=None, quiet=True):
+    handler = type("ConfiguredHandler", (Handler,), {"token": token, "quiet": quiet})
+    return PooledHTTPServer((host, port), handler, workers)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Serve the hotel database as a JSON API.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--workers", type=int, default=8, help="threads (= pooled connections)")
+    p.add_argument("--token", default=os.environ.get("HOTEL_API_TOKEN"),
+                   help="require this bearer token (default: $HOTEL_API_TOKEN)")
+    p.add_argument("--db", help="database file (default: hotel.db)")
+    p.add_argument("--no-wal", action="store_true",
+                   help="keep the rollback journal (database on a network share)")
+    p.add_argument("--verbose", action="store_true", help="log every request")
+    args = p.parse_args(argv)
+
+    if args.db:
+        database.configure(db_path=args.db)
+    # The API writes alongside the reception terminals: WAL + busy timeout + retries.
+    database.enable_concurrency_mode(wal=not args.no_wal)
+    database.initialize_database()
+    server = make_server(args.host, args.port, args.workers, args.token, not args.verbose)
+    print(f"Serving {database.DB_PATH} on http://{args.host}:{args.port} "
+          f"({args.workers} workers)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        database.checkpoint()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
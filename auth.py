@@ -2,7 +2,7 @@
 Hotel Management System - Authentication Module
 """
 import hashlib
-from database import get_connection
+from database import get_connection, transaction, retry_on_lock
 
 
 def _hash_password(password: str) -> str:
@@ -14,15 +14,14 @@ def login(username: str, password: str):
     Verify credentials.
     Returns user dict on success, None on failure.
     """
-    conn = get_connection()
-    row = conn.execute(
+    row = get_connection().execute(
         "SELECT * FROM users WHERE username=? AND password=?",
         (username, _hash_password(password))
     ).fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
+@retry_on_lock
 def register(username: str, password: str, role: str, full_name: str):
     """
     Register a new user.
@@ -33,45 +32,38 @@ def register(username: str, password: str, role: str, full_name: str):
     if len(password) < 6:
         return False, "Password must be at least 6 characters."
 
-    conn = get_connection()
-    existing = conn.execute("SELECT id FROM users WHERE username=?", (username,)).fetchone()
-    if existing:
-        conn.close()
-        return False, f"Username '{username}' already exists."
+    with transaction() as conn:
+        existing = conn.execute("SELECT id FROM users WHERE username=?", (username,)).fetchone()
+        if existing:
+            return False, f"Username '{username}' already exists."
 
-    cursor = conn.execute(
-        "INSERT INTO users (username, password, role, full_name) VALUES (?, ?, ?, ?)",
-        (username, _hash_password(password), role, full_name)
-    )
-    uid = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return True, uid
+        cursor = conn.execute(
+            "INSERT INTO users (username, password, role, full_name) VALUES (?, ?, ?, ?)",
+            (username, _hash_password(password), role, full_name)
+        )
+    return True, cursor.lastrowid
 
 
+@retry_on_lock
 def change_password(username: str, old_password: str, new_password: str):
     """Change a user's password. Returns (True, '') or (False, error)."""
     if not login(username, old_password):
         return False, "Current password is incorrect."
     if len(new_password) < 6:
         return False, "New password must be at least 6 characters."
-    conn = get_connection()
-    conn.execute("UPDATE users SET password=? WHERE username=?",
-                 (_hash_password(new_password), username))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE users SET password=? WHERE username=?",
+                     (_hash_password(new_password), username))
     return True, ""
 
 
 def get_all_users():
-    conn = get_connection()
-    rows = conn.execute("SELECT id, username, role, full_name, created_at FROM users").fetchall()
-    conn.close()
+    rows = get_connection().execute(
+        "SELECT id, username, role, full_name, created_at FROM users").fetchall()
     return [dict(r) for r in rows]
 
 
+@retry_on_lock
 def delete_user(user_id: int):
-    conn = get_connection()
-    conn.execute("DELETE FROM users WHERE id=?", (user_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("DELETE FROM users WHERE id=?", (user_id,))
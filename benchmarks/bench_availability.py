@@ -0,0 +1,79 @@
+"""
+Availability engine at scale: 500 rooms with five years of back-to-back
+bookings (four years of history, one year of future reservations).
+Times get_available_rooms() for random stays across the whole range.
+
+Run: python benchmarks/bench_availability.py [rooms] [years]
+"""
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from common import database, temp_database
+
+
+def _seed(n_rooms, years, rng):
+    today = date.today()
+    start = today - timedelta(days=365 * (years - 1))
+    end = today + timedelta(days=365)
+    with database.transaction() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO rooms (room_number, room_type, floor, price_per_night) "
+            "VALUES (?, 'Standard', ?, 1500)",
+            [(f"{100 + i // 50}{i % 50:02d}", 4 + i // 50) for i in range(n_rooms - 30)])
+        conn.executemany("INSERT INTO guests (full_name) VALUES (?)",
+                         [(f"Guest {i}",) for i in range(1000)])
+        room_ids = [r[0] for r in conn.execute("SELECT id FROM rooms")]
+        rows = []
+        for room_id in room_ids:
+            day = start
+            while day < end:
+                day += timedelta(days=rng.randint(0, 3))
+                nights = rng.randint(1, 7)
+                out = day + timedelta(days=nights)
+                if out <= today:
+                    status = "cancelled" if rng.random() < 0.05 else "checked_out"
+                else:
+                    status = "active"
+                rows.append((room_id, rng.randint(1, 1000), str(day), str(out),
+                             nights, nights * 1500, status))
+                day = out
+        conn.executemany(
+            "INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,"
+            " total_amount, status) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(room_ids), len(rows), start, end
+
+
+def _bench(label, start, end, rng, queries=200):
+    span = (end - start).days
+    times = []
+    for _ in range(queries):
+        ci = start + timedelta(days=rng.randrange(span))
+        co = ci + timedelta(days=rng.randint(1, 7))
+        t = time.perf_counter()
+        database.get_available_rooms(ci, co)
+        times.append((time.perf_counter() - t) * 1000)
+    times.sort()
+    print(f"{label:<38}mean {statistics.mean(times):6.2f} ms   "
+          f"p95 {times[int(len(times) * 0.95)]:6.2f} ms   max {times[-1]:6.2f} ms")
+
+
+def main(n_rooms=500, years=5):
+    rng = random.Random(42)
+    with temp_database():
+        t = time.perf_counter()
+        rooms, bookings, start, end = _seed(n_rooms, years, rng)
+        print(f"seeded {rooms} rooms / {bookings} bookings in {time.perf_counter() - t:.1f}s")
+        _bench("get_available_rooms (any date)", start, end, rng)
+        _bench("get_available_rooms (next 30 days)", date.today(),
+               date.today() + timedelta(days=30), rng)
+        # Worst case: nobody ever checked out, every historic booking still active
+        with database.transaction() as conn:
+            conn.execute("UPDATE bookings SET status='active' WHERE status='checked_out'")
+        _bench("all history left active", start, end, rng)
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
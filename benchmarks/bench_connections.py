@@ -0,0 +1,46 @@
+"""
+Per-call latency of the database.py / auth.py helpers with a fresh
+connection per call (the old behaviour) versus the shared per-thread
+connection.
+
+Run: python benchmarks/bench_connections.py [calls]
+"""
+import sys
+
+from common import database, temp_database, time_calls
+import auth
+
+
+def _seed():
+    for i in range(200):
+        gid = database.add_guest(f"Guest {i}", f"0170000{i:04d}", "", f"NID{i}", "")
+        if i < 20:
+            database.create_booking(i + 1, gid, "2026-01-01", "2026-01-03", 2, 3000, 500, "")
+
+
+def main(calls=500):
+    helpers = [
+        ("get_settings",         database.get_settings),
+        ("get_all_rooms",        database.get_all_rooms),
+        ("get_all_guests",       database.get_all_guests),
+        ("search_guests",        lambda: database.search_guests("Guest 1")),
+        ("get_all_bookings",     database.get_all_bookings),
+        ("get_active_bookings",  database.get_active_bookings),
+        ("search_bookings",      lambda: database.search_bookings("10")),
+        ("get_invoice_by_booking", lambda: database.get_invoice_by_booking(1)),
+        ("get_dashboard_stats",  database.get_dashboard_stats.__wrapped__),
+        ("get_revenue_report",   lambda: database.get_revenue_report("2000-01-01", "2100-01-01")),
+        ("update_room_status",   lambda: database.update_room_status(30, "available")),
+        ("auth.login",           lambda: auth.login("admin", "admin123")),
+    ]
+    with temp_database():
+        _seed()
+        print(f"{'helper':<26}{'per-call conn (us)':>20}{'shared conn (us)':>20}{'speed-up':>10}")
+        for name, fn in helpers:
+            before = time_calls(fn, calls, after_each=database.close_connections)
+            after = time_calls(fn, calls)
+            print(f"{name:<26}{before:>20.1f}{after:>20.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,75 @@
+"""
+Bulk import throughput: importer.import_guests / import_bookings on
+generated CSV files versus calling add_guest() once per row.
+About 1% of guest rows are invalid and 2% duplicate an earlier phone.
+
+Run: python benchmarks/bench_import.py [guests]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+from common import database, temp_database
+import importer
+
+
+def _write_guests(path, n, rng):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["full_name", "phone", "email", "nid", "address"])
+        for i in range(n):
+            r = rng.random()
+            phone = f"+880 17{rng.randrange(i + 1):08d}" if r < 0.02 else f"+880 17{i:08d}"
+            name = "" if r > 0.99 else f"Guest {i}"
+            w.writerow([name, phone, f"g{i}@example.com", f"NID{i:010d}", "Dhaka"])
+
+
+def _write_bookings(path, n, rng):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["room_number", "phone", "guest_name", "check_in", "check_out",
+                    "total_amount", "status", "created_at"])
+        for i in range(n):
+            day = 1 + rng.randrange(28)
+            w.writerow([f"{rng.randint(1, 3)}{rng.randint(1, 10):02d}", f"+880 17{i % 50000:08d}",
+                        f"Guest {i}", f"2024-03-{day:02d}", f"2024-04-{day:02d}",
+                        rng.randint(1, 90) * 100, "checked_out", f"2024-02-{day:02d} 10:00:00"])
+
+
+def main(n=300000):
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        guests_csv, bookings_csv = os.path.join(tmp, "g.csv"), os.path.join(tmp, "b.csv")
+        _write_guests(guests_csv, n, rng)
+        _write_bookings(bookings_csv, n // 3, rng)
+
+        with temp_database():
+            sample = 2000
+            t = time.perf_counter()
+            for i in range(sample):
+                database.add_guest(f"Guest {i}", f"0170{i:07d}", "", "", "")
+            per_row = (time.perf_counter() - t) / sample
+            print(f"{'add_guest() per row':<28}{1 / per_row:>12,.0f} rows/s")
+
+        with temp_database():
+            t = time.perf_counter()
+            rep = importer.import_guests(importer.read_rows(guests_csv))
+            dt = time.perf_counter() - t
+            print(f"{'import_guests':<28}{n / dt:>12,.0f} rows/s   {dt:6.1f} s  "
+                  f"({rep['inserted']} inserted, {rep['duplicates']} duplicates, "
+                  f"{len(rep['errors'])} rejected)")
+
+            t = time.perf_counter()
+            rep = importer.import_bookings(importer.read_rows(bookings_csv))
+            dt = time.perf_counter() - t
+            print(f"{'import_bookings':<28}{n // 3 / dt:>12,.0f} rows/s   {dt:6.1f} s  "
+                  f"({rep['inserted']} inserted, {len(rep['errors'])} rejected)")
+            print(f"search index in sync: {database.search_guests('Guest 12345')[0]['full_name']!r}, "
+                  f"daily_revenue mismatches: {len(database.check_daily_revenue())}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300000)
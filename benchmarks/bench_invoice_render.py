@@ -0,0 +1,76 @@
+"""
+Invoice rendering: one Generate/Save render the old way (settings and
+invoice re-read, text rebuilt each call) versus invoice_render.render()
+with its caches, then a month archive of N PDF invoices rendered
+in-process versus in a process pool.
+
+Run: python benchmarks/bench_invoice_render.py [invoices]
+"""
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+from common import database, temp_database, time_calls
+import invoice_render
+
+MONTH = "2026-03"
+
+
+def _seed(n):
+    with database.transaction() as conn:
+        conn.execute("INSERT INTO guests (full_name, phone) VALUES ('Bench Guest', '01700000000')")
+        conn.executemany("""
+            INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
+                                  total_amount, advance_paid, status)
+            VALUES (?, 1, '2026-03-01', '2026-03-03', 2, ?, 50000, 'checked_out')
+        """, [(i % 30 + 1, 3000_00 + i) for i in range(n)])
+        stem, first = database.allocate_invoice_numbers(conn, n, 2026)
+        conn.execute("""
+            INSERT INTO invoices (booking_id, invoice_number, amount, paid_amount, status, issued_at)
+            SELECT id, printf('%s%06d', ?, ? + id - 1), total_amount, 50000, 'partial',
+                   DATETIME('2026-03-01', '+' || (id % 28) || ' days')
+            FROM bookings
+        """, (stem, first))
+
+
+def uncached(booking):
+    """What BillingPage._build_invoice_text did on every Generate and Save."""
+    settings = database.get_settings()
+    invoice = database.get_invoice_by_booking(booking["id"])
+    hotel = (settings.get("hotel_name", "Grand Hotel"), settings.get("hotel_address", ""),
+             settings.get("hotel_phone", ""), float(settings.get("tax_rate", 0)), "BDT")
+    return invoice_render.render_context(invoice_render.invoice_context(booking, invoice, hotel))
+
+
+def main(n=5000):
+    with temp_database():
+        _seed(n)
+        booking = database.get_booking(1)
+        invoice = database.get_invoice_by_booking(1)
+        old = time_calls(lambda: uncached(booking), 2000)
+        new = time_calls(lambda: invoice_render.render(booking, "text", invoice), 2000)
+        pdf = time_calls(lambda: invoice_render.render_context(
+            invoice_render.invoice_context(booking, invoice, invoice_render.hotel_settings()),
+            "pdf"), 2000)
+        print(f"one invoice: re-read + render {old:7.1f} us, cached render {new:5.1f} us, "
+              f"uncached PDF {pdf:6.1f} us")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for workers in (1, 4):
+                path = os.path.join(tmp, f"archive_{workers}.zip")
+                start = time.perf_counter()
+                count = invoice_render.month_archive(MONTH, path, "pdf", workers=workers)
+                elapsed = time.perf_counter() - start
+                with zipfile.ZipFile(path) as z:
+                    files = len(z.namelist())
+                label = "in-process" if workers == 1 else f"{workers} processes"
+                print(f"month archive, {label:>12}: {count} invoices, {files} files, "
+                      f"{elapsed * 1000:6.0f} ms, {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"({os.cpu_count()} CPU(s); the pool only pays off with several cores)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:2])))
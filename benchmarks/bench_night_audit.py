@@ -0,0 +1,82 @@
+"""
+Night audit over 10,000 checked-out bookings (+ in-house guests and
+overstays) versus invoicing them one by one the way the Billing page does
+(get_invoice_by_booking + create_invoice per booking). A second audit of
+the same date must post nothing; exits 1 if it does or if numbers collide.
+
+Run: python benchmarks/bench_night_audit.py [bookings]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from common import database, temp_database
+import night_audit
+
+DAY = "2026-03-31"
+
+
+def _seed(n, rng):
+    """n checked-out bookings, n/5 active around DAY (some overstaying), n/50 overstaying."""
+    rows = []
+    for i in range(n + n // 5 + n // 50):
+        nights = rng.randint(1, 7)
+        if i < n:
+            status, ci = "checked_out", f"2026-03-{rng.randint(1, 20):02d}"
+        elif i < n + n // 5:
+            status, ci = "active", f"2026-03-{rng.randint(25, 31):02d}"
+        else:
+            status, ci, nights = "active", f"2026-03-{rng.randint(20, 28):02d}", 1
+        co = (date.fromisoformat(ci) + timedelta(days=nights)).isoformat()
+        rows.append((rng.randint(1, 30), 1, ci, co,
+                     nights, nights * 1500_00, rng.choice([0, 500_00, nights * 1500_00]), status))
+    with database.transaction() as conn:
+        conn.execute("INSERT INTO guests (full_name) VALUES ('Bench')")
+        conn.executemany("""
+            INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
+                                  total_amount, advance_paid, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+
+def per_booking():
+    rows = database.get_connection().execute(
+        "SELECT id, total_amount, advance_paid FROM bookings WHERE status = 'checked_out'")
+    for b in rows.fetchall():
+        if not database.get_invoice_by_booking(b["id"]):
+            database.create_invoice(b["id"], b["total_amount"], 0, 0, b["advance_paid"])
+
+
+def main(n=10000):
+    with temp_database():
+        _seed(n, random.Random(3))
+        start = time.perf_counter()
+        per_booking()
+        loop = time.perf_counter() - start
+
+    with temp_database():
+        _seed(n, random.Random(3))
+        start = time.perf_counter()
+        first = night_audit.audit_day(DAY)
+        batch = time.perf_counter() - start
+        again = night_audit.audit_day(DAY)
+        conn = database.get_connection()
+        numbers = conn.execute("SELECT COUNT(*), COUNT(DISTINCT invoice_number), "
+                               "MIN(invoice_number), MAX(invoice_number) FROM invoices").fetchone()
+
+    print(f"{n} checked-out bookings")
+    print(f"  per booking (Billing page loop): {loop * 1000:8.0f} ms")
+    print(f"  night audit (set-based)        : {batch * 1000:8.0f} ms   ({loop / batch:.0f}x)")
+    print(f"  first run : {first['invoices']} invoices, {first['charges']} room charges, "
+          f"{len(first['overstays'])} overstays")
+    print(f"  second run: {again['invoices']} invoices, {again['charges']} room charges")
+    print(f"  numbers   : {numbers[0]} issued, {numbers[1]} distinct, {numbers[2]} .. {numbers[3]}")
+    ok = (first["invoices"] == n and again["invoices"] == again["charges"] == 0
+          and numbers[0] == numbers[1] == n)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:2])))
@@ -0,0 +1,92 @@
+"""
+Building and refreshing the room grid with N rooms: the old layout (one
+Frame + four Labels + bindings per room, rebuilt on every change) versus
+ui.room_map.RoomMap (one Canvas, items recoloured in place).
+
+Needs a display (Tk widgets cannot be created headless); exits with a
+note otherwise.
+
+Run: python benchmarks/bench_room_map.py [rooms]
+"""
+import sys
+import time
+
+import common  # noqa: F401  (puts the project root on sys.path)
+
+
+def _rooms(n):
+    types = ("Standard", "Deluxe", "Suite")
+    return [{"id": i + 1, "room_number": f"{i // 100 + 1}{i % 100:02d}", "floor": i // 100 + 1,
+             "room_type": types[i % 3], "price_per_night": 2500.0 + 500 * (i % 3),
+             "status": "available", "description": None} for i in range(n)]
+
+
+def _widget_grid(tk, parent, rooms):
+    """The per-room widget layout RoomsPage used before RoomMap."""
+    grid = tk.Frame(parent)
+    grid.pack()
+    for i, room in enumerate(rooms):
+        card = tk.Frame(grid, bg="#10b981", width=110, height=110)
+        card.grid(row=room["floor"] * 3, column=i % 100, padx=8, pady=6)
+        card.pack_propagate(False)
+        for text in ("🏠", f"Room {room['room_number']}", room["room_type"],
+                     f"৳{room['price_per_night']:,.0f}"):
+            tk.Label(card, text=text, bg="#10b981").pack()
+        for w in [card] + card.winfo_children():
+            w.bind("<Button-1>", lambda e, r=room: None)
+        card.bind("<Enter>", lambda e: None)
+        card.bind("<Leave>", lambda e: None)
+    return grid
+
+
+def main(n=1000):
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        print(f"No display available ({e}); this benchmark needs Tk.")
+        return
+    from ui.room_map import RoomMap
+
+    rooms = _rooms(n)
+    print(f"{n} rooms")
+
+    t = time.perf_counter()
+    grid = _widget_grid(tk, root, rooms)
+    root.update_idletasks()
+    build_old = time.perf_counter() - t
+    t = time.perf_counter()
+    grid.destroy()
+    grid = _widget_grid(tk, root, rooms)
+    root.update_idletasks()
+    rebuild_old = time.perf_counter() - t
+    grid.destroy()
+
+    rm = RoomMap(root)
+    rm.frame.pack()
+    t = time.perf_counter()
+    rm.draw(rooms)
+    root.update_idletasks()
+    build_new = time.perf_counter() - t
+    changed = dict(rooms[n // 2], status="booked")
+    t = time.perf_counter()
+    rm.update_room(changed)
+    root.update_idletasks()
+    update_new = time.perf_counter() - t
+
+    t = time.perf_counter()
+    for i in range(10000):
+        rm.room_at(i % 1200, (i * 7) % (n // 10 * 126))
+    hit = (time.perf_counter() - t) / 10000
+
+    print(f"{'widgets: initial build':<32}{build_old * 1000:>10.1f} ms")
+    print(f"{'widgets: rebuild on change':<32}{rebuild_old * 1000:>10.1f} ms")
+    print(f"{'RoomMap.draw':<32}{build_new * 1000:>10.1f} ms")
+    print(f"{'RoomMap.update_room':<32}{update_new * 1000:>10.3f} ms")
+    print(f"{'RoomMap.room_at':<32}{hit * 1e6:>10.2f} us")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,44 @@
+"""
+Guest/booking search latency with 200k guests, for typical front-desk
+queries: name prefixes, name fragments, phone tails and NID fragments.
+
+Run: python benchmarks/bench_search.py [guests]
+"""
+import random
+import sys
+import time
+
+from common import database, temp_database
+
+FIRST = ["Sakib", "Rahim", "Karim", "Nusrat", "Farhana", "Tanvir", "Ayesha", "Imran", "Sadia", "Hasan"]
+LAST = ["Hasan", "Ahmed", "Khan", "Islam", "Rahman", "Chowdhury", "Hossain", "Akter"]
+QUERIES = ["s", "sa", "sak", "Sakib Has", "nusrat kh", "5678", "01712-34", "4821", "101"]
+
+
+def main(n_guests=200000):
+    rng = random.Random(7)
+    with temp_database():
+        with database.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO guests (full_name, phone, nid) VALUES (?, ?, ?)",
+                [(f"{rng.choice(FIRST)} {rng.choice(LAST)}", f"017{rng.randrange(10 ** 8):08d}",
+                  f"{rng.randrange(10 ** 10):010d}") for _ in range(n_guests)])
+            conn.executemany(
+                "INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights, total_amount,"
+                " status) VALUES (?, ?, '2026-01-01', '2026-01-02', 1, 1500, 'checked_out')",
+                [(rng.randint(1, 30), rng.randint(1, n_guests)) for _ in range(n_guests // 2)])
+        index = "FTS5 trigram" if database.has_search_index() else "LIKE fallback"
+        print(f"{n_guests} guests, {index}")
+        for q in QUERIES:
+            t = time.perf_counter()
+            guests = database.search_guests(q)
+            tg = (time.perf_counter() - t) * 1000
+            t = time.perf_counter()
+            bookings = database.search_bookings(q)
+            tb = (time.perf_counter() - t) * 1000
+            print(f"{q!r:<14}search_guests {tg:7.2f} ms ({len(guests):3} rows)   "
+                  f"search_bookings {tb:7.2f} ms ({len(bookings):3} rows)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,311 @@
+"""
+Time every public function in database.py and auth.py against synthetic
+hotels of several sizes (see synthetic.py) and write the results as JSON,
+so runs on two commits can be compared:
+
+  python benchmarks/bench_suite.py -o before.json
+  python benchmarks/bench_suite.py -o after.json --compare before.json
+
+Each case is called until it has run `calls` times or used BUDGET seconds
+(at least 3 calls). Reads are timed before writes. --compare prints the
+change in median latency and exits 1 if any case got more than
+--threshold times slower (ignoring changes under NOISE_US).
+A public function with no case and no SKIP entry is reported as missing.
+
+Run: python benchmarks/bench_suite.py [--scales small,medium,large] [-o results.json]
+"""
+import argparse
+import inspect
+import itertools
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+from common import database, temp_database
+import auth
+import synthetic
+
+SCALES = {
+    "small":  {"rooms": 30, "floors": 3, "guests": 1000, "years": 1},
+    "medium": {"rooms": 200, "floors": 8, "guests": 20000, "years": 2},
+    "large":  {"rooms": 500, "floors": 10, "guests": 200000, "years": 5},
+}
+BUDGET = 1.0            # seconds per case
+NOISE_US = 20           # --compare ignores smaller changes
+SEED = 1
+
+# Public functions that are not timed, and why.
+SKIP = {
+    "configure": "changes module configuration",
+    "close_connections": "closes every thread's connection",
+    "enable_concurrency_mode": "changes module configuration",
+    "cached": "decorator",
+    "retry_on_lock": "decorator",
+}
+
+
+class Context:
+    """Ids and dates from the generated data that the cases pick from."""
+
+    def __init__(self, today):
+        conn = database.get_connection()
+        self.today = today
+        self.rooms = [r[0] for r in conn.execute("SELECT id FROM rooms")]
+        self.guests = [r[0] for r in conn.execute("SELECT id FROM guests LIMIT 1000")]
+        self.bookings = [r[0] for r in conn.execute("SELECT id FROM bookings LIMIT 1000")]
+        self.guest_name = conn.execute("SELECT full_name FROM guests LIMIT 1").fetchone()[0]
+        self.room_number = conn.execute("SELECT room_number FROM rooms LIMIT 1").fetchone()[0]
+        self.cycle = itertools.count()
+        # Far-future nights nobody has booked, one per create_booking call.
+        self.free_nights = (
+            (room, today + timedelta(days=400 + n))
+            for n in itertools.count() for room in self.rooms)
+
+    def pick(self, items):
+        return items[next(self.cycle) % len(items)]
+
+    def stay(self, nights=3):
+        start = self.today + timedelta(days=next(self.cycle) % 60)
+        return str(start), str(start + timedelta(days=nights))
+
+    def new_booking(self):
+        room, night = next(self.free_nights)
+        return database.create_booking(room, self.pick(self.guests), str(night),
+                                       str(night + timedelta(days=1)), 1, 1500_00, 0, "bench")
+
+    def new_guest_rows(self, n):
+        first = database.get_connection().execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM guests").fetchone()[0]
+        return [(first + i, f"Bench Guest {i}", "", "", "", "") for i in range(n)]
+
+    def new_user(self):
+        name = f"bench{next(self.cycle)}"
+        return auth.register(name, "secret1", "staff", "Bench User")[1], name
+
+
+def _in_transaction(fn):
+    def run():
+        with database.transaction() as conn:
+            fn(conn)
+    return run
+
+
+def read_cases(ctx):
+    """name -> (call, setup or None). Setup runs untimed before each call."""
+    month_ago = str(ctx.today - timedelta(days=30))
+    year_ago = str(ctx.today - timedelta(days=365))
+    row = database.get_connection().execute("SELECT * FROM bookings LIMIT 1").fetchone()
+    return {
+        "database.get_connection": (database.get_connection, None),
+        "database.connect": (lambda: database.connect().close(), None),
+        "database.schema_version": (database.schema_version, None),
+        "database.migrate": (database.migrate, None),
+        "database.explain": (lambda: database.explain(
+            "SELECT * FROM bookings WHERE room_id = ?", (1,)), None),
+        "database.check_query_plans": (database.check_query_plans, None),
+        "database.has_search_index": (database.has_search_index, None),
+        "database.row_dict": (lambda: database.row_dict(row), None),
+        "database.get_all_rooms": (database.get_all_rooms, None),
+        "database.get_room": (lambda: database.get_room(ctx.pick(ctx.rooms)), None),
+        "database.get_available_rooms": (lambda: database.get_available_rooms(*ctx.stay()), None),
+        "database.is_room_available": (lambda: database.is_room_available(
+            ctx.pick(ctx.rooms), *ctx.stay()), None),
+        "database.get_all_guests": (database.get_all_guests, None),
+        "database.search_guests": (lambda: database.search_guests(ctx.guest_name[:5]), None),
+        "database.get_guests_page": (database.get_guests_page, None),
+        "database.count_guests": (database.count_guests, None),
+        "database.get_guests_by_ids (100)": (lambda: database.get_guests_by_ids(
+            ctx.guests[:100]), None),
+        "database.get_all_bookings": (database.get_all_bookings, None),
+        "database.get_active_bookings": (database.get_active_bookings, None),
+        "database.get_booking": (lambda: database.get_booking(ctx.pick(ctx.bookings)), None),
+        "database.search_bookings": (lambda: database.search_bookings(ctx.room_number), None),
+        "database.get_bookings_page": (database.get_bookings_page, None),
+        "database.get_bookings_by_ids (100)": (lambda: database.get_bookings_by_ids(
+            ctx.bookings[:100]), None),
+        "database.count_bookings": (lambda: database.count_bookings("active"), None),
+        "database.get_invoice_by_booking": (lambda: database.get_invoice_by_booking(
+            ctx.pick(ctx.bookings)), None),
+        "database.get_dashboard_stats": (database.get_dashboard_stats, database.invalidate_cache),
+        "database.get_revenue_report": (lambda: database.get_revenue_report(
+            year_ago, str(ctx.today)), None),
+        "database.get_revenue_report (month)": (lambda: database.get_revenue_report(
+            month_ago, str(ctx.today)), None),
+        "database.check_daily_revenue": (database.check_daily_revenue, None),
+        "database.money_drift": (database.money_drift, None),
+        "database.get_settings": (database.get_settings, None),
+        "database.get_setting": (lambda: database.get_setting("hotel_name"), None),
+        "database.typed_settings": (database.typed_settings, None),
+        "database.poll_settings": (database.poll_settings, None),
+        "database.subscribe_settings": (lambda: database.subscribe_settings(print)(), None),
+        "database.invalidate_cache": (database.invalidate_cache, None),
+        "database.data_stamp": (database.data_stamp, None),
+        "database.last_change_seq": (database.last_change_seq, None),
+        "database.changes_since": (lambda: database.changes_since(
+            max(database.last_change_seq() - 100, 0)), None),
+        "database.subscribe_commits": (lambda: database.subscribe_commits(print)(), None),
+        "database.transaction": (_in_transaction(lambda conn: None), None),
+        "auth.login": (lambda: auth.login("admin", "admin123"), None),
+        "auth.get_all_users": (auth.get_all_users, None),
+    }
+
+
+def write_cases(ctx):
+    pending = {}            # setup -> call hand-over for ids created untimed
+
+    def prepare(key, make):
+        return lambda: pending.__setitem__(key, make())
+
+    return {
+        "database.add_guest": (lambda: database.add_guest(
+            "Bench Guest", "+880 1700000000", "", "", ""), None),
+        "database.add_guests (100)": (lambda: database.add_guests(pending["rows"]),
+                                      prepare("rows", lambda: ctx.new_guest_rows(100))),
+        "database.update_guest": (lambda: database.update_guest(
+            ctx.pick(ctx.guests), "Renamed Guest", "+880 1700000001", "", "", ""), None),
+        "database.delete_guest": (lambda: database.delete_guest(pending["guest"]), prepare(
+            "guest", lambda: database.add_guest("Doomed Guest", "", "", "", ""))),
+        "database.update_room": (lambda: database.update_room(
+            ctx.pick(ctx.rooms), "Deluxe", 2500_00, "bench"), None),
+        "database.update_room_status": (lambda: database.update_room_status(
+            ctx.pick(ctx.rooms), "available"), None),
+        "database.create_booking": (ctx.new_booking, None),
+        "database.cancel_booking": (lambda: database.cancel_booking(pending["booking"]),
+                                    prepare("booking", ctx.new_booking)),
+        "database.checkout_booking": (lambda: database.checkout_booking(pending["booking"]),
+                                      prepare("booking", ctx.new_booking)),
+        "database.create_invoice": (lambda: database.create_invoice(
+            pending["booking"], 1500_00, 0, 0, 0), prepare("booking", ctx.new_booking)),
+        "database.next_in_sequence": (_in_transaction(
+            lambda conn: database.next_in_sequence(conn, "bench")), None),
+        "database.allocate_invoice_numbers": (_in_transaction(
+            database.allocate_invoice_numbers), None),
+        "database.set_setting": (lambda: database.set_setting(
+            "hotel_name", f"Bench Hotel {next(ctx.cycle)}"), None),
+        "database.set_settings": (lambda: database.set_settings(
+            {"hotel_name": "Bench Hotel", "tax_rate": str(next(ctx.cycle) % 20)}), None),
+        "database.refresh_room_statuses": (database.refresh_room_statuses, None),
+        "database.rebuild_daily_revenue": (database.rebuild_daily_revenue, None),
+        "database.checkpoint": (database.checkpoint, None),
+        "database.prune_change_log": (database.prune_change_log, None),
+        "database.initialize_database": (database.initialize_database, None),
+        "auth.register": (ctx.new_user, None),
+        "auth.change_password": (lambda: auth.change_password(
+            pending["user"][1], "secret1", "secret2"), prepare("user", ctx.new_user)),
+        "auth.delete_user": (lambda: auth.delete_user(pending["user"][0]),
+                             prepare("user", ctx.new_user)),
+    }
+
+
+def measure(call, setup=None, calls=200, budget=BUDGET):
+    """Per-call latencies in microseconds: {calls, mean, p50, p95, max}."""
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < calls and (len(times) < 3 or time.perf_counter() < deadline):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        call()
+        times.append((time.perf_counter() - start) * 1e6)
+    times.sort()
+    return {"calls": len(times), "mean": round(statistics.fmean(times), 1),
+            "p50": round(times[len(times) // 2], 1),
+            "p95": round(times[int(len(times) * 0.95)], 1), "max": round(times[-1], 1)}
+
+
+def coverage(cases):
+    """Public functions of database.py and auth.py with neither a case nor a SKIP entry."""
+    missing = []
+    for module in (database, auth):
+        for name, fn in inspect.getmembers(module, inspect.isfunction):
+            if name.startswith("_") or fn.__module__ != module.__name__ or name in SKIP:
+                continue
+            if not any(case.split(" ")[0] == f"{module.__name__}.{name}" for case in cases):
+                missing.append(f"{module.__name__}.{name}")
+    return missing
+
+
+def run_scale(name, params, calls, today):
+    with temp_database():
+        start = time.perf_counter()
+        data = synthetic.generate(seed=SEED, today=today, **params)
+        data["seconds"] = round(time.perf_counter() - start, 1)
+        print(f"\n{name}: {data['rooms']} rooms, {data['guests']} guests, "
+              f"{data['bookings']} bookings, {data['invoices']} invoices "
+              f"(generated in {data['seconds']} s)")
+        ctx = Context(today)
+        results = {}
+        for cases in (read_cases(ctx), write_cases(ctx)):
+            for case, (call, setup) in cases.items():
+                results[case] = r = measure(call, setup, calls)
+                print(f"  {case:<44}{r['p50']:>12,.1f} us p50{r['p95']:>12,.1f} us p95"
+                      f"{r['calls']:>7} calls")
+    return {"data": data, "results": results}
+
+
+def compare(current, baseline, threshold):
+    """Print the p50 ratio for every case in both runs; return the regressions."""
+    regressions = []
+    print(f"\n{'change vs baseline (p50)':<52}{'before':>12}{'after':>12}{'ratio':>8}")
+    for scale, run in current["scales"].items():
+        old = baseline.get("scales", {}).get(scale, {}).get("results", {})
+        for case, r in run["results"].items():
+            if case not in old:
+                continue
+            before, after = old[case]["p50"], r["p50"]
+            ratio = after / before if before else float("inf")
+            slower = ratio > threshold and after - before > NOISE_US
+            if slower:
+                regressions.append((scale, case, before, after))
+            print(f"{scale + ' ' + case:<52}{before:>12,.1f}{after:>12,.1f}{ratio:>7.2f}x"
+                  f"{'  SLOWER' if slower else ''}")
+    return regressions
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark database.py and auth.py at several scales.")
+    p.add_argument("--scales", default="small,medium",
+                   help=f"comma-separated, from {', '.join(SCALES)} (default: small,medium)")
+    p.add_argument("--calls", type=int, default=200, help="max calls per case")
+    p.add_argument("--today", default="2026-03-31",
+                   help="date the synthetic data is centred on (fixed, so runs compare)")
+    p.add_argument("-o", "--output", help="write JSON results here")
+    p.add_argument("--compare", help="earlier JSON results to compare with")
+    p.add_argument("--threshold", type=float, default=1.5,
+                   help="--compare fails when a case is this many times slower")
+    args = p.parse_args(argv)
+
+    scales = args.scales.split(",")
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        p.error(f"unknown scale(s): {', '.join(unknown)}")
+    today = date.fromisoformat(args.today)
+    current = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(), "calls": args.calls, "today": args.today,
+        "scales": {s: run_scale(s, SCALES[s], args.calls, today) for s in scales},
+        "skipped": SKIP,
+    }
+    current["missing"] = missing = coverage(current["scales"][scales[0]]["results"])
+    if missing:
+        print(f"\nnot benchmarked (add a case or a SKIP entry): {', '.join(missing)}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nwrote {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(current, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) more than {args.threshold}x slower")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Refreshing a 10k-row Treeview where 1% of rows changed: the old
+delete-everything-and-reinsert pattern versus ui.table_sync.TreeSync.
+Counts Treeview calls (each one is a Tcl round trip) and wall time.
+
+Uses a real ttk.Treeview when a display is available; otherwise a plain
+Python stand-in, in which case only the call counts are meaningful.
+
+Run: python benchmarks/bench_table_sync.py [rows] [changed_percent]
+"""
+import random
+import sys
+import time
+
+import common  # noqa: F401  (puts the project root on sys.path)
+from ui.table_sync import TreeSync
+
+
+class CountingTree:
+    """Proxy that counts calls to the Treeview methods used by refreshes."""
+
+    METHODS = ("get_children", "delete", "insert", "item", "move")
+
+    def __init__(self, tree):
+        self._tree = tree
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._tree, name)
+        if name not in self.METHODS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+class FakeTree:
+    def __init__(self):
+        self.items = []
+        self.values = {}
+
+    def get_children(self, item=""):
+        return tuple(self.items)
+
+    def delete(self, *iids):
+        gone = set(iids)
+        self.items = [i for i in self.items if i not in gone]
+        for i in iids:
+            self.values.pop(i, None)
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        iid = str(iid)
+        self.items.insert(len(self.items) if index == "end" else index, iid)
+        self.values[iid] = values
+
+    def item(self, iid, values=(), tags=()):
+        self.values[iid] = values
+
+    def move(self, iid, parent, index):
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+
+
+def _make_tree():
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.withdraw()
+        return ttk.Treeview(root, columns=("a", "b", "c"), show="headings"), "ttk.Treeview"
+    except Exception:
+        return FakeTree(), "stand-in tree (no display)"
+
+
+def _values(r):
+    return (r["id"], r["name"], r["amount"]), ()
+
+
+def _full_refresh(tree, rows):
+    tree.delete(*tree.get_children())
+    for r in rows:
+        values, tags = _values(r)
+        tree.insert("", "end", iid=r["id"], values=values, tags=tags)
+
+
+def main(n=10000, pct=1.0):
+    rng = random.Random(3)
+    rows = [{"id": i, "name": f"Guest {i}", "amount": i * 10} for i in range(n)]
+    changed = [dict(r) for r in rows]
+    k = max(1, int(n * pct / 100))
+    for r in rng.sample(changed, k // 3 + 1):
+        r["amount"] += 1                                   # updates
+    for r in rng.sample(changed, k // 3 + 1):
+        changed.remove(r)                                  # deletes
+    changed += [{"id": n + i, "name": "New", "amount": 0} for i in range(k // 3 + 1)]  # inserts
+
+    tree, kind = _make_tree()
+    print(f"{n} rows, ~{pct}% changed, using {kind}")
+
+    counting = CountingTree(tree)
+    _full_refresh(counting, rows)
+    counting.calls = 0
+    t = time.perf_counter()
+    _full_refresh(counting, changed)
+    print(f"{'delete all + reinsert':<24}{counting.calls:>8} calls{(time.perf_counter() - t) * 1000:>10.1f} ms")
+
+    _full_refresh(tree, [])
+    counting = CountingTree(tree)
+    sync = TreeSync(counting, _values)
+    sync.apply(rows)
+    counting.calls = 0
+    t = time.perf_counter()
+    ins, upd, dele = sync.apply(changed)
+    print(f"{'TreeSync.apply':<24}{counting.calls:>8} calls{(time.perf_counter() - t) * 1000:>10.1f} ms"
+          f"   ({ins} inserted, {upd} updated, {dele} deleted)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 1.0)
@@ -0,0 +1,56 @@
+"""
+Run `python -m hotel` commands that must fail cleanly and check each one
+prints {"error": ...} on stderr and exits 1 instead of a traceback: a --db
+path in a missing directory, and an import file that does not exist
+(exit 1 on any other outcome).
+
+Run: python benchmarks/check_cli_errors.py
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from common import database
+import hotel
+
+
+def _run(argv):
+    err = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(err), contextlib.redirect_stdout(io.StringIO()):
+            code = hotel.main(argv)
+    except Exception as e:          # the bug this checks for
+        return None, f"{type(e).__name__}: {e}"
+    finally:
+        database.close_connections()
+    return code, err.getvalue().strip()
+
+
+def main():
+    old_path = database.DB_PATH
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [
+            ("--db in a missing directory",
+             ["--db", os.path.join(tmp, "missing", "hotel.db"), "db", "info"]),
+            ("missing import file",
+             ["--db", os.path.join(tmp, "hotel.db"), "data", "import", "guests",
+              os.path.join(tmp, "missing.csv")]),
+        ]
+        for label, argv in cases:
+            code, err = _run(argv)
+            try:
+                ok = code == 1 and "error" in json.loads(err)
+            except ValueError:
+                ok = False
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {label}: exit={code} {err}")
+    database.configure(db_path=old_path)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
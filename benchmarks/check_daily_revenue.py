@@ -0,0 +1,67 @@
+"""
+Exercise the daily_revenue triggers with random inserts, cancels,
+checkouts, amount edits and deletes, then compare the table with the raw
+aggregate (exit 1 on any mismatch) and time a one-year report both ways.
+
+Run: python benchmarks/check_daily_revenue.py [bookings]
+"""
+import random
+import sys
+
+from common import database, temp_database, time_calls
+
+RAW_REPORT = """
+    SELECT DATE(created_at) as date, COUNT(*) as bookings,
+           SUM(total_amount) as revenue, SUM(advance_paid) as collected
+    FROM bookings
+    WHERE created_at >= ? AND created_at < DATE(?, '+1 day') AND status != 'cancelled'
+    GROUP BY DATE(created_at)
+    ORDER BY date
+"""
+
+
+def _seed(n, rng):
+    with database.transaction() as conn:
+        gid = conn.execute("INSERT INTO guests (full_name) VALUES ('Bench')").lastrowid
+        conn.executemany("""
+            INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
+                                  total_amount, advance_paid, status, created_at)
+            VALUES (?, ?, '2020-01-01', '2020-01-02', 1, ?, ?, ?, DATETIME('2020-01-01', ?))
+        """, [(rng.randint(1, 30), gid, rng.randint(10, 900) * 1050, rng.choice([0, 0, 500_25]),
+               rng.choice(["active", "checked_out", "cancelled"]),
+               f"+{rng.randint(0, 5 * 365 * 24 * 60)} minutes") for _ in range(n)])
+    ids = [r[0] for r in database.get_connection().execute("SELECT id FROM bookings")]
+    for bid in rng.sample(ids, n // 10):
+        op = rng.randrange(4)
+        if op == 0:
+            database.cancel_booking(bid)
+        elif op == 1:
+            database.checkout_booking(bid)
+        elif op == 2:
+            with database.transaction() as conn:
+                conn.execute("UPDATE bookings SET total_amount = total_amount + 9999, "
+                             "status = 'active' WHERE id = ?", (bid,))
+        else:
+            with database.transaction() as conn:
+                conn.execute("DELETE FROM bookings WHERE id = ?", (bid,))
+
+
+def main(n=100000):
+    with temp_database():
+        _seed(n, random.Random(11))
+        diffs = database.check_daily_revenue()
+        for day, stored, expected in diffs[:20]:
+            print(f"MISMATCH {day}: stored={stored} expected={expected}")
+        days = database.get_connection().execute("SELECT COUNT(*) FROM daily_revenue").fetchone()[0]
+        print(f"{n} bookings, {days} days, {len(diffs)} mismatching days")
+
+        conn = database.get_connection()
+        raw = time_calls(lambda: conn.execute(RAW_REPORT, ("2022-01-01", "2022-12-31")).fetchall(), 20)
+        summary = time_calls(lambda: database.get_revenue_report("2022-01-01", "2022-12-31"), 20)
+        print(f"{'one-year report, raw GROUP BY':<36}{raw / 1000:>10.2f} ms")
+        print(f"{'one-year report, daily_revenue':<36}{summary / 1000:>10.2f} ms")
+    return 1 if diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
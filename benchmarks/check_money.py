@@ -0,0 +1,120 @@
+"""
+Build a database as it was before money moved to integer paisa (schema
+v7, REAL amounts), fill it with synthetic bookings whose exact totals are
+tracked here in integers, run the migration, and check that every per-day
+sum, the daily_revenue table and the revenue report match to the paisa
+(exit 1 on any mismatch). Also shows how far the old float totals were off
+and times the integer aggregation.
+
+Run: python benchmarks/check_money.py [bookings]      (default 1,000,000)
+"""
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from common import database, temp_database
+from money import Money
+
+LEGACY_VERSION = 7      # last schema with REAL money columns
+START = date(2021, 1, 1)
+DAYS = 5 * 365
+
+EXACT_BY_DAY = """
+    SELECT DATE(created_at), SUM(total_amount), SUM(advance_paid) FROM bookings
+    WHERE status != 'cancelled' GROUP BY DATE(created_at)
+"""
+
+
+def _bookings(n, rng, expected):
+    """Yield legacy rows (amounts as 2-decimal floats); add the exact paisa to expected."""
+    for _ in range(n):
+        day = START + timedelta(days=rng.randrange(DAYS))
+        nights = rng.randint(1, 7)
+        total = nights * rng.randint(800_00, 9000_00)
+        advance = rng.choice((0, total // 4, total // 2, total))
+        status = rng.choice(("checked_out", "checked_out", "checked_out", "active", "cancelled"))
+        if status != "cancelled":
+            totals = expected[day.isoformat()]
+            totals[0] += total
+            totals[1] += advance
+        yield (rng.randint(1, 30), day.isoformat(), (day + timedelta(days=nights)).isoformat(),
+               nights, total / 100, advance / 100, status,
+               f"{day} {rng.randrange(24):02d}:{rng.randrange(60):02d}:00")
+
+
+def _legacy_database(n, rng, expected):
+    """Fill the open (v7) database the way the old code did, amounts in taka."""
+    with database.transaction() as conn:
+        conn.execute("UPDATE rooms SET price_per_night = price_per_night / 100.0")
+        gid = conn.execute("INSERT INTO guests (full_name) VALUES ('Bench')").lastrowid
+        conn.executemany(f"""
+            INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
+                                  total_amount, advance_paid, status, created_at)
+            VALUES (?, {gid}, ?, ?, ?, ?, ?, ?, ?)
+        """, _bookings(n, rng, expected))
+
+
+def _compare(label, got, expected):
+    bad = [(day, got.get(day), expected.get(day))
+           for day in sorted(got.keys() | expected.keys()) if got.get(day) != expected.get(day)]
+    for day, a, b in bad[:10]:
+        print(f"MISMATCH {label} {day}: got {a} expected {b}")
+    print(f"{label:<36}{len(expected):>8} days, {len(bad)} mismatching")
+    return len(bad)
+
+
+def main(n=1_000_000):
+    expected = defaultdict(lambda: [0, 0])
+    migrations = database.MIGRATIONS
+    database.MIGRATIONS = migrations[:LEGACY_VERSION]
+    try:
+        with temp_database():
+            start = time.perf_counter()
+            _legacy_database(n, random.Random(20), expected)
+            print(f"legacy database: {n:,} bookings in {time.perf_counter() - start:.1f} s")
+            conn = database.get_connection()
+            floats = [r[0] for r in conn.execute(
+                "SELECT total_amount FROM bookings WHERE status != 'cancelled'")]
+
+            database.MIGRATIONS = migrations
+            start = time.perf_counter()
+            database.migrate()
+            print(f"migration to paisa: {time.perf_counter() - start:.1f} s "
+                  f"(schema v{database.schema_version(conn)})")
+
+            expected = {day: tuple(v) for day, v in expected.items()}
+            start = time.perf_counter()
+            by_day = {r[0]: (r[1], r[2]) for r in conn.execute(EXACT_BY_DAY)}
+            print(f"{'GROUP BY over integer amounts':<36}{(time.perf_counter() - start) * 1000:>8.0f} ms")
+            bad = _compare("bookings, summed in SQL", by_day, expected)
+            bad += _compare("daily_revenue", {r[0]: tuple(r[2:]) for r in conn.execute(
+                "SELECT date, bookings, revenue, collected FROM daily_revenue")}, expected)
+            report = database.get_revenue_report("0000-01-01", "9999-12-31")
+            bad += _compare("get_revenue_report", {
+                r["date"]: (r["revenue"].minor, r["collected"].minor) for r in report}, expected)
+
+            exact = sum(v[0] for v in expected.values())
+            reported = sum((r["revenue"] for r in report), Money())
+            float_total = sum(floats)
+            drift = database.money_drift()
+            worst = max((abs(r[1] * 100 - r[3]) for r in conn.execute(
+                "SELECT * FROM money_reconciliation")), default=0)
+            print(f"\nexact revenue          {Money(exact):>22,.2f}")
+            print(f"Money total of report  {reported:>22,.2f}")
+            print(f"float sum()            {float_total:>22,.6f}  "
+                  f"(off by {abs(float_total * 100 - exact) / 100:.6f})")
+            print(f"old daily_revenue: worst day off by {worst / 100:.8f}, "
+                  f"{len(drift)} day(s) wrong at 2 decimals")
+            if reported.minor != exact:
+                print("MISMATCH report total")
+                bad += 1
+    finally:
+        database.MIGRATIONS = migrations
+    print("OK" if not bad else f"FAILED: {bad} mismatch(es)")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,22 @@
+"""
+Fail (exit 1) if any query in database.QUERY_PLAN_CHECKS falls back to a
+full table scan on a freshly migrated database.
+
+Run: python benchmarks/check_query_plans.py
+"""
+import sys
+
+from common import database, temp_database
+
+
+def main():
+    with temp_database():
+        failures = database.check_query_plans()
+        for name, (sql, params) in database.QUERY_PLAN_CHECKS.items():
+            status = "FULL SCAN" if name in failures else "ok"
+            print(f"{name:<26}{status:<11}{' | '.join(database.explain(sql, params))}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
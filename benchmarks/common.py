@@ -0,0 +1,36 @@
+"""
+Shared helpers for the benchmark scripts.
+Every benchmark runs against a throw-away database, never hotel.db.
+"""
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import database
+
+
+@contextmanager
+def temp_database(**pragmas):
+    """Initialise a fresh database in a temp dir and point database.py at it."""
+    old_path = database.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        database.configure(db_path=os.path.join(tmp, "bench.db"), **pragmas)
+        database.initialize_database()
+        try:
+            yield database.DB_PATH
+        finally:
+            database.close_connections()
+            database.configure(db_path=old_path)
+
+
+def time_calls(fn, n, after_each=None):
+    """Call fn() n times; return mean latency per call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+        if after_each:
+            after_each()
+    return (time.perf_counter() - start) / n * 1e6
@@ -0,0 +1,157 @@
+"""
+Load test for api_server.py: C client threads issue a read-heavy mix
+(availability, guest search, stats, booking lookups, ~10% conditional
+GETs with If-None-Match) plus booking create/cancel writes, then report
+requests/sec and p50/p99 latency per endpoint.
+
+Starts its own server process on a temporary database unless --url is given.
+
+Run: python benchmarks/load_test_api.py [--clients 16] [--seconds 10] [--workers 8]
+     python benchmarks/load_test_api.py --url http://127.0.0.1:8080
+"""
+import argparse
+import http.client
+import json
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+from common import database, temp_database
+import api_server
+
+
+def _request(host, port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        data = json.dumps(body).encode() if body is not None else None
+        hdrs = dict(headers or {})
+        if data:
+            hdrs["Content-Type"] = "application/json"
+        conn.request(method, path, data, hdrs)
+        resp = conn.getresponse()
+        payload = resp.read()
+        return resp.status, resp.getheader("ETag"), payload
+    finally:
+        conn.close()
+
+
+def _client(host, port, deadline, rng, guest_ids, results, etags):
+    while time.monotonic() < deadline:
+        r = rng.random()
+        day = rng.randrange(300)
+        if r < 0.35:
+            name, method, path, body = "availability", "GET", (
+                f"/rooms/available?from=2027-01-{1 + day % 28:02d}"
+                f"&to=2027-02-{1 + day % 28:02d}"), None
+        elif r < 0.60:
+            name, method, path, body = "guest search", "GET", f"/guests?q={quote(f'Guest {day}')}&limit=20", None
+        elif r < 0.75:
+            name, method, path, body = "stats", "GET", "/stats", None
+        elif r < 0.90:
+            name, method, path, body = "booking", "GET", f"/bookings/{1 + day}", None
+        else:
+            name, method, path, body = "create+cancel", "POST", "/bookings", {
+                "room_id": rng.randint(1, 30), "guest_id": rng.choice(guest_ids),
+                "check_in": f"2028-{1 + day % 12:02d}-{1 + day % 27:02d}",
+                "check_out": f"2028-{1 + day % 12:02d}-{2 + day % 27:02d}"}
+        headers = {}
+        if method == "GET" and path in etags and rng.random() < 0.5:
+            headers["If-None-Match"] = etags[path]
+        t = time.perf_counter()
+        status, etag, payload = _request(host, port, method, path, body, headers)
+        if status == 201:
+            bid = json.loads(payload)["id"]
+            _request(host, port, "POST", f"/bookings/{bid}/cancel")
+        results.append((name, time.perf_counter() - t, status))
+        if etag:
+            etags[path] = etag
+
+
+def _seed():
+    ids = []
+    for i in range(2000):
+        ids.append(database.add_guest(f"Guest {i}", f"0171{i:07d}", "", f"NID{i}", ""))
+    for i in range(300):
+        database.create_booking(1 + i % 30, ids[i], f"2026-{1 + i // 30:02d}-01",
+                                f"2026-{1 + i // 30:02d}-03", 2, 3000, 0, "")
+    return ids
+
+
+def _pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(host, port, clients, seconds, guest_ids):
+    results, etags = [], {}
+    deadline = time.monotonic() + seconds
+    threads = [threading.Thread(target=_client, args=(host, port, deadline, random.Random(i),
+                                                      guest_ids, results, etags))
+               for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(results)} requests in {elapsed:.1f} s from {clients} clients: "
+          f"{len(results) / elapsed:,.0f} req/s")
+    print(f"{'endpoint':<16}{'count':>8}{'p50 ms':>9}{'p99 ms':>9}  statuses")
+    for name in sorted({r[0] for r in results}):
+        lat = [r[1] * 1000 for r in results if r[0] == name]
+        codes = {}
+        for r in results:
+            if r[0] == name:
+                codes[r[2]] = codes.get(r[2], 0) + 1
+        print(f"{name:<16}{len(lat):>8}{_pct(lat, 0.5):>9.2f}{_pct(lat, 0.99):>9.2f}  "
+              + ", ".join(f"{k}×{v}" for k, v in sorted(codes.items())))
+    lat = [r[1] * 1000 for r in results]
+    print(f"{'all':<16}{len(lat):>8}{_pct(lat, 0.5):>9.2f}{_pct(lat, 0.99):>9.2f}")
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--url", help="test a running server instead of starting one")
+    p.add_argument("--clients", type=int, default=16)
+    p.add_argument("--seconds", type=float, default=10)
+    p.add_argument("--workers", type=int, default=8)
+    args = p.parse_args()
+
+    if args.url:
+        u = urlsplit(args.url)
+        run(u.hostname, u.port or 80, args.clients, args.seconds, list(range(1, 2001)))
+        return
+    with temp_database() as path:
+        guest_ids = _seed()
+        database.close_connections()
+        # Separate process, so the client threads do not share the server's GIL.
+        port = _free_port()
+        server = subprocess.Popen([sys.executable, api_server.__file__, "--db", path,
+                                   "--port", str(port), "--workers", str(args.workers)],
+                                  stderr=subprocess.DEVNULL)
+        try:
+            for _ in range(100):
+                try:
+                    _request("127.0.0.1", port, "GET", "/stats")
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            run("127.0.0.1", port, args.clients, args.seconds, guest_ids)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Multi-terminal stress test: N processes run create_booking/checkout_booking
+(plus a get_all_bookings read every few writes) against one database file.
+Reports throughput and the rate of "database is locked" failures, once with
+the default settings and once with enable_concurrency_mode().
+
+Run: python benchmarks/stress_concurrency.py [processes] [seconds]
+"""
+import multiprocessing as mp
+import sqlite3
+import sys
+import time
+
+from common import database, temp_database
+
+
+def _worker(db_path, concurrent, seconds, worker_id, results):
+    database.configure(db_path=db_path)
+    if concurrent:
+        database.enable_concurrency_mode()
+    else:
+        database.configure(busy_timeout=0)
+    room_id = worker_id % 30 + 1
+    ops = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            bid = database.create_booking(room_id, 1, "2026-01-01", "2026-01-02",
+                                          1, 1500, 0, f"stress {worker_id}")
+            database.checkout_booking(bid)
+            ops += 2
+            if ops % 10 == 0:
+                database.get_all_bookings()
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            errors += 1
+    results.put((ops, errors))
+
+
+def run(processes, seconds, concurrent):
+    with temp_database() as path:
+        database.add_guest("Stress Guest", "01700000000", "", "", "")
+        # Give the readers something sizeable to scan
+        with database.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,"
+                " total_amount, status) VALUES (?, 1, '2025-01-01', '2025-01-02', 1, 1500,"
+                " 'checked_out')", [(i % 30 + 1,) for i in range(5000)])
+        database.close_connections()
+        results = mp.Queue()
+        procs = [mp.Process(target=_worker, args=(path, concurrent, seconds, i, results))
+                 for i in range(processes)]
+        for p in procs:
+            p.start()
+        totals = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+    ops = sum(t[0] for t in totals)
+    errors = sum(t[1] for t in totals)
+    attempts = ops + errors
+    label = "concurrency mode" if concurrent else "default"
+    print(f"{label:<18}{processes:>6} procs{ops / seconds:>12.0f} writes/s"
+          f"{errors:>8} lock errors ({errors / attempts * 100 if attempts else 0:.1f}%)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    secs = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    run(n, secs, concurrent=False)
+    run(n, secs, concurrent=True)
@@ -0,0 +1,67 @@
+"""
+Invoice numbering under contention: N processes call create_invoice()
+until 10,000 invoices exist, in concurrency mode, with no application-level
+retries (LOCK_RETRIES = 0). Exits 1 unless every number is unique and the
+counters run 1..10000 without gaps.
+
+Run: python benchmarks/stress_invoices.py [processes] [invoices]
+"""
+import multiprocessing as mp
+import sqlite3
+import sys
+import time
+
+from common import database, temp_database
+
+
+def _worker(db_path, count, results):
+    database.configure(db_path=db_path)
+    database.enable_concurrency_mode(retries=0)
+    numbers, errors = [], 0
+    for _ in range(count):
+        try:
+            numbers.append(database.create_invoice(1, 1000, 0, 0, 0))
+        except sqlite3.Error:
+            errors += 1
+    results.put((numbers, errors))
+
+
+def main(processes=8, total=10000):
+    with temp_database() as path:
+        database.add_guest("Stress Guest", "01700000000", "", "", "")
+        database.create_booking(1, 1, "2026-01-01", "2026-01-02", 1, 1000, 0, "")
+        database.enable_concurrency_mode()
+        database.close_connections()
+
+        results = mp.Queue()
+        per = total // processes
+        procs = [mp.Process(target=_worker, args=(path, per + (i < total % processes), results))
+                 for i in range(processes)]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        outcomes = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        returned = [n for nums, _ in outcomes for n in nums]
+        errors = sum(e for _, e in outcomes)
+        stored = [r[0] for r in database.get_connection().execute(
+            "SELECT invoice_number FROM invoices")]
+        database.configure(journal_mode="DELETE")
+
+    counters = sorted(int(n.rsplit("-", 1)[1]) for n in stored)
+    duplicates = len(stored) - len(set(stored))
+    gaps = len(set(range(1, len(stored) + 1)) - set(counters))
+    print(f"{processes} processes, {len(returned)} invoices in {elapsed:.1f} s "
+          f"({len(returned) / elapsed:,.0f}/s), {errors} lock errors")
+    print(f"stored {len(stored)}, duplicates {duplicates}, gaps {gaps}, "
+          f"first {min(stored)}, last {max(stored)}")
+    ok = not errors and not duplicates and not gaps and len(stored) == total == len(set(returned))
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(a) for a in sys.argv[1:3])))
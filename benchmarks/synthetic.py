@@ -0,0 +1,168 @@
+"""
+Deterministic synthetic hotel: rooms over several floors, guests, years of
+back-to-back bookings with a realistic status mix, and invoices for every
+stay that has checked out. The same seed and `today` always give the same
+database, so benchmark runs on different commits compare like with like.
+
+Run: python benchmarks/synthetic.py --db big.db [--rooms 500 --floors 10
+     --guests 200000 --years 5 --seed 1 --today 2026-03-31]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from common import database
+
+FIRST_NAMES = ("Rahim", "Karim", "Sakib", "Tanvir", "Nusrat", "Farhana", "Arif", "Sadia",
+               "Imran", "Mitu", "Rashed", "Jannat", "Hasan", "Ayesha", "Mahmud", "Sumaiya",
+               "Fahim", "Tania", "Rafiq", "Nadia", "Shakil", "Lamia", "Zahid", "Priya")
+LAST_NAMES = ("Ahmed", "Hossain", "Islam", "Rahman", "Khan", "Chowdhury", "Akter", "Uddin",
+              "Sarkar", "Das", "Haque", "Miah", "Begum", "Alam", "Roy", "Talukder")
+CITIES = ("Dhaka", "Chattogram", "Sylhet", "Khulna", "Rajshahi", "Barishal", "Cox's Bazar")
+# (share of floors from the bottom, type, nightly price in paisa)
+ROOM_TYPES = ((0.5, "Standard", 1500_00), (0.85, "Deluxe", 2500_00), (1.0, "Suite", 4000_00))
+NIGHTS = (1, 1, 1, 2, 2, 2, 3, 3, 4, 5, 7, 10)     # weighted: most stays are short
+GAPS = (0, 0, 0, 0, 1, 1, 2, 3, 5)                  # empty nights between stays
+CANCELLED = 0.06                                    # share of stays cancelled
+PART_PAID = 0.1                                     # share of invoices left partly unpaid
+FUTURE_DAYS = 90                                    # reservations ahead of today
+
+
+def _rooms(conn, rooms, floors, rng):
+    per_floor = -(-rooms // floors)
+    width = 2 if per_floor < 100 else 3
+    rows = []
+    for i in range(rooms):
+        floor, num = i // per_floor + 1, i % per_floor + 1
+        _, rtype, price = next(t for t in ROOM_TYPES if floor <= t[0] * floors + 1e-9)
+        rows.append((f"{floor}{num:0{width}d}", rtype, floor,
+                     price + rng.randrange(0, 5) * 100_00, "available"))
+    conn.execute("DELETE FROM rooms")          # replace the 30 seeded rooms
+    conn.executemany("INSERT INTO rooms (room_number, room_type, floor, price_per_night, status) "
+                     "VALUES (?, ?, ?, ?, ?)", rows)
+    return [(r[0], r[1]) for r in conn.execute("SELECT id, price_per_night FROM rooms ORDER BY id")]
+
+
+def _guests(n, rng, first_id):
+    for i in range(n):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield (first_id + i, f"{first} {last} {i}", f"+880 1{rng.choice('3456789')}{i:08d}",
+               f"{first.lower()}.{i}@example.com" if rng.random() < 0.6 else None,
+               f"{rng.randrange(10**9, 10**10)}" if rng.random() < 0.8 else None,
+               rng.choice(CITIES))
+
+
+def _bookings(rooms, guest_ids, years, today, rng):
+    """Back-to-back stays per room from `years` ago to FUTURE_DAYS ahead."""
+    start = today - timedelta(days=365 * years)
+    end = today + timedelta(days=FUTURE_DAYS)
+    for room_id, price in rooms:
+        day = start + timedelta(days=rng.randrange(7))
+        while day < end:
+            nights = rng.choice(NIGHTS)
+            out = day + timedelta(days=nights)
+            booked = min(day - timedelta(days=rng.randrange(60)), today)
+            if rng.random() < CANCELLED:
+                status = "cancelled"
+            elif out <= today:
+                status = "checked_out"
+            else:
+                status = "active"
+            total = nights * price
+            advance = rng.choice((0, 0, total // 4, total // 2, total))
+            yield (room_id, rng.choice(guest_ids), day.isoformat(), out.isoformat(), nights,
+                   total, advance, status,
+                   f"{booked} {rng.randrange(8, 22):02d}:{rng.randrange(60):02d}:00")
+            day = out + timedelta(days=rng.choice(GAPS))
+
+
+def _invoices(conn):
+    """One invoice per checked-out stay, issued on check-out day, numbered per year."""
+    years = [r[0] for r in conn.execute(
+        "SELECT DISTINCT substr(check_out, 1, 4) FROM bookings WHERE status = 'checked_out' "
+        "ORDER BY 1")]
+    issued = 0
+    for year in years:
+        count = conn.execute("SELECT COUNT(*) FROM bookings WHERE status = 'checked_out' "
+                             "AND substr(check_out, 1, 4) = ?", (year,)).fetchone()[0]
+        stem, first = database.allocate_invoice_numbers(conn, count, int(year))
+        conn.execute("""
+            INSERT INTO invoices (booking_id, invoice_number, amount, discount, tax,
+                                  paid_amount, status, issued_at)
+            SELECT id,
+                   printf('%s%06d', :stem, :first + ROW_NUMBER() OVER (ORDER BY check_out, id) - 1),
+                   total_amount, 0, 0, paid,
+                   CASE WHEN paid >= total_amount THEN 'paid' ELSE 'partial' END,
+                   check_out || printf(' %02d:%02d:00', 6 + id % 6, id % 60)
+            FROM (SELECT *, CASE WHEN ABS(id * 2654435761 % 1000) < :part
+                                 THEN advance_paid ELSE total_amount END AS paid
+                  FROM bookings WHERE status = 'checked_out' AND substr(check_out, 1, 4) = :year)
+        """, {"stem": stem, "first": first, "year": year, "part": int(PART_PAID * 1000)})
+        issued += count
+    return issued
+
+
+def generate(rooms=30, floors=3, guests=1000, years=1, seed=0, today=None):
+    """
+    Fill the open, freshly initialised database with a synthetic hotel and
+    return what was created. Bookings run from `years` before `today`
+    (default: the real today, so room statuses and the dashboard look
+    live) to FUTURE_DAYS after it.
+    """
+    rng = random.Random(seed)
+    today = date.fromisoformat(str(today)) if today else date.today()
+    conn = database.get_connection()
+    if conn.execute("SELECT EXISTS (SELECT 1 FROM bookings)").fetchone()[0]:
+        raise ValueError("generate() needs a fresh database; this one has bookings")
+    with database.transaction() as conn:
+        room_rows = _rooms(conn, rooms, min(floors, rooms), rng)
+        first_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM guests").fetchone()[0]
+        database.add_guests(_guests(guests, rng, first_id))
+        # Registration times spread over the period instead of "now", so reruns match.
+        conn.execute("UPDATE guests SET created_at = "
+                     "DATETIME(?, '+' || (id * 7919 % ?) || ' minutes') WHERE id >= ?", (str(today - timedelta(days=365 * years)),
+                                       365 * years * 1440, first_id))
+        guest_ids = range(first_id, first_id + guests)
+        conn.executemany("""
+            INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
+                                  total_amount, advance_paid, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, _bookings(room_rows, guest_ids, years, today, rng))
+        invoices = _invoices(conn)
+    database.refresh_room_statuses()
+    by_status = dict(conn.execute("SELECT status, COUNT(*) FROM bookings GROUP BY status"))
+    return {"rooms": len(room_rows), "guests": guests, "bookings": sum(by_status.values()),
+            "by_status": by_status, "invoices": invoices, "seed": seed,
+            "today": today.isoformat()}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Write a deterministic synthetic hotel database.")
+    p.add_argument("--db", required=True, help="new database file (never hotel.db)")
+    p.add_argument("--rooms", type=int, default=500)
+    p.add_argument("--floors", type=int, default=10)
+    p.add_argument("--guests", type=int, default=50000)
+    p.add_argument("--years", type=int, default=3)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--today", help="YYYY-MM-DD the data is centred on (default: today)")
+    args = p.parse_args(argv)
+
+    if os.path.exists(args.db):
+        p.error(f"{args.db} already exists")
+    database.configure(db_path=args.db)
+    database.initialize_database()
+    start = time.perf_counter()
+    summary = generate(args.rooms, args.floors, args.guests, args.years, args.seed, args.today)
+    summary["seconds"] = round(time.perf_counter() - start, 1)
+    database.close_connections()
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
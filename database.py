@@ -4,252 +4,1223 @@ SQLite-based storage for all hotel data
 """
 import sqlite3
 import os
+import random
+import threading
+import time
+import functools
+from datetime import date
+from decimal import Decimal
+from contextlib import contextmanager
+
+import query_stats
+from money import Money, to_minor
 
 DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hotel.db")
+SLOW_LOG_NAME = "slow_queries.log"     # written next to the database (see query_stats)
+query_stats.configure(slow_log=os.path.join(os.path.dirname(DB_PATH), SLOW_LOG_NAME))
 
+# "Today" is the hotel's local calendar day everywhere: check_in/check_out
+# are local dates, while created_at/issued_at are CURRENT_TIMESTAMP (UTC),
+# so today's timestamps fall in [_TODAY_START_UTC, _TODAY_END_UTC).
+_TODAY = "DATE('now', 'localtime')"
+_TODAY_START_UTC = "DATETIME(DATE('now', 'localtime'), 'utc')"
+_TODAY_END_UTC = "DATETIME(DATE('now', 'localtime', '+1 day'), 'utc')"
 
-def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+# PRAGMAs applied to every new connection (see configure()).
+PRAGMAS = {
+    "foreign_keys": "ON",
+}
+
+
+# ─────────────────────────────────────────────────
+# Connection manager
+# ─────────────────────────────────────────────────
+class _SharedConnection(query_stats.TimedConnection):
+    """
+    Long-lived per-thread connection handed out by get_connection().
+    close() is a no-op so older `conn.close()` call sites stay harmless;
+    the real close happens in close_connections().
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def _really_close(self):
+        sqlite3.Connection.close(self)
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_open_connections = set()
+_generation = 0
+_commit_subscribers = []
+
+
+def _open(path, factory=query_stats.TimedConnection, **kwargs):
+    start = time.perf_counter()
+    conn = sqlite3.connect(path, isolation_level=None, factory=factory, **kwargs)
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    query_stats.connection_opened(time.perf_counter() - start)
+    return conn
+
+
+def connect(path=None):
+    """Open a new, private connection with the configured PRAGMAs applied."""
+    return _open(path or DB_PATH)
+
+
+# Money is stored as its integer minor units; these columns come back as Money.
+sqlite3.register_adapter(Money, lambda m: m.minor)
+MONEY_COLUMNS = frozenset({
+    "price_per_night", "total_amount", "advance_paid", "amount", "discount", "tax",
+    "paid_amount", "revenue", "collected", "today_revenue",
+})
+
+
+def row_dict(row):
+    """dict(row) with the money columns as Money."""
+    d = dict(row)
+    for key in MONEY_COLUMNS.intersection(d):
+        if d[key] is not None:
+            d[key] = Money(d[key])
+    return d
+
+
+def get_connection():
+    """
+    Return this thread's shared connection, opening it on first use.
+    The connection is in autocommit mode; group writes with transaction().
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.generation == _generation and _local.path == DB_PATH:
+        return conn
+    if conn is not None:
+        _discard(conn)
+    conn = _open(DB_PATH, check_same_thread=False, factory=_SharedConnection)
+    with _lock:
+        _open_connections.add(conn)
+    _local.conn = conn
+    _local.generation = _generation
+    _local.path = DB_PATH
     return conn
 
 
+def _discard(conn):
+    with _lock:
+        _open_connections.discard(conn)
+    try:
+        conn._really_close()
+    except sqlite3.Error:
+        pass
+
+
+def data_stamp():
+    """
+    A cheap value that changes whenever any table may have changed: rows
+    written through this thread's connection (total_changes) plus commits
+    by any other connection (PRAGMA data_version). Equal stamps mean
+    nothing was written in between.
+    """
+    conn = get_connection()
+    return conn.total_changes, conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+@contextmanager
+def transaction(mode="IMMEDIATE"):
+    """
+    Run a block inside one transaction on the shared connection.
+    Commits on success, rolls back on error. Nested use joins the outer
+    transaction. IMMEDIATE takes the write lock up front, which avoids
+    lock-upgrade failures when two writers race.
+    """
+    conn = get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute(f"BEGIN {mode}")
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        # Also when COMMIT itself fails (e.g. "database is locked"): never
+        # leave the shared connection inside an open transaction.
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    for callback in list(_commit_subscribers):
+        callback()
+
+
+def subscribe_commits(callback):
+    """
+    Call callback() after every transaction() commit, on the committing
+    thread (see events.py). Returns a function that unsubscribes.
+    """
+    _commit_subscribers.append(callback)
+
+    def unsubscribe():
+        if callback in _commit_subscribers:
+            _commit_subscribers.remove(callback)
+    return unsubscribe
+
+
+def close_connections():
+    """Close every shared connection; threads reopen lazily on next use."""
+    global _generation
+    with _lock:
+        conns = list(_open_connections)
+        _open_connections.clear()
+        _generation += 1
+    invalidate_cache()
+    for conn in conns:
+        try:
+            conn._really_close()
+        except sqlite3.Error:
+            pass
+    _local.conn = None
+
+
+def configure(db_path=None, **pragmas):
+    """
+    Point the module at another database file and/or change PRAGMAs,
+    e.g. configure(cache_size=-8000). Open connections are recycled.
+    """
+    global DB_PATH
+    if db_path is not None:
+        DB_PATH = db_path
+        query_stats.configure(slow_log=os.path.join(os.path.dirname(os.path.abspath(db_path)),
+                                                    SLOW_LOG_NAME))
+    PRAGMAS.update({k: str(v) for k, v in pragmas.items()})
+    close_connections()
+
+
+# ─────────────────────────────────────────────────
+# Multi-terminal concurrency mode (opt-in)
+# ─────────────────────────────────────────────────
+# Retry policy for transient "database is locked/busy" errors in the write
+# helpers. Zero retries (the default) keeps the old fail-fast behaviour.
+LOCK_RETRIES = 0
+LOCK_BACKOFF = 0.05   # seconds, doubled per attempt with jitter
+
+
+def enable_concurrency_mode(wal=True, busy_timeout_ms=5000, retries=5, backoff=0.05):
+    """
+    Tune SQLite for several terminals writing to one hotel.db.
+
+    - journal_mode=WAL lets readers (get_all_bookings) run alongside a
+      writer (create_booking) instead of blocking it. WAL needs shared
+      memory, so every terminal must run on the same machine as the file;
+      on an SMB/NFS share pass wal=False and rely on the timeout + retries.
+    - busy_timeout makes SQLite wait for a lock instead of failing at once.
+    - write helpers retry leftover lock errors with exponential backoff.
+
+    Checkpointing: SQLite's automatic PASSIVE checkpoint runs whenever the
+    WAL passes 1000 pages (~4 MB), which never blocks readers or writers.
+    checkpoint() runs a TRUNCATE checkpoint to shrink the -wal file; the
+    app calls it on exit, and it is safe to call from a nightly job.
+    Can also be switched on with HOTEL_DB_CONCURRENCY=1.
+    """
+    global LOCK_RETRIES, LOCK_BACKOFF
+    LOCK_RETRIES, LOCK_BACKOFF = retries, backoff
+    pragmas = {"busy_timeout": busy_timeout_ms}
+    if wal:
+        pragmas.update(journal_mode="WAL", synchronous="NORMAL", wal_autocheckpoint=1000)
+    configure(**pragmas)
+
+
+def checkpoint(mode="TRUNCATE"):
+    """Fold the WAL back into hotel.db. Returns (busy, wal_pages, moved)."""
+    row = get_connection().execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+    return tuple(row)
+
+
+def _is_lock_error(exc):
+    msg = str(exc).lower()
+    return "locked" in msg or "busy" in msg
+
+
+def retry_on_lock(fn):
+    """Retry a write helper on transient lock errors (see LOCK_RETRIES)."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                # Inside an outer transaction the caller owns the retry.
+                if (attempt >= LOCK_RETRIES or not _is_lock_error(e)
+                        or get_connection().in_transaction):
+                    raise
+                attempt += 1
+                time.sleep(LOCK_BACKOFF * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+    return wrapper
+
+
+# ─────────────────────────────────────────────────
+# Short-lived read cache
+# ─────────────────────────────────────────────────
+# For aggregates several pages ask for within the same second (stats bar,
+# Home, Reports). Entries expire after CACHE_TTL seconds, which bounds how
+# stale changes made by other terminals can look; local writes drop the
+# cache at once through invalidate_cache().
+CACHE_TTL = 5.0
+_cache = {}
+_cache_generation = 0
+
+
+def cached(fn):
+    """Cache fn(*args) per database for CACHE_TTL seconds. Do not mutate results."""
+    @functools.wraps(fn)
+    def wrapper(*args):
+        key = (DB_PATH, fn.__name__, args)
+        now = time.monotonic()
+        hit = _cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+        generation = _cache_generation
+        value = fn(*args)
+        # Skip storing if a write invalidated the cache while we were reading.
+        if generation == _cache_generation:
+            _cache[key] = (now + CACHE_TTL, value)
+        return value
+    return wrapper
+
+
+def invalidate_cache():
+    global _cache_generation
+    _cache_generation += 1
+    _cache.clear()
+    _settings_checked.clear()     # next settings read re-checks the change counter
+
+
+@retry_on_lock
 def initialize_database():
     """Create all tables and seed default data if needed."""
-    conn = get_connection()
-    c = conn.cursor()
+    with transaction() as conn:
+        c = conn.cursor()
 
-    # Users table
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            role TEXT NOT NULL DEFAULT 'receptionist',
-            full_name TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
+        # Users table
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                role TEXT NOT NULL DEFAULT 'receptionist',
+                full_name TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Hotel settings
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+        # Rooms table
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS rooms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                room_number TEXT UNIQUE NOT NULL,
+                room_type TEXT NOT NULL DEFAULT 'Standard',
+                floor INTEGER DEFAULT 1,
+                price_per_night REAL NOT NULL DEFAULT 1000.0,
+                status TEXT NOT NULL DEFAULT 'available',
+                description TEXT
+            )
+        """)
+
+        # Guests table
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS guests (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                full_name TEXT NOT NULL,
+                phone TEXT,
+                email TEXT,
+                nid TEXT,
+                address TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Bookings table
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS bookings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                room_id INTEGER NOT NULL,
+                guest_id INTEGER NOT NULL,
+                check_in DATE NOT NULL,
+                check_out DATE NOT NULL,
+                nights INTEGER NOT NULL DEFAULT 1,
+                total_amount REAL NOT NULL DEFAULT 0,
+                advance_paid REAL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'active',
+                notes TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (room_id) REFERENCES rooms(id),
+                FOREIGN KEY (guest_id) REFERENCES guests(id)
+            )
+        """)
+
+        # Invoices table
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS invoices (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                booking_id INTEGER NOT NULL,
+                invoice_number TEXT UNIQUE NOT NULL,
+                amount REAL NOT NULL,
+                discount REAL DEFAULT 0,
+                tax REAL DEFAULT 0,
+                paid_amount REAL DEFAULT 0,
+                status TEXT DEFAULT 'unpaid',
+                issued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (booking_id) REFERENCES bookings(id)
+            )
+        """)
+
+    # Bring the schema up to date before seeding, so seed rows use its units.
+    migrate()
+
+    with transaction() as conn:
+        c = conn.cursor()
+
+        # Seed default settings
+        for k, v in DEFAULT_SETTINGS.items():
+            c.execute("INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)", (k, v))
+
+        # Seed default admin user (password: admin123)
+        import hashlib
+        def _hash(p):
+            return hashlib.sha256(p.encode()).hexdigest()
+
+        c.execute("INSERT OR IGNORE INTO users (username, password, role, full_name) VALUES (?, ?, ?, ?)",
+                  ("admin", _hash("admin123"), "admin", "Administrator"))
+
+        # Seed rooms (30 rooms: floors 1-3, 10 per floor)
+        room_types = {1: "Standard", 2: "Deluxe", 3: "Suite"}
+        prices = {1: 1500_00, 2: 2500_00, 3: 4000_00}     # paisa
+        for floor in range(1, 4):
+            for num in range(1, 11):
+                rnum = f"{floor}{num:02d}"
+                rtype = room_types[floor]
+                price = prices[floor]
+                c.execute("""
+                    INSERT OR IGNORE INTO rooms (room_number, room_type, floor, price_per_night, status)
+                    VALUES (?, ?, ?, ?, 'available')
+                """, (rnum, rtype, floor, price))
+
+    refresh_room_statuses()
+    prune_change_log()
+
+
+# ─────────────────────────────────────────────────
+# Schema migrations
+# ─────────────────────────────────────────────────
+# Guest search index. Trigram tokens give prefix *and* substring matches, so
+# "sak", "5678" (tail of a phone number) and NID fragments all hit the index.
+# Phone numbers are indexed as bare digits. Builds without FTS5 (or with
+# SQLite < 3.34, which lacks the trigram tokenizer) keep the LIKE fallback.
+_PHONE_DIGITS = "replace(replace(replace(replace(replace({}, '-', ''), ' ', ''), '+', ''), '(', ''), ')', '')"
+
+
+def _fts5_supported(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._fts5_probe USING fts5(x, tokenize='trigram')")
+        conn.execute("DROP TABLE temp._fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+_GUESTS_FTS_AI = f"""
+    CREATE TRIGGER IF NOT EXISTS guests_fts_ai AFTER INSERT ON guests BEGIN
+        INSERT INTO guests_fts (rowid, full_name, phone, nid)
+        VALUES (new.id, new.full_name, {_PHONE_DIGITS.format('new.phone')}, new.nid);
+    END
+"""
+
+
+def _create_guest_search(conn):
+    if not _fts5_supported(conn):
+        return
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS guests_fts
+        USING fts5(full_name, phone, nid, tokenize='trigram')
+    """)
+    conn.execute(_GUESTS_FTS_AI)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS guests_fts_ad AFTER DELETE ON guests BEGIN
+            DELETE FROM guests_fts WHERE rowid = old.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS guests_fts_au AFTER UPDATE OF full_name, phone, nid ON guests BEGIN
+            UPDATE guests_fts SET full_name = new.full_name,
+                                  phone = {_PHONE_DIGITS.format('new.phone')}, nid = new.nid
+            WHERE rowid = new.id;
+        END
+    """)
+    conn.execute("DELETE FROM guests_fts")
+    conn.execute(f"""
+        INSERT INTO guests_fts (rowid, full_name, phone, nid)
+        SELECT id, full_name, {_PHONE_DIGITS.format('phone')}, nid FROM guests
+    """)
+
+
+# Per-day totals of non-cancelled bookings, keyed by DATE(created_at).
+_DAILY_REVENUE_SELECT = """
+    SELECT DATE(created_at), COUNT(*), COALESCE(SUM(total_amount), 0),
+           COALESCE(SUM(advance_paid), 0)
+    FROM bookings WHERE status != 'cancelled'
+    GROUP BY DATE(created_at)
+"""
+# Add (+) or remove (-) one booking row (new/old) from its day's totals.
+# The WHERE keeps cancelled bookings out and lets one template serve every trigger.
+_DAILY_REVENUE_APPLY = """
+    INSERT INTO daily_revenue (date, bookings, revenue, collected)
+    SELECT DATE({row}.created_at), {sign}1, {sign}{row}.total_amount,
+           {sign}COALESCE({row}.advance_paid, 0)
+    WHERE {row}.status != 'cancelled'
+    ON CONFLICT(date) DO UPDATE SET bookings  = bookings + excluded.bookings,
+                                    revenue   = revenue + excluded.revenue,
+                                    collected = collected + excluded.collected;
+"""
+_DAILY_REVENUE_PRUNE = """
+    DELETE FROM daily_revenue WHERE date = DATE(old.created_at) AND bookings = 0;
+"""
+
+
+def _create_daily_revenue(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS daily_revenue (
+            date TEXT PRIMARY KEY,
+            bookings INTEGER NOT NULL DEFAULT 0,
+            revenue REAL NOT NULL DEFAULT 0,
+            collected REAL NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_revenue_ai AFTER INSERT ON bookings BEGIN
+            {_DAILY_REVENUE_APPLY.format(sign='+', row='new')}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_revenue_ad AFTER DELETE ON bookings BEGIN
+            {_DAILY_REVENUE_APPLY.format(sign='-', row='old')}
+            {_DAILY_REVENUE_PRUNE}
+        END
+    """)
+    # Cancel, checkout and amount edits: take the old row out, put the new one in.
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_revenue_au
+        AFTER UPDATE OF status, total_amount, advance_paid, created_at ON bookings BEGIN
+            {_DAILY_REVENUE_APPLY.format(sign='-', row='old')}
+            {_DAILY_REVENUE_APPLY.format(sign='+', row='new')}
+            {_DAILY_REVENUE_PRUNE}
+        END
     """)
+    _rebuild_daily_revenue(conn)
 
-    # Hotel settings
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT
+
+def _rebuild_daily_revenue(conn):
+    conn.execute("DELETE FROM daily_revenue")
+    conn.execute("INSERT INTO daily_revenue (date, bookings, revenue, collected) "
+                 + _DAILY_REVENUE_SELECT)
+
+
+# Tables whose row changes are logged for other terminals (see events.py).
+# Migration 9 logs the first four, migration 10 adds users.
+CHANGE_LOG_TABLES = ("rooms", "guests", "bookings", "invoices", "users")
+
+
+def _create_change_log(conn):
+    # AUTOINCREMENT: a seq is never handed out twice, even after pruning.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    _log_changes(conn, ("rooms", "guests", "bookings", "invoices"))
+
+
+def _log_user_changes(conn):
+    _log_changes(conn, ("users",))
+
 
-    # Rooms table
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS rooms (
+def _log_changes(conn, tables):
+    for table in tables:
+        columns = [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+        # Only real changes: _sync_room_status rewrites every room's status.
+        changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in columns)
+        for event, row in (("INSERT", "new"), ("UPDATE", "new"), ("DELETE", "old")):
+            when = f"WHEN {changed}" if event == "UPDATE" else ""
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS change_log_{table}_{event.lower()}
+                AFTER {event} ON {table} {when} BEGIN
+                    INSERT INTO change_log (entity, row_id, kind)
+                    VALUES ('{table}', {row}.id, '{event.lower()}');
+                END
+            """)
+
+
+# Money columns as INTEGER minor units (see money.py). The CHECKs stop a REAL
+# from sneaking back in through raw SQL.
+_MONEY_TABLES = {
+    "rooms": ("""
+        CREATE TABLE {name} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             room_number TEXT UNIQUE NOT NULL,
             room_type TEXT NOT NULL DEFAULT 'Standard',
             floor INTEGER DEFAULT 1,
-            price_per_night REAL NOT NULL DEFAULT 1000.0,
+            price_per_night INTEGER NOT NULL DEFAULT 100000
+                CHECK (typeof(price_per_night) = 'integer'),
             status TEXT NOT NULL DEFAULT 'available',
             description TEXT
-        )
-    """)
-
-    # Guests table
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS guests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            full_name TEXT NOT NULL,
-            phone TEXT,
-            email TEXT,
-            nid TEXT,
-            address TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # Bookings table
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS bookings (
+        )""", """
+        SELECT id, room_number, room_type, floor, {price_per_night}, status, description
+        FROM rooms"""),
+    "bookings": ("""
+        CREATE TABLE {name} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             room_id INTEGER NOT NULL,
             guest_id INTEGER NOT NULL,
             check_in DATE NOT NULL,
             check_out DATE NOT NULL,
             nights INTEGER NOT NULL DEFAULT 1,
-            total_amount REAL NOT NULL DEFAULT 0,
-            advance_paid REAL DEFAULT 0,
+            total_amount INTEGER NOT NULL DEFAULT 0 CHECK (typeof(total_amount) = 'integer'),
+            advance_paid INTEGER NOT NULL DEFAULT 0 CHECK (typeof(advance_paid) = 'integer'),
             status TEXT NOT NULL DEFAULT 'active',
             notes TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (room_id) REFERENCES rooms(id),
             FOREIGN KEY (guest_id) REFERENCES guests(id)
-        )
-    """)
-
-    # Invoices table
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS invoices (
+        )""", """
+        SELECT id, room_id, guest_id, check_in, check_out, nights, {total_amount},
+               {advance_paid}, status, notes, created_at
+        FROM bookings"""),
+    "invoices": ("""
+        CREATE TABLE {name} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             booking_id INTEGER NOT NULL,
             invoice_number TEXT UNIQUE NOT NULL,
-            amount REAL NOT NULL,
-            discount REAL DEFAULT 0,
-            tax REAL DEFAULT 0,
-            paid_amount REAL DEFAULT 0,
+            amount INTEGER NOT NULL CHECK (typeof(amount) = 'integer'),
+            discount INTEGER NOT NULL DEFAULT 0 CHECK (typeof(discount) = 'integer'),
+            tax INTEGER NOT NULL DEFAULT 0 CHECK (typeof(tax) = 'integer'),
+            paid_amount INTEGER NOT NULL DEFAULT 0 CHECK (typeof(paid_amount) = 'integer'),
             status TEXT DEFAULT 'unpaid',
             issued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (booking_id) REFERENCES bookings(id)
+        )""", """
+        SELECT id, booking_id, invoice_number, {amount}, {discount}, {tax}, {paid_amount},
+               status, issued_at
+        FROM invoices"""),
+    "room_charges": ("""
+        CREATE TABLE {name} (
+            booking_id INTEGER NOT NULL REFERENCES bookings(id),
+            date TEXT NOT NULL,
+            amount INTEGER NOT NULL CHECK (typeof(amount) = 'integer'),
+            posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (booking_id, date)
+        ) WITHOUT ROWID""", """
+        SELECT booking_id, date, {amount}, posted_at FROM room_charges"""),
+}
+_TO_MINOR = "CAST(ROUND(COALESCE({0}, 0) * 100) AS INTEGER)"
+
+
+def _rebuild_table(conn, table, create_sql, select_sql):
+    """
+    Replace `table` with a new definition (the create-copy-drop-rename
+    rebuild), keeping its indexes, triggers and AUTOINCREMENT counter.
+    """
+    extras = [r[0] for r in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') "
+        "AND sql IS NOT NULL", (table,))]
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    conn.execute(create_sql.format(name=f"{table}_new"))
+    conn.execute(f"INSERT INTO {table}_new {select_sql}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    if seq:
+        conn.execute("DELETE FROM sqlite_sequence WHERE name = ?", (table,))
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) "
+                     "SELECT ?, MAX(?, COALESCE((SELECT MAX(rowid) FROM " + table + "), 0))",
+                     (table, seq[0]))
+    for sql in extras:
+        conn.execute(sql)
+
+
+def _money_to_minor_units(conn):
+    # What the Reports page showed (float sums kept by triggers) next to the
+    # exact per-day totals, for reconcile_money(). Computed in two GROUP BYs.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS money_reconciliation (
+            date TEXT PRIMARY KEY,
+            legacy_revenue REAL NOT NULL,
+            legacy_collected REAL NOT NULL,
+            revenue INTEGER NOT NULL,
+            collected INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conn.execute(f"""
+        WITH exact AS (
+            SELECT DATE(created_at) AS date,
+                   SUM({_TO_MINOR.format('total_amount')}) AS revenue,
+                   SUM({_TO_MINOR.format('advance_paid')}) AS collected
+            FROM bookings WHERE status != 'cancelled' GROUP BY DATE(created_at)
+        ), days AS (
+            SELECT date FROM exact UNION SELECT date FROM daily_revenue
         )
+        INSERT INTO money_reconciliation
+        SELECT days.date, COALESCE(d.revenue, 0), COALESCE(d.collected, 0),
+               COALESCE(e.revenue, 0), COALESCE(e.collected, 0)
+        FROM days
+        LEFT JOIN daily_revenue d ON d.date = days.date
+        LEFT JOIN exact e ON e.date = days.date
+    """)
+
+    # The revenue triggers are recreated (and the table refilled) at the end.
+    for trigger in ("daily_revenue_ai", "daily_revenue_ad", "daily_revenue_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE IF EXISTS daily_revenue")
+    for table, (create_sql, select_sql) in _MONEY_TABLES.items():
+        columns = ("price_per_night", "total_amount", "advance_paid", "amount", "discount",
+                   "tax", "paid_amount")
+        _rebuild_table(conn, table, create_sql,
+                       select_sql.format(**{c: _TO_MINOR.format(c) for c in columns}))
+    conn.execute("""
+        CREATE TABLE daily_revenue (
+            date TEXT PRIMARY KEY,
+            bookings INTEGER NOT NULL DEFAULT 0,
+            revenue INTEGER NOT NULL DEFAULT 0,
+            collected INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
     """)
+    _create_daily_revenue(conn)
 
-    conn.commit()
-
-    # Seed default settings
-    defaults = {
-        "hotel_name": "Grand Hotel",
-        "hotel_address": "123 Main Street, Dhaka",
-        "hotel_phone": "01700000000",
-        "hotel_email": "info@grandhotel.com",
-        "currency": "BDT",
-        "tax_rate": "0",
-    }
-    for k, v in defaults.items():
-        c.execute("INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)", (k, v))
-
-    # Seed default admin user (password: admin123)
-    import hashlib
-    def _hash(p):
-        return hashlib.sha256(p.encode()).hexdigest()
-
-    c.execute("INSERT OR IGNORE INTO users (username, password, role, full_name) VALUES (?, ?, ?, ?)",
-              ("admin", _hash("admin123"), "admin", "Administrator"))
-
-    # Seed rooms (30 rooms: floors 1-3, 10 per floor)
-    room_types = {1: "Standard", 2: "Deluxe", 3: "Suite"}
-    prices = {1: 1500, 2: 2500, 3: 4000}
-    for floor in range(1, 4):
-        for num in range(1, 11):
-            rnum = f"{floor}{num:02d}"
-            rtype = room_types[floor]
-            price = prices[floor]
-            c.execute("""
-                INSERT OR IGNORE INTO rooms (room_number, room_type, floor, price_per_night, status)
-                VALUES (?, ?, ?, ?, 'available')
-            """, (rnum, rtype, floor, price))
-
-    conn.commit()
-    conn.close()
+
+# MIGRATIONS[n] upgrades a database from PRAGMA user_version n to n+1.
+# Entries are lists of SQL statements and/or callables taking the connection.
+# Append only — never edit a step that has shipped.
+MIGRATIONS = [
+    # 1: secondary indexes for the status/date filters, FK joins and invoice lookup
+    [
+        "CREATE INDEX IF NOT EXISTS idx_bookings_status_check_in ON bookings(status, check_in)",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_room ON bookings(room_id)",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_guest ON bookings(guest_id)",
+        "CREATE INDEX IF NOT EXISTS idx_bookings_created_at ON bookings(created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_booking ON invoices(booking_id)",
+    ],
+    # 2: date-range availability lookups; supersedes the plain room_id index
+    [
+        "CREATE INDEX IF NOT EXISTS idx_bookings_room_dates "
+        "ON bookings(room_id, status, check_out, check_in)",
+        "DROP INDEX IF EXISTS idx_bookings_room",
+    ],
+    # 3: FTS5 guest search (skipped when FTS5 is missing) + name index for
+    #    short prefixes and the alphabetical guest list
+    [
+        _create_guest_search,
+        "CREATE INDEX IF NOT EXISTS idx_guests_name ON guests(full_name COLLATE NOCASE)",
+    ],
+    # 4: trigger-maintained per-day revenue totals for the Reports page
+    [
+        _create_daily_revenue,
+    ],
+    # 5: named counters for gap-free document numbers (see next_in_sequence)
+    [
+        "CREATE TABLE IF NOT EXISTS sequences (name TEXT PRIMARY KEY, value INTEGER NOT NULL) "
+        "WITHOUT ROWID",
+    ],
+    # 6: night audit ledger (see night_audit.py)
+    [
+        """CREATE TABLE IF NOT EXISTS room_charges (
+            booking_id INTEGER NOT NULL REFERENCES bookings(id),
+            date TEXT NOT NULL,
+            amount REAL NOT NULL,
+            posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (booking_id, date)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS audit_runs (
+            business_date TEXT PRIMARY KEY,
+            charges INTEGER NOT NULL DEFAULT 0,
+            invoices INTEGER NOT NULL DEFAULT 0,
+            overstays INTEGER NOT NULL DEFAULT 0,
+            runs INTEGER NOT NULL DEFAULT 1,
+            seconds REAL,
+            finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) WITHOUT ROWID""",
+    ],
+    # 7: change counter behind the process-wide settings cache (see _load_settings)
+    [
+        "INSERT OR IGNORE INTO sequences (name, value) VALUES ('settings', 0)",
+        *[f"""CREATE TRIGGER IF NOT EXISTS settings_version_{event.lower()}
+              AFTER {event} ON settings BEGIN
+                  UPDATE sequences SET value = value + 1 WHERE name = 'settings';
+              END""" for event in ("INSERT", "UPDATE", "DELETE")],
+    ],
+    # 8: money as INTEGER minor units, plus a record of the old float totals
+    [
+        _money_to_minor_units,
+    ],
+    # 9: row change log read by other terminals (see events.py)
+    [
+        _create_change_log,
+    ],
+    # 10: log user account changes too (Settings > Users)
+    [
+        _log_user_changes,
+    ],
+]
+
+
+def schema_version(conn=None):
+    return (conn or get_connection()).execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate():
+    """
+    Upgrade the open database in place to the latest schema version.
+    All pending steps run in one transaction, so a failure leaves the
+    file untouched. Foreign keys are off while tables are rebuilt and
+    checked once at the end. Returns the resulting version.
+    """
+    conn = get_connection()
+    if schema_version(conn) >= len(MIGRATIONS):
+        return schema_version(conn)
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        with transaction() as conn:
+            # Re-read under the write lock: another terminal may have upgraded.
+            for version in range(schema_version(conn), len(MIGRATIONS)):
+                for sql in MIGRATIONS[version]:
+                    if callable(sql):
+                        sql(conn)
+                    else:
+                        conn.execute(sql)
+                conn.execute(f"PRAGMA user_version = {version + 1}")
+            bad = conn.execute("PRAGMA foreign_key_check").fetchall()
+            if bad:
+                raise sqlite3.IntegrityError(f"Migration broke {len(bad)} foreign key(s)")
+    finally:
+        conn.execute(f"PRAGMA foreign_keys = {PRAGMAS.get('foreign_keys', 'ON')}")
+    return schema_version(conn)
+
+
+# Representative queries whose plans must stay on an index. Keep these in
+# step with the helpers below; check_query_plans() reports any that regress
+# to a full table scan.
+QUERY_PLAN_CHECKS = {
+    "get_active_bookings": ("SELECT b.id FROM bookings b WHERE b.status = 'active' "
+                            "ORDER BY b.check_in", ()),
+    "get_invoice_by_booking": ("SELECT * FROM invoices WHERE booking_id=? "
+                               "ORDER BY id DESC LIMIT 1", (1,)),
+    "get_revenue_report": ("SELECT * FROM daily_revenue WHERE date BETWEEN ? AND ?",
+                           ("2026-01-01", "2026-01-31")),
+    "bookings_by_room": ("SELECT id FROM bookings WHERE room_id=?", (1,)),
+    "room_overlap": ("SELECT 1 FROM bookings WHERE room_id = ? AND status = 'active' "
+                     "AND check_out > ? AND check_in < ?", (1, "2026-01-01", "2026-01-05")),
+    "bookings_by_guest": ("SELECT id FROM bookings WHERE guest_id=?", (1,)),
+    "today_revenue": (f"SELECT SUM(total_amount) FROM bookings WHERE created_at >= {_TODAY_START_UTC} "
+                      f"AND created_at < {_TODAY_END_UTC} AND status = 'active'", ()),
+    "guest_name_prefix": ("SELECT id FROM guests WHERE full_name LIKE ? LIMIT 50", ("sa%",)),
+}
+
+
+def explain(sql, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    rows = get_connection().execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [r["detail"] for r in rows]
+
+
+def check_query_plans():
+    """Return {name: plan} for every QUERY_PLAN_CHECKS entry that full-scans a table."""
+    failures = {}
+    for name, (sql, params) in QUERY_PLAN_CHECKS.items():
+        plan = explain(sql, params)
+        if any(line.startswith("SCAN") and "USING" not in line for line in plan):
+            failures[name] = plan
+    return failures
 
 
 # ─────────────────────────────────────────────────
 # Settings helpers
 # ─────────────────────────────────────────────────
-def get_settings():
+# Every process keeps one snapshot of the settings table. Triggers bump the
+# 'settings' counter in `sequences` on any change (migration 7), so a read
+# re-reads the table only when that counter moved, and looks at the counter
+# only when PRAGMA data_version says another connection has committed since
+# this connection last checked, at most every SETTINGS_RECHECK seconds.
+# set_settings() writes through. Subscribers hear about changes made in this
+# process at once, and about changes made by other terminals on the next
+# read or poll_settings() after that.
+DEFAULT_SETTINGS = {
+    "hotel_name": "Grand Hotel",
+    "hotel_address": "123 Main Street, Dhaka",
+    "hotel_phone": "01700000000",
+    "hotel_email": "info@grandhotel.com",
+    "currency": "BDT",
+    "tax_rate": "0",
+    "invoice_prefix": "INV-",
+    "invoice_reset": "yearly",   # or "never"
+}
+# Settings read back as something other than str.
+SETTING_TYPES = {"tax_rate": Decimal}
+
+SETTINGS_RECHECK = 0.5     # seconds
+
+_settings = None            # {"path", "version", "raw", "typed"}
+_settings_checked = {}      # id(connection) -> (PRAGMA data_version, monotonic time) at the last check
+_settings_subscribers = []
+
+
+def _typed(key, raw):
+    kind = SETTING_TYPES.get(key)
+    if kind is None:
+        return raw
+    try:
+        return kind(raw)
+    except (ArithmeticError, ValueError, TypeError):
+        return kind(DEFAULT_SETTINGS[key])
+
+
+def _settings_version(conn):
+    """The trigger-maintained change counter, or None before migration 7."""
+    try:
+        row = conn.execute("SELECT value FROM sequences WHERE name = 'settings'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def _publish_settings(raw, version):
+    """Install a new snapshot and tell subscribers which keys changed."""
+    global _settings
+    with _lock:
+        # The first snapshot of a database is a baseline, not a change.
+        old = _settings["raw"] if _settings and _settings["path"] == DB_PATH else raw
+        changed = [k for k in raw.keys() | old.keys() if old.get(k) != raw.get(k)]
+        snap = _settings = {"path": DB_PATH, "version": version, "raw": raw,
+                            "typed": {k: _typed(k, v) for k, v in raw.items()}}
+    if changed:
+        update = {k: snap["typed"].get(k) for k in changed}
+        for callback in list(_settings_subscribers):
+            callback(update)
+    return snap
+
+
+def _load_settings():
     conn = get_connection()
-    rows = conn.execute("SELECT key, value FROM settings").fetchall()
-    conn.close()
-    return {r["key"]: r["value"] for r in rows}
+    snap = _settings
+    fresh = snap is not None and snap["path"] == DB_PATH
+    checked = _settings_checked.get(id(conn))
+    now = time.monotonic()
+    if fresh and checked and now - checked[1] < SETTINGS_RECHECK:
+        return snap
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if fresh and checked and checked[0] == data_version:
+        _settings_checked[id(conn)] = (data_version, now)
+        return snap
+    version = _settings_version(conn)     # read before the rows: a racing write forces a re-read
+    if snap is None or snap["path"] != DB_PATH or version is None or version != snap["version"]:
+        rows = conn.execute("SELECT key, value FROM settings").fetchall()
+        snap = _publish_settings({r["key"]: r["value"] for r in rows}, version)
+    _settings_checked[id(conn)] = (data_version, now)
+    return snap
+
+
+def get_settings():
+    """All settings as stored (strings). Returns a copy."""
+    return dict(_load_settings()["raw"])
+
+
+def get_setting(key, default=None):
+    """One setting, converted per SETTING_TYPES (tax_rate is a Decimal)."""
+    return _load_settings()["typed"].get(key, default)
+
+
+def typed_settings():
+    """All settings converted per SETTING_TYPES, from one check. Do not mutate."""
+    return _load_settings()["typed"]
+
+
+def poll_settings():
+    """Pick up changes committed by other processes and notify subscribers."""
+    _load_settings()
+
+
+def subscribe_settings(callback):
+    """
+    Call callback({key: typed value}) whenever settings change. Callbacks run
+    on the thread that noticed the change (the Tk thread for UI pages, which
+    are the only readers there). Returns a function that unsubscribes.
+    """
+    _settings_subscribers.append(callback)
+
+    def unsubscribe():
+        if callback in _settings_subscribers:
+            _settings_subscribers.remove(callback)
+    return unsubscribe
+
+
+@retry_on_lock
+def set_settings(values):
+    """Save several settings in one transaction; raises ValueError for badly typed values."""
+    for key, value in values.items():
+        if key in SETTING_TYPES:
+            try:
+                SETTING_TYPES[key](value)
+            except (ArithmeticError, ValueError, TypeError):
+                raise ValueError(f"{key} must be a number, got {value!r}")
+    _load_settings()    # baseline, so subscribers hear only about the keys that change
+    with transaction() as conn:
+        conn.executemany("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                         [(k, str(v)) for k, v in values.items()])
+        version = _settings_version(conn)
+        rows = conn.execute("SELECT key, value FROM settings").fetchall()
+    invalidate_cache()
+    _publish_settings({r["key"]: r["value"] for r in rows}, version)
 
 
 def set_setting(key, value):
-    conn = get_connection()
-    conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
-    conn.commit()
-    conn.close()
+    set_settings({key: value})
 
 
 # ─────────────────────────────────────────────────
 # Room helpers
 # ─────────────────────────────────────────────────
 def get_all_rooms():
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM rooms ORDER BY room_number").fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    rows = get_connection().execute("SELECT * FROM rooms ORDER BY room_number").fetchall()
+    return [row_dict(r) for r in rows]
+
 
+def get_room(room_id):
+    row = get_connection().execute("SELECT * FROM rooms WHERE id=?", (room_id,)).fetchone()
+    return row_dict(row) if row else None
 
+
+MANUAL_ROOM_STATUSES = ("available", "maintenance")
+
+
+@retry_on_lock
 def update_room_status(room_id, status):
-    conn = get_connection()
-    conn.execute("UPDATE rooms SET status=? WHERE id=?", (status, room_id))
-    conn.commit()
-    conn.close()
+    """
+    Put a room under maintenance or take it out again. "booked" is not set by
+    hand: it follows the room's active bookings (see _sync_room_status).
+    """
+    if status not in MANUAL_ROOM_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(MANUAL_ROOM_STATUSES)}; "
+                         "rooms are booked through bookings")
+    with transaction() as conn:
+        conn.execute("UPDATE rooms SET status=? WHERE id=?", (status, room_id))
+        if status == "available":
+            _sync_room_status(conn, room_id)
+    invalidate_cache()
 
 
+@retry_on_lock
 def update_room(room_id, room_type, price, description):
-    conn = get_connection()
-    conn.execute("UPDATE rooms SET room_type=?, price_per_night=?, description=? WHERE id=?",
-                 (room_type, price, description, room_id))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE rooms SET room_type=?, price_per_night=?, description=? WHERE id=?",
+                     (room_type, to_minor(price), description, room_id))
 
 
 # ─────────────────────────────────────────────────
 # Guest helpers
 # ─────────────────────────────────────────────────
 def get_all_guests():
-    conn = get_connection()
-    rows = conn.execute("SELECT * FROM guests ORDER BY full_name").fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    rows = get_connection().execute("SELECT * FROM guests ORDER BY full_name").fetchall()
+    return [row_dict(r) for r in rows]
 
 
+@retry_on_lock
 def add_guest(full_name, phone, email, nid, address):
-    conn = get_connection()
-    c = conn.execute(
-        "INSERT INTO guests (full_name, phone, email, nid, address) VALUES (?, ?, ?, ?, ?)",
-        (full_name, phone, email, nid, address)
-    )
-    gid = c.lastrowid
-    conn.commit()
-    conn.close()
-    return gid
+    with transaction() as conn:
+        c = conn.execute(
+            "INSERT INTO guests (full_name, phone, email, nid, address) VALUES (?, ?, ?, ?, ?)",
+            (full_name, phone, email, nid, address)
+        )
+    invalidate_cache()
+    return c.lastrowid
 
 
+@retry_on_lock
+def add_guests(rows):
+    """
+    Insert many guests at once: rows are (id, full_name, phone, email, nid, address)
+    with fresh ids. Joins the caller's transaction if there is one. The search
+    index is filled in one statement, which is several times faster than the
+    per-row trigger.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    with transaction() as conn:
+        indexed = has_search_index()
+        if indexed:
+            conn.execute("DROP TRIGGER IF EXISTS guests_fts_ai")
+        conn.executemany("INSERT INTO guests (id, full_name, phone, email, nid, address) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        if indexed:
+            conn.execute(f"""
+                INSERT INTO guests_fts (rowid, full_name, phone, nid)
+                SELECT id, full_name, {_PHONE_DIGITS.format('phone')}, nid FROM guests
+                WHERE id BETWEEN ? AND ?
+            """, (min(r[0] for r in rows), max(r[0] for r in rows)))
+            conn.execute(_GUESTS_FTS_AI)
+    invalidate_cache()
+
+
+@retry_on_lock
 def update_guest(gid, full_name, phone, email, nid, address):
-    conn = get_connection()
-    conn.execute(
-        "UPDATE guests SET full_name=?, phone=?, email=?, nid=?, address=? WHERE id=?",
-        (full_name, phone, email, nid, address, gid)
-    )
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE guests SET full_name=?, phone=?, email=?, nid=?, address=? WHERE id=?",
+            (full_name, phone, email, nid, address, gid)
+        )
 
 
+@retry_on_lock
 def delete_guest(gid):
-    conn = get_connection()
-    conn.execute("DELETE FROM guests WHERE id=?", (gid,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("DELETE FROM guests WHERE id=?", (gid,))
+    invalidate_cache()
 
 
-def search_guests(query):
-    conn = get_connection()
-    rows = conn.execute(
-        "SELECT * FROM guests WHERE full_name LIKE ? OR phone LIKE ? OR nid LIKE ?",
-        (f"%{query}%", f"%{query}%", f"%{query}%")
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+def has_search_index():
+    """True when the FTS5 guest index exists in the open database."""
+    return get_connection().execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='guests_fts'").fetchone() is not None
+
+
+def _guest_match(query, limit):
+    """
+    Build a subquery selecting matching guest ids, ranked best first:
+    FTS5 trigram MATCH when available and every term has 3+ characters,
+    otherwise the first `limit` names with that prefix (walks the name
+    index, so one- and two-letter queries stay cheap), or the plain LIKE
+    fallback on builds without FTS5.
+    """
+    terms = []
+    for t in query.split():
+        digits = t.strip("+()").replace("-", "")
+        terms.append(digits if digits.isdigit() else t)
+    if has_search_index() and terms and all(len(t) >= 3 for t in terms):
+        fts = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        return "SELECT rowid AS id, rank FROM guests_fts WHERE guests_fts MATCH ?", (fts,)
+    if has_search_index():
+        return ("SELECT id, 0 AS rank FROM guests WHERE full_name LIKE ? "
+                "ORDER BY full_name COLLATE NOCASE LIMIT ?", (f"{query}%", limit))
+    like = f"%{query}%"
+    return ("SELECT id, 0 AS rank FROM guests WHERE full_name LIKE ? OR phone LIKE ? OR nid LIKE ?",
+            (like, like, like))
+
+
+def search_guests(query, limit=200):
+    """Guests matching a name prefix/fragment, phone fragment or NID; best first."""
+    match_sql, params = _guest_match(query.strip(), limit)
+    rows = get_connection().execute(f"""
+        SELECT g.* FROM ({match_sql}) m JOIN guests g ON g.id = m.id
+        ORDER BY g.full_name LIKE ? DESC, m.rank, g.full_name
+        LIMIT ?
+    """, params + (f"{query.strip()}%", limit)).fetchall()
+    return [row_dict(r) for r in rows]
 
 
 # ─────────────────────────────────────────────────
 # Booking helpers
 # ─────────────────────────────────────────────────
+class BookingConflict(ValueError):
+    """The room already has an active booking overlapping the requested stay."""
+
+
+# An active booking [b.check_in, b.check_out) overlaps the stay [in, out)
+# when it starts before `out` and ends after `in`. Check-out day is free
+# for the next arrival. Served by idx_bookings_room_dates.
+_OVERLAP = "b.status = 'active' AND b.check_out > ? AND b.check_in < ?"
+
+
+def get_available_rooms(check_in, check_out):
+    """Rooms (not under maintenance) free for the whole stay [check_in, check_out)."""
+    rows = get_connection().execute(f"""
+        SELECT r.* FROM rooms r
+        WHERE r.status != 'maintenance'
+          AND NOT EXISTS (SELECT 1 FROM bookings b WHERE b.room_id = r.id AND {_OVERLAP})
+        ORDER BY r.room_number
+    """, (str(check_in), str(check_out))).fetchall()
+    return [row_dict(r) for r in rows]
+
+
+def is_room_available(room_id, check_in, check_out):
+    row = get_connection().execute(f"""
+        SELECT r.status,
+               EXISTS (SELECT 1 FROM bookings b WHERE b.room_id = r.id AND {_OVERLAP}) AS taken
+        FROM rooms r WHERE r.id = ?
+    """, (str(check_in), str(check_out), room_id)).fetchone()
+    return bool(row) and row["status"] != "maintenance" and not row["taken"]
+
+
+def _sync_room_status(conn, room_id=None):
+    """
+    rooms.status means "occupied tonight": set it from the active bookings
+    that have started. A guest staying past check_out keeps the room until
+    the booking is checked out. Rooms under maintenance are left alone.
+    """
+    sql = f"""
+        UPDATE rooms SET status = CASE WHEN EXISTS (
+            SELECT 1 FROM bookings b
+            WHERE b.room_id = rooms.id AND b.status = 'active'
+              AND b.check_in <= {_TODAY}
+        ) THEN 'booked' ELSE 'available' END
+        WHERE status != 'maintenance'
+    """
+    if room_id is None:
+        conn.execute(sql)
+    else:
+        conn.execute(sql + " AND id = ?", (room_id,))
+
+
+@retry_on_lock
+def refresh_room_statuses():
+    """Re-derive every room's status for today (run at start-up / each day)."""
+    with transaction() as conn:
+        _sync_room_status(conn)
+    invalidate_cache()
+
+
 def get_all_bookings():
-    conn = get_connection()
-    rows = conn.execute("""
+    rows = get_connection().execute("""
         SELECT b.*, r.room_number, r.room_type, g.full_name as guest_name, g.phone
         FROM bookings b
         JOIN rooms r ON b.room_id = r.id
         JOIN guests g ON b.guest_id = g.id
         ORDER BY b.created_at DESC
     """).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return [row_dict(r) for r in rows]
+
+
+def get_booking(booking_id):
+    row = get_connection().execute("""
+        SELECT b.*, r.room_number, r.room_type, g.full_name as guest_name, g.phone
+        FROM bookings b
+        JOIN rooms r ON b.room_id = r.id
+        JOIN guests g ON b.guest_id = g.id
+        WHERE b.id = ?
+    """, (booking_id,)).fetchone()
+    return row_dict(row) if row else None
 
 
 def get_active_bookings():
-    conn = get_connection()
-    rows = conn.execute("""
+    rows = get_connection().execute("""
         SELECT b.*, r.room_number, r.room_type, g.full_name as guest_name, g.phone
         FROM bookings b
         JOIN rooms r ON b.room_id = r.id
@@ -257,117 +1228,362 @@ def get_active_bookings():
         WHERE b.status = 'active'
         ORDER BY b.check_in
     """).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return [row_dict(r) for r in rows]
 
 
+@retry_on_lock
 def create_booking(room_id, guest_id, check_in, check_out, nights, total, advance, notes):
-    conn = get_connection()
-    c = conn.execute("""
-        INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
-                              total_amount, advance_paid, notes, status)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active')
-    """, (room_id, guest_id, check_in, check_out, nights, total, advance, notes))
-    bid = c.lastrowid
-    conn.execute("UPDATE rooms SET status='booked' WHERE id=?", (room_id,))
-    conn.commit()
-    conn.close()
+    """
+    Book a room for [check_in, check_out). The overlap check and the insert
+    share one write transaction, so two terminals cannot double-book.
+    Raises BookingConflict if the room is taken or under maintenance.
+    """
+    check_in, check_out = str(check_in), str(check_out)
+    if check_out <= check_in:
+        raise ValueError("Check-out must be after check-in.")
+    with transaction() as conn:
+        if not is_room_available(room_id, check_in, check_out):
+            raise BookingConflict(f"Room is not available from {check_in} to {check_out}.")
+        c = conn.execute("""
+            INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
+                                  total_amount, advance_paid, notes, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active')
+        """, (room_id, guest_id, check_in, check_out, nights, to_minor(total), to_minor(advance),
+              notes))
+        bid = c.lastrowid
+        _sync_room_status(conn, room_id)
+    invalidate_cache()
     return bid
 
 
+@retry_on_lock
 def cancel_booking(booking_id):
-    conn = get_connection()
-    row = conn.execute("SELECT room_id FROM bookings WHERE id=?", (booking_id,)).fetchone()
-    if row:
-        conn.execute("UPDATE rooms SET status='available' WHERE id=?", (row["room_id"],))
-    conn.execute("UPDATE bookings SET status='cancelled' WHERE id=?", (booking_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE bookings SET status='cancelled' WHERE id=?", (booking_id,))
+        row = conn.execute("SELECT room_id FROM bookings WHERE id=?", (booking_id,)).fetchone()
+        if row:
+            _sync_room_status(conn, row["room_id"])
+    invalidate_cache()
 
 
+@retry_on_lock
 def checkout_booking(booking_id):
-    conn = get_connection()
-    row = conn.execute("SELECT room_id FROM bookings WHERE id=?", (booking_id,)).fetchone()
-    if row:
-        conn.execute("UPDATE rooms SET status='available' WHERE id=?", (row["room_id"],))
-    conn.execute("UPDATE bookings SET status='checked_out' WHERE id=?", (booking_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute("UPDATE bookings SET status='checked_out' WHERE id=?", (booking_id,))
+        row = conn.execute("SELECT room_id FROM bookings WHERE id=?", (booking_id,)).fetchone()
+        if row:
+            _sync_room_status(conn, row["room_id"])
+    invalidate_cache()
 
 
-def search_bookings(query):
-    conn = get_connection()
-    rows = conn.execute("""
+def search_bookings(query, limit=200):
+    """Most recent bookings whose guest matches (see search_guests) or whose room number starts with query."""
+    match_sql, params = _guest_match(query.strip(), limit * 5)
+    rows = get_connection().execute(f"""
         SELECT b.*, r.room_number, r.room_type, g.full_name as guest_name, g.phone
         FROM bookings b
         JOIN rooms r ON b.room_id = r.id
         JOIN guests g ON b.guest_id = g.id
-        WHERE g.full_name LIKE ? OR r.room_number LIKE ?
+        WHERE b.id IN (
+            SELECT id FROM bookings WHERE guest_id IN (SELECT id FROM ({match_sql}))
+            UNION
+            SELECT id FROM bookings WHERE room_id IN (SELECT id FROM rooms WHERE room_number LIKE ?)
+        )
         ORDER BY b.created_at DESC
-    """, (f"%{query}%", f"%{query}%")).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+        LIMIT ?
+    """, params + (f"{query.strip()}%", limit)).fetchall()
+    return [row_dict(r) for r in rows]
+
+
+# ─────────────────────────────────────────────────
+# Paged listings (keyset pagination for the UI tables)
+# ─────────────────────────────────────────────────
+# Sortable columns: key -> SQL expression. All NOT NULL, so (value, id) is
+# a total order and the cursor comparison in _keyset_page is exact.
+BOOKING_SORTS = {
+    "id": "b.id", "room": "r.room_number", "type": "r.room_type", "guest": "g.full_name",
+    "check_in": "b.check_in", "check_out": "b.check_out", "nights": "b.nights",
+    "amount": "b.total_amount", "status": "b.status", "created_at": "b.created_at",
+}
+GUEST_SORTS = {
+    "id": "id", "name": "full_name COLLATE NOCASE", "created_at": "created_at",
+}
+
+_BOOKING_PAGE_SQL = """
+    SELECT b.*, r.room_number, r.room_type, g.full_name as guest_name, g.phone, {sort} AS _sort
+    FROM bookings b
+    JOIN rooms r ON b.room_id = r.id
+    JOIN guests g ON b.guest_id = g.id
+"""
+_GUEST_PAGE_SQL = "SELECT *, {sort} AS _sort FROM guests"
+
+
+def _keyset_page(base_sql, sort_expr, id_col, after, limit, descending, where, params):
+    """
+    Fetch up to `limit` rows ordered by (sort_expr, id), starting after the
+    cursor `after` — the (sort value, id) pair of the last row already
+    shown. Seeks straight to the page instead of OFFSET-scanning past it.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    where, params = list(where), list(params)
+    if after is not None:
+        op = "<" if descending else ">"
+        # The plain bound lets SQLite seek the sort index; the row-value
+        # comparison then breaks ties on id.
+        where.append(f"{sort_expr} {op}= ? AND ({sort_expr}, {id_col}) {op} (?, ?)")
+        params.extend([after[0], after[0], after[1]])
+    direction = "DESC" if descending else "ASC"
+    sql = (base_sql.format(sort=sort_expr)
+           + (" WHERE " + " AND ".join(where) if where else "")
+           + f" ORDER BY {sort_expr} {direction}, {id_col} {direction} LIMIT ?")
+    rows = [row_dict(r) for r in get_connection().execute(sql, params + [limit + 1]).fetchall()]
+    more = len(rows) > limit
+    rows = rows[:limit]
+    cursor = (rows[-1]["_sort"], rows[-1]["id"]) if more else None
+    for r in rows:
+        del r["_sort"]
+    return rows, cursor
+
+
+def get_bookings_page(after=None, limit=100, sort="created_at", descending=True, status=None):
+    """One page of bookings (joined like get_all_bookings) plus the next cursor."""
+    where, params = [], []
+    if status:
+        where.append("b.status = ?")
+        params.append(status)
+    return _keyset_page(_BOOKING_PAGE_SQL, BOOKING_SORTS[sort], "b.id",
+                        after, limit, descending, where, params)
+
+
+def get_bookings_by_ids(ids, status=None):
+    """The bookings among `ids` (joined like get_bookings_page), to patch rows after a change."""
+    ids = list(ids)
+    if not ids:
+        return []
+    sql = (_BOOKING_PAGE_SQL.format(sort="b.id")
+           + f" WHERE b.id IN ({','.join('?' * len(ids))})"
+           + (" AND b.status = ?" if status else ""))
+    rows = [row_dict(r) for r in get_connection().execute(sql, ids + ([status] if status else []))]
+    for r in rows:
+        del r["_sort"]
+    return rows
+
+
+def count_bookings(status=None):
+    if status:
+        return get_connection().execute(
+            "SELECT COUNT(*) FROM bookings WHERE status=?", (status,)).fetchone()[0]
+    return get_connection().execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+
+
+def get_guests_page(after=None, limit=100, sort="name", descending=False):
+    """One page of guests plus the next cursor."""
+    return _keyset_page(_GUEST_PAGE_SQL, GUEST_SORTS[sort], "id",
+                        after, limit, descending, (), ())
+
+
+def get_guests_by_ids(ids):
+    ids = list(ids)
+    if not ids:
+        return []
+    rows = get_connection().execute(
+        f"SELECT * FROM guests WHERE id IN ({','.join('?' * len(ids))})", ids).fetchall()
+    return [row_dict(r) for r in rows]
+
+
+def count_guests():
+    return get_connection().execute("SELECT COUNT(*) FROM guests").fetchone()[0]
 
 
 # ─────────────────────────────────────────────────
 # Invoice helpers
 # ─────────────────────────────────────────────────
+def next_in_sequence(conn, name, seed=None, count=1):
+    """
+    Allocate the next `count` values of counter `name` inside the caller's
+    write transaction and return the first: a rollback returns the numbers,
+    so there are no gaps, and BEGIN IMMEDIATE serialises terminals, so there
+    are no duplicates. seed() supplies the last value used when the counter
+    does not exist yet.
+    """
+    row = conn.execute("SELECT value FROM sequences WHERE name = ?", (name,)).fetchone()
+    last = row[0] if row else (seed() if seed else 0)
+    conn.execute("INSERT OR REPLACE INTO sequences (name, value) VALUES (?, ?)",
+                 (name, last + count))
+    return last + 1
+
+
+def _invoice_stem(settings, year):
+    """Number prefix before the counter: 'INV-2026-' (yearly reset) or 'INV-' (never)."""
+    prefix = settings.get("invoice_prefix", "INV-")
+    if settings.get("invoice_reset", "yearly") == "never":
+        return prefix
+    return f"{prefix}{year}-"
+
+
+def _last_invoice_counter(conn, stem):
+    """Highest counter already issued under stem (e.g. numbers made before sequences existed)."""
+    return conn.execute("""
+        SELECT COALESCE(MAX(CAST(substr(invoice_number, ?) AS INTEGER)), 0) FROM invoices
+        WHERE substr(invoice_number, 1, ?) = ? AND substr(invoice_number, ?) != ''
+          AND substr(invoice_number, ?) NOT GLOB '*[^0-9]*'
+    """, (len(stem) + 1, len(stem), stem, len(stem) + 1, len(stem) + 1)).fetchone()[0]
+
+
+def allocate_invoice_numbers(conn, count=1, year=None):
+    """Reserve `count` consecutive invoice numbers; returns (stem, first counter)."""
+    stem = _invoice_stem(get_settings(), year or date.today().year)
+    first = next_in_sequence(conn, "invoice:" + stem, count=count,
+                             seed=lambda: _last_invoice_counter(conn, stem))
+    return stem, first
+
+
+@retry_on_lock
 def create_invoice(booking_id, amount, discount, tax, paid_amount):
-    conn = get_connection()
-    import random, string
-    inv_num = "INV-" + "".join(random.choices(string.digits, k=6))
-    conn.execute("""
-        INSERT INTO invoices (booking_id, invoice_number, amount, discount, tax, paid_amount, status)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (booking_id, inv_num, amount, discount, tax, paid_amount,
-          "paid" if paid_amount >= amount else "partial"))
-    conn.commit()
-    conn.close()
+    """Insert an invoice numbered from the settings' prefix/reset policy; returns its number."""
+    amount, discount, tax, paid_amount = map(to_minor, (amount, discount, tax, paid_amount))
+    with transaction() as conn:
+        stem, n = allocate_invoice_numbers(conn)
+        inv_num = f"{stem}{n:06d}"
+        conn.execute("""
+            INSERT INTO invoices (booking_id, invoice_number, amount, discount, tax, paid_amount, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (booking_id, inv_num, amount, discount, tax, paid_amount,
+              "paid" if paid_amount >= amount else "partial"))
     return inv_num
 
 
 def get_invoice_by_booking(booking_id):
-    conn = get_connection()
-    row = conn.execute("SELECT * FROM invoices WHERE booking_id=? ORDER BY id DESC LIMIT 1",
-                       (booking_id,)).fetchone()
-    conn.close()
-    return dict(row) if row else None
+    row = get_connection().execute(
+        "SELECT * FROM invoices WHERE booking_id=? ORDER BY id DESC LIMIT 1",
+        (booking_id,)).fetchone()
+    return row_dict(row) if row else None
 
 
 # ─────────────────────────────────────────────────
 # Reports helpers
 # ─────────────────────────────────────────────────
+@cached
 def get_dashboard_stats():
-    conn = get_connection()
-    total_rooms = conn.execute("SELECT COUNT(*) FROM rooms").fetchone()[0]
-    booked = conn.execute("SELECT COUNT(*) FROM rooms WHERE status='booked'").fetchone()[0]
-    available = conn.execute("SELECT COUNT(*) FROM rooms WHERE status='available'").fetchone()[0]
-    maintenance = conn.execute("SELECT COUNT(*) FROM rooms WHERE status='maintenance'").fetchone()[0]
-    today = conn.execute("""
-        SELECT COALESCE(SUM(total_amount),0) FROM bookings
-        WHERE DATE(created_at)=DATE('now') AND status='active'
-    """).fetchone()[0]
-    total_guests = conn.execute("SELECT COUNT(*) FROM guests").fetchone()[0]
-    conn.close()
-    return {
-        "total_rooms": total_rooms,
-        "booked": booked,
-        "available": available,
-        "maintenance": maintenance,
-        "today_revenue": today,
-        "total_guests": total_guests,
-    }
+    """Room counts by status, today's active-booking revenue and guest count, in one query."""
+    row = get_connection().execute(f"""
+        SELECT COUNT(*) AS total_rooms,
+               COALESCE(SUM(status = 'booked'), 0) AS booked,
+               COALESCE(SUM(status = 'available'), 0) AS available,
+               COALESCE(SUM(status = 'maintenance'), 0) AS maintenance,
+               (SELECT COALESCE(SUM(total_amount), 0) FROM bookings
+                WHERE created_at >= {_TODAY_START_UTC} AND created_at < {_TODAY_END_UTC}
+                  AND status = 'active') AS today_revenue,
+               (SELECT COUNT(*) FROM guests) AS total_guests
+        FROM rooms
+    """).fetchone()
+    return row_dict(row)
 
 
 def get_revenue_report(from_date, to_date):
+    """Per-day bookings/revenue/collected for [from_date, to_date], from daily_revenue."""
+    rows = get_connection().execute("""
+        SELECT date, bookings, revenue, collected FROM daily_revenue
+        WHERE date BETWEEN ? AND ?
+        ORDER BY date
+    """, (str(from_date), str(to_date))).fetchall()
+    return [row_dict(r) for r in rows]
+
+
+@retry_on_lock
+def rebuild_daily_revenue():
+    """Recompute daily_revenue from bookings (after bulk edits or a failed check)."""
+    with transaction() as conn:
+        _rebuild_daily_revenue(conn)
+
+
+def check_daily_revenue():
+    """
+    Compare daily_revenue with a fresh aggregate over bookings.
+    Returns [(date, stored, expected)] for every day that differs.
+    """
     conn = get_connection()
-    rows = conn.execute("""
-        SELECT DATE(created_at) as date, COUNT(*) as bookings,
-               SUM(total_amount) as revenue, SUM(advance_paid) as collected
-        FROM bookings
-        WHERE DATE(created_at) BETWEEN ? AND ? AND status != 'cancelled'
-        GROUP BY DATE(created_at)
+    stored = {r[0]: tuple(r[1:]) for r in conn.execute(
+        "SELECT date, bookings, revenue, collected FROM daily_revenue")}
+    expected = {r[0]: tuple(r[1:]) for r in conn.execute(_DAILY_REVENUE_SELECT)}
+    diffs = []
+    for day in sorted(stored.keys() | expected.keys()):
+        a, b = stored.get(day), expected.get(day)
+        if a != b:                      # integer minor units: exact
+            diffs.append((day, a, b))
+    return diffs
+
+
+def money_drift():
+    """
+    Days where the float totals shown before the move to minor units
+    (migration 8) were off by a paisa or more: [(date, legacy, exact)] with
+    each side a (revenue, collected) pair of Money. Empty for databases
+    created after the move.
+    """
+    rows = get_connection().execute("""
+        SELECT date, legacy_revenue, legacy_collected, revenue, collected
+        FROM money_reconciliation
+        WHERE CAST(ROUND(legacy_revenue * 100) AS INTEGER) != revenue
+           OR CAST(ROUND(legacy_collected * 100) AS INTEGER) != collected
         ORDER BY date
-    """, (from_date, to_date)).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    """).fetchall()
+    return [(r[0], (Money.parse(r[1]), Money.parse(r[2])), (Money(r[3]), Money(r[4])))
+            for r in rows]
+
+
+# ─────────────────────────────────────────────────
+# Change log
+# ─────────────────────────────────────────────────
+# Triggers (migration 9) append (entity, row id, kind) to change_log for
+# every row inserted, changed or deleted in CHANGE_LOG_TABLES, by any
+# terminal, the CLI or the API. events.py reads past the last seq it saw.
+CHANGE_LOG_KEEP_DAYS = 2
+
+
+def last_change_seq():
+    """The newest seq handed out, even if pruned since (AUTOINCREMENT keeps it)."""
+    row = get_connection().execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return row[0] if row else 0
+
+
+def changes_since(seq, limit=500):
+    """
+    Up to `limit` entries after `seq`, oldest first, as (seq, entity, row_id,
+    kind) rows. Returns None instead when more than `limit` are waiting or
+    entries after `seq` were already pruned, even if the log is now empty:
+    the reader should reload. Seqs have no gaps but pruned ones, so every seq
+    up to sqlite_sequence's newest must still be there.
+    """
+    last = last_change_seq()
+    if not 0 <= last - seq <= limit:
+        return None
+    rows = get_connection().execute(
+        "SELECT seq, entity, row_id, kind FROM change_log WHERE seq > ? AND seq <= ? ORDER BY seq",
+        (seq, last)).fetchall()
+    if len(rows) != last - seq:
+        return None
+    return [tuple(r) for r in rows]
+
+
+@retry_on_lock
+def prune_change_log(keep_days=CHANGE_LOG_KEEP_DAYS):
+    """Drop change_log entries older than keep_days (run at start-up and by the night audit)."""
+    with transaction() as conn:
+        # seq and at grow together: find the first entry to keep by walking
+        # from the oldest, then delete a seq range (no index on `at` needed).
+        try:
+            conn.execute("""
+                DELETE FROM change_log WHERE seq < COALESCE(
+                    (SELECT seq FROM change_log WHERE at >= DATETIME('now', ?) ORDER BY seq LIMIT 1),
+                    (SELECT MAX(seq) + 1 FROM change_log))
+            """, (f"-{keep_days} days",))
+        except sqlite3.OperationalError:      # before migration 9
+            pass
+
+
+if os.environ.get("HOTEL_DB_CONCURRENCY") == "1":
+    enable_concurrency_mode()
+if os.environ.get("HOTEL_SLOW_QUERY_MS"):
+    query_stats.configure(slow_query_ms=float(os.environ["HOTEL_SLOW_QUERY_MS"]))
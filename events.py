@@ -0,0 +1,143 @@
+"""
+Hotel Management System - Change events
+Publish/subscribe for row changes. Triggers record every insert, update
+and delete on rooms, guests, bookings, invoices and users in change_log (see
+database.py), whoever made it: this window, another terminal, the CLI or
+the API. poll() reads the log past the last entry seen and hands each
+subscriber the changes to the tables it follows, so pages patch just the
+affected rows.
+
+    events.subscribe(("bookings",), self.on_changes, widget=self.frame)
+
+    def on_changes(self, changes):      # [Change(entity, id, kind), ...]
+        ...
+
+A change with id None means "many rows, reload": the log was pruned past
+the last entry seen, or more than MAX_CHANGES arrived at once.
+
+Subscribers run on the thread that polls. In the Tk app that is the Tk
+thread: watch(root) polls every POLL_MS, and straight after each commit
+the Tk thread makes, so a page sees its own writes at once and other
+terminals' within a second.
+"""
+import threading
+from collections import namedtuple
+
+import database
+
+Change = namedtuple("Change", "entity id kind")     # kind: insert / update / delete / reload
+
+POLL_MS = 1000
+MAX_CHANGES = 500
+
+_subscribers = []       # (entities, callback)
+_seq = None             # last change_log seq handed out
+_stamp = None           # database.data_stamp() when the log was last read
+_poll_lock = threading.Lock()
+_watch = {"thread": None, "widget": None, "pending": False, "unsubscribe": None}
+
+
+def subscribe(entities, callback, widget=None):
+    """
+    Call callback([Change, ...]) with the changes to any of `entities`
+    (table names, e.g. ("bookings", "guests")). With a widget, the
+    subscription ends when the widget is destroyed. Returns a function
+    that unsubscribes.
+    """
+    entry = (frozenset(entities), callback)
+    _subscribers.append(entry)
+
+    def unsubscribe():
+        if entry in _subscribers:
+            _subscribers.remove(entry)
+    if widget is not None:
+        widget.bind("<Destroy>", lambda e: e.widget is widget and unsubscribe(), add="+")
+    return unsubscribe
+
+
+def publish(changes):
+    """Hand changes to the subscribers following their tables."""
+    if not changes:
+        return
+    for entities, callback in list(_subscribers):
+        mine = [c for c in changes if c.entity in entities]
+        if mine:
+            callback(mine)
+
+
+def booking_ids(changes, bookings):
+    """
+    Ids of the changed bookings plus those among `bookings` (rows joined with
+    their room and guest) whose room or guest changed.
+    """
+    ids = {c.id for c in changes if c.entity == "bookings"}
+    rooms = {c.id for c in changes if c.entity == "rooms"}
+    guests = {c.id for c in changes if c.entity == "guests"}
+    if rooms or guests:
+        ids.update(b["id"] for b in bookings
+                   if b["room_id"] in rooms or b["guest_id"] in guests)
+    return ids
+
+
+def needs_reload(changes, entity):
+    """
+    True when rows of `entity` were added (they can land anywhere in a
+    sorted list) or many changed at once; edits and deletes can be patched.
+    """
+    return any(c.id is None or (c.entity == entity and c.kind == "insert") for c in changes)
+
+
+def poll():
+    """Publish what was written since the last poll. Cheap when nothing was."""
+    global _seq, _stamp
+    with _poll_lock:
+        stamp = database.data_stamp()
+        if _seq is not None and stamp == _stamp:
+            return []
+        if _seq is None:            # start from now; pages load current data themselves
+            _seq, _stamp = database.last_change_seq(), stamp
+            return []
+        rows = database.changes_since(_seq, MAX_CHANGES)
+        if rows is None:
+            _seq = database.last_change_seq()
+            changes = [Change(t, None, "reload") for t in database.CHANGE_LOG_TABLES]
+        else:
+            if rows:
+                _seq = rows[-1][0]
+            changes = [Change(*r[1:]) for r in rows]
+        _stamp = stamp
+    if changes:
+        database.invalidate_cache()     # other terminals' writes: drop cached aggregates now
+    publish(changes)
+    return changes
+
+
+def watch(widget, interval_ms=POLL_MS):
+    """Poll from the Tk thread every interval_ms, and right after its own commits."""
+    if _watch["unsubscribe"] is None:
+        _watch["unsubscribe"] = database.subscribe_commits(_committed)
+    _watch.update(thread=threading.get_ident(), widget=widget)
+    poll()
+
+    def tick():
+        if _watch["widget"] is widget:
+            poll()
+            widget.after(interval_ms, tick)
+    widget.after(interval_ms, tick)
+
+
+def _committed():
+    # Only the watching thread may touch its widgets; other threads' commits
+    # are picked up by the next timed poll.
+    widget = _watch["widget"]
+    if widget is None or threading.get_ident() != _watch["thread"] or _watch["pending"]:
+        return
+    _watch["pending"] = True
+
+    def run():
+        _watch["pending"] = False
+        poll()
+    try:
+        widget.after_idle(run)
+    except Exception:       # window destroyed (logout)
+        _watch["pending"] = False
@@ -0,0 +1,152 @@
+"""
+Hotel Management System - Streaming Export
+Writes bookings, guests, invoices or daily revenue to CSV or JSON lines in
+batches, so memory stays flat however many rows are exported. Each batch is
+its own short read (keyset paging on the ORDER BY column), so no read lock
+is held while the file is written and writers are never shut out.
+
+Run: python export.py bookings -o bookings.csv --from 2026-01-01 --to 2026-01-31
+"""
+import argparse
+import csv
+import json
+import sys
+
+import database
+
+# name -> (SELECT ..., date column, status column or None, ORDER BY column).
+# The ORDER BY column is unique and selected first: batches resume after it.
+# Amounts are stored in paisa and exported in taka.
+EXPORTS = {
+    "bookings": ("""
+        SELECT b.id, b.created_at, r.room_number, r.room_type, g.full_name AS guest_name,
+               g.phone, b.check_in, b.check_out, b.nights, b.total_amount / 100.0 AS total_amount,
+               b.advance_paid / 100.0 AS advance_paid, b.status, b.notes
+        FROM bookings b
+        JOIN rooms r ON b.room_id = r.id
+        JOIN guests g ON b.guest_id = g.id
+    """, "b.created_at", "b.status", "b.id"),
+    "guests": ("""
+        SELECT id, full_name, phone, email, nid, address, created_at FROM guests
+    """, "created_at", None, "id"),
+    "invoices": ("""
+        SELECT i.id, i.invoice_number, i.booking_id, g.full_name AS guest_name, r.room_number,
+               i.amount / 100.0 AS amount, i.discount / 100.0 AS discount, i.tax / 100.0 AS tax,
+               i.paid_amount / 100.0 AS paid_amount, i.status, i.issued_at
+        FROM invoices i
+        JOIN bookings b ON i.booking_id = b.id
+        JOIN rooms r ON b.room_id = r.id
+        JOIN guests g ON b.guest_id = g.id
+    """, "i.issued_at", "i.status", "i.id"),
+    "revenue": ("""
+        SELECT date, bookings, revenue / 100.0 AS revenue, collected / 100.0 AS collected
+        FROM daily_revenue
+    """, "date", None, "date"),
+}
+FORMATS = ("csv", "jsonl")
+BATCH = 1000
+
+
+def _query(kind, from_date=None, to_date=None, status=None):
+    if kind not in EXPORTS:
+        raise ValueError(f"Unknown export {kind!r}; choose from {', '.join(EXPORTS)}")
+    sql, date_col, status_col, order_col = EXPORTS[kind]
+    where, params = [], []
+    if from_date:
+        where.append(f"{date_col} >= ?")
+        params.append(str(from_date))
+    if to_date:
+        where.append(f"{date_col} < DATE(?, '+1 day')")
+        params.append(str(to_date))
+    if status:
+        if status_col is None:
+            raise ValueError(f"{kind} export has no status filter")
+        where.append(f"{status_col} = ?")
+        params.append(status)
+    return sql, where, params, order_col
+
+
+def _where(where):
+    return " WHERE " + " AND ".join(where) if where else ""
+
+
+def count_rows(kind, from_date=None, to_date=None, status=None):
+    """Number of rows export() would write with the same filters."""
+    sql, where, params, _ = _query(kind, from_date, to_date, status)
+    return database.get_connection().execute(
+        f"SELECT COUNT(*) FROM ({sql}{_where(where)})", params).fetchone()[0]
+
+
+def export(kind, out, fmt="csv", from_date=None, to_date=None, status=None,
+           progress=None, batch=BATCH):
+    """
+    Stream one export into the text file object `out` (open CSV files with
+    newline=""). Dates filter on creation/issue date, inclusive.
+    progress(rows_written) is called after every batch; if it returns False
+    the export stops early. Returns the number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+    sql, where, params, order_col = _query(kind, from_date, to_date, status)
+    conn = database.get_connection()
+    first = f"{sql}{_where(where)} ORDER BY {order_col} LIMIT ?"
+    after = f"{sql}{_where(where + [f'{order_col} > ?'])} ORDER BY {order_col} LIMIT ?"
+    cur = conn.execute(first, params + [batch])
+    columns = [d[0] for d in cur.description]
+    rows = cur.fetchall()       # fetched to the end: the read is over before writing
+
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        write_batch = writer.writerows
+    else:
+        def write_batch(rows):
+            out.writelines(json.dumps(dict(zip(columns, r)), ensure_ascii=False) + "\n"
+                           for r in rows)
+
+    written = 0
+    while rows:
+        write_batch(rows)
+        written += len(rows)
+        if progress and progress(written) is False or len(rows) < batch:
+            break
+        rows = conn.execute(after, params + [rows[-1][0], batch]).fetchall()
+    return written
+
+
+def export_file(kind, path, fmt=None, **filters):
+    """export() into a new file; the format defaults to the file extension."""
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".json")) else "csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        return export(kind, f, fmt, **filters)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Export hotel data as CSV or JSON lines.")
+    p.add_argument("kind", choices=sorted(EXPORTS))
+    p.add_argument("-o", "--output", default="-", help="file path, or - for stdout (default)")
+    p.add_argument("-f", "--format", choices=FORMATS,
+                   help="default: from the output extension, else csv")
+    p.add_argument("--from", dest="from_date", help="first date, YYYY-MM-DD")
+    p.add_argument("--to", dest="to_date", help="last date, YYYY-MM-DD")
+    p.add_argument("--status", help="bookings/invoices status, e.g. active")
+    p.add_argument("--db", help="database file (default: hotel.db)")
+    args = p.parse_args(argv)
+
+    if args.db:
+        database.configure(db_path=args.db)
+    database.initialize_database()
+    filters = dict(from_date=args.from_date, to_date=args.to_date, status=args.status)
+    try:
+        if args.output == "-":
+            n = export(args.kind, sys.stdout, args.format or "csv", **filters)
+        else:
+            n = export_file(args.kind, args.output, args.format, **filters)
+    except ValueError as e:
+        p.error(str(e))
+    print(f"{n} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,398 @@
+"""
+Hotel Management System - Command Line
+Scripted access to the same helpers the Tk app uses (database.py, auth.py),
+for cron jobs and SSH sessions without a display. Never imports tkinter.
+Every command prints one JSON document on stdout; errors print
+{"error": ...} on stderr and exit with status 1.
+
+Run: python -m hotel rooms list --status available
+     python -m hotel bookings checkout 42
+     python -m hotel reports revenue --from 2026-01-01 --to 2026-01-31
+     python -m hotel audit run --date 2026-03-31
+     python -m hotel data export bookings -o bookings.csv --status checked_out
+     python -m hotel --query-stats reports stats      (query timings on stderr)
+     python -m hotel db slow-queries --tail 20
+     python -m hotel --help
+"""
+import argparse
+import getpass
+import json
+import os
+import sys
+from datetime import date
+
+import database
+import auth
+import query_stats
+from money import Money, json_default
+
+
+def _days(check_in, check_out):
+    return (date.fromisoformat(check_out) - date.fromisoformat(check_in)).days
+
+
+def _require(value, what):
+    if value is None:
+        raise LookupError(f"{what} not found")
+    return value
+
+
+# ── rooms ──────────────────────────────────────────────────────────────────
+def rooms_list(a):
+    rooms = database.get_all_rooms()
+    return [r for r in rooms if a.status in (None, r["status"])]
+
+
+def rooms_available(a):
+    return database.get_available_rooms(a.from_date, a.to_date)
+
+
+def rooms_set_status(a):
+    _require(database.get_room(a.room_id), f"room {a.room_id}")
+    database.update_room_status(a.room_id, a.status)
+    return database.get_room(a.room_id)
+
+
+# ── guests ─────────────────────────────────────────────────────────────────
+def guests_list(a):
+    return database.get_guests_page(limit=a.limit)[0]
+
+
+def guests_search(a):
+    return database.search_guests(a.query, limit=a.limit)
+
+
+def guests_add(a):
+    gid = database.add_guest(a.name, a.phone, a.email, a.nid, a.address)
+    return {"id": gid}
+
+
+def guests_delete(a):
+    database.delete_guest(a.guest_id)
+    return {"deleted": a.guest_id}
+
+
+# ── bookings ───────────────────────────────────────────────────────────────
+def bookings_list(a):
+    return database.get_bookings_page(limit=a.limit, status=a.status)[0]
+
+
+def bookings_show(a):
+    return _require(database.get_booking(a.booking_id), f"booking {a.booking_id}")
+
+
+def bookings_create(a):
+    room = _require(database.get_room(a.room_id), f"room {a.room_id}")
+    nights = _days(a.from_date, a.to_date)
+    total = a.total if a.total is not None else nights * room["price_per_night"]
+    bid = database.create_booking(a.room_id, a.guest_id, a.from_date, a.to_date,
+                                  nights, total, a.advance, a.notes or "")
+    return database.get_booking(bid)
+
+
+def bookings_cancel(a):
+    _require(database.get_booking(a.booking_id), f"booking {a.booking_id}")
+    database.cancel_booking(a.booking_id)
+    return database.get_booking(a.booking_id)
+
+
+def bookings_checkout(a):
+    _require(database.get_booking(a.booking_id), f"booking {a.booking_id}")
+    database.checkout_booking(a.booking_id)
+    return database.get_booking(a.booking_id)
+
+
+# ── invoices ───────────────────────────────────────────────────────────────
+def invoices_show(a):
+    return _require(database.get_invoice_by_booking(a.booking_id),
+                    f"invoice for booking {a.booking_id}")
+
+
+def invoices_create(a):
+    """Same defaults as the Billing page: full booking amount, advance as paid."""
+    booking = _require(database.get_booking(a.booking_id), f"booking {a.booking_id}")
+    if not database.get_invoice_by_booking(a.booking_id):
+        database.create_invoice(a.booking_id, booking["total_amount"], 0, 0,
+                                booking["advance_paid"] or 0)
+    return database.get_invoice_by_booking(a.booking_id)
+
+
+def invoices_render(a):
+    import invoice_render
+    booking = _require(database.get_booking(a.booking_id), f"booking {a.booking_id}")
+    return {"format": invoice_render.save(booking, a.output), "path": a.output}
+
+
+def invoices_archive(a):
+    import invoice_render
+    output = a.output or f"invoices_{a.month.replace('-', '_')}.zip"
+    n = invoice_render.month_archive(a.month, output, a.format, a.workers)
+    return {"invoices": n, "path": output}
+
+
+# ── reports ────────────────────────────────────────────────────────────────
+def reports_stats(a):
+    return database.get_dashboard_stats()
+
+
+def reports_revenue(a):
+    return database.get_revenue_report(a.from_date, a.to_date)
+
+
+# ── night audit ────────────────────────────────────────────────────────────
+def audit_run(a):
+    import night_audit
+    return night_audit.run(a.date)
+
+
+def audit_history(a):
+    import night_audit
+    return night_audit.history(a.limit)
+
+
+# ── bulk data ──────────────────────────────────────────────────────────────
+def data_export(a):
+    import export
+    filters = dict(from_date=a.from_date, to_date=a.to_date, status=a.status)
+    if a.output == "-":
+        export.export(a.kind, sys.stdout, a.format or "csv", **filters)
+        return None
+    return {"rows": export.export_file(a.kind, a.output, a.format, **filters),
+            "path": a.output}
+
+
+def data_import(a):
+    import importer
+    report = importer.IMPORTERS[a.kind](importer.read_rows(a.path), batch=a.batch)
+    report["errors"] = [{"line": n, "error": e} for n, e in report["errors"]]
+    return report
+
+
+# ── users ──────────────────────────────────────────────────────────────────
+def users_list(a):
+    return auth.get_all_users()
+
+
+def users_add(a):
+    password = a.password or getpass.getpass("Password: ")
+    ok, result = auth.register(a.username, password, a.role, a.full_name or a.username)
+    if not ok:
+        raise ValueError(result)
+    return {"id": result}
+
+
+def users_passwd(a):
+    ok, msg = auth.change_password(a.username,
+                                   a.old_password or getpass.getpass("Current password: "),
+                                   a.new_password or getpass.getpass("New password: "))
+    if not ok:
+        raise ValueError(msg)
+    return {"changed": a.username}
+
+
+def users_delete(a):
+    auth.delete_user(a.user_id)
+    return {"deleted": a.user_id}
+
+
+# ── db maintenance ─────────────────────────────────────────────────────────
+def db_info(a):
+    conn = database.get_connection()
+    return {
+        "path": os.path.abspath(database.DB_PATH),
+        "schema_version": database.schema_version(),
+        "latest_version": len(database.MIGRATIONS),
+        "journal_mode": conn.execute("PRAGMA journal_mode").fetchone()[0],
+        "search_index": database.has_search_index(),
+        "sqlite": database.sqlite3.sqlite_version,
+    }
+
+
+def db_migrate(a):
+    return {"schema_version": database.migrate()}
+
+
+def db_check(a):
+    conn = database.get_connection()
+    return {
+        "integrity": [r[0] for r in conn.execute("PRAGMA quick_check")],
+        "foreign_keys": [list(r) for r in conn.execute("PRAGMA foreign_key_check")],
+        "query_plans": database.check_query_plans(),
+        "daily_revenue": database.check_daily_revenue(),
+        "money_drift": database.money_drift(),
+    }
+
+
+def db_rebuild_revenue(a):
+    database.rebuild_daily_revenue()
+    return {"mismatches": len(database.check_daily_revenue())}
+
+
+def db_refresh_statuses(a):
+    database.refresh_room_statuses()
+    return database.get_dashboard_stats()
+
+
+def db_checkpoint(a):
+    busy, wal_pages, moved = database.checkpoint()
+    return {"busy": busy, "wal_pages": wal_pages, "checkpointed": moved}
+
+
+def db_vacuum(a):
+    database.get_connection().execute("VACUUM")
+    return {"vacuumed": os.path.abspath(database.DB_PATH)}
+
+
+def db_slow_queries(a):
+    return {"log": query_stats.SLOW_LOG, "threshold_ms": query_stats.SLOW_QUERY_MS,
+            "queries": query_stats.read_slow_log(tail=a.tail)}
+
+
+# ── argument parsing ───────────────────────────────────────────────────────
+def amount(text):
+    """argparse type: taka, e.g. 1500 or 1,500.50 (named for the error message)."""
+    return Money.parse(text)
+
+
+def _dates(p, required=True):
+    p.add_argument("--from", dest="from_date", required=required, help="YYYY-MM-DD")
+    p.add_argument("--to", dest="to_date", required=required, help="YYYY-MM-DD")
+
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="python -m hotel", description=__doc__.split("\n")[1])
+    p.add_argument("--db", help="database file (default: hotel.db next to database.py)")
+    p.add_argument("--indent", type=int, default=None, help="pretty-print JSON")
+    p.add_argument("--query-stats", action="store_true",
+                   help="print per-helper and per-statement query timings on stderr afterwards")
+    p.add_argument("--slow-ms", type=float, help="slow-query log threshold (default 100)")
+    groups = p.add_subparsers(dest="group", metavar="GROUP", required=True)
+
+    def group(name, help):
+        g = groups.add_parser(name, help=help)
+        return g.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    def cmd(sub, name, fn, help):
+        c = sub.add_parser(name, help=help)
+        c.set_defaults(fn=fn)
+        return c
+
+    s = group("rooms", "list rooms, find free rooms, set status")
+    c = cmd(s, "list", rooms_list, "all rooms")
+    c.add_argument("--status", choices=("available", "booked", "maintenance"))
+    _dates(cmd(s, "available", rooms_available, "rooms free for a date range"))
+    c = cmd(s, "set-status", rooms_set_status, "put a room under maintenance or back in service")
+    c.add_argument("room_id", type=int)
+    c.add_argument("status", choices=database.MANUAL_ROOM_STATUSES)
+
+    s = group("guests", "list, search, add, delete guests")
+    cmd(s, "list", guests_list, "guests by name").add_argument("--limit", type=int, default=100)
+    c = cmd(s, "search", guests_search, "search by name, phone or NID")
+    c.add_argument("query")
+    c.add_argument("--limit", type=int, default=50)
+    c = cmd(s, "add", guests_add, "add a guest")
+    c.add_argument("--name", required=True)
+    for opt in ("--phone", "--email", "--nid", "--address"):
+        c.add_argument(opt, default="")
+    cmd(s, "delete", guests_delete, "delete a guest").add_argument("guest_id", type=int)
+
+    s = group("bookings", "list, create, cancel, check out bookings")
+    c = cmd(s, "list", bookings_list, "newest bookings first")
+    c.add_argument("--status", choices=("active", "checked_out", "cancelled"))
+    c.add_argument("--limit", type=int, default=100)
+    cmd(s, "show", bookings_show, "one booking").add_argument("booking_id", type=int)
+    c = cmd(s, "create", bookings_create, "book a room")
+    c.add_argument("--room", dest="room_id", type=int, required=True)
+    c.add_argument("--guest", dest="guest_id", type=int, required=True)
+    _dates(c)
+    c.add_argument("--total", type=amount, help="default: nights x room price")
+    c.add_argument("--advance", type=amount, default=Money())
+    c.add_argument("--notes")
+    cmd(s, "cancel", bookings_cancel, "cancel a booking").add_argument("booking_id", type=int)
+    cmd(s, "checkout", bookings_checkout, "check a guest out").add_argument("booking_id", type=int)
+
+    s = group("invoices", "show, create, render and archive invoices")
+    cmd(s, "show", invoices_show, "latest invoice for a booking").add_argument("booking_id", type=int)
+    cmd(s, "create", invoices_create, "invoice a booking").add_argument("booking_id", type=int)
+    c = cmd(s, "render", invoices_render, "save a booking's invoice as .txt / .html / .pdf")
+    c.add_argument("booking_id", type=int)
+    c.add_argument("-o", "--output", required=True)
+    c = cmd(s, "archive", invoices_archive, "zip every invoice issued in a month")
+    c.add_argument("month", help="YYYY-MM")
+    c.add_argument("-o", "--output", help="default: invoices_<YYYY>_<MM>.zip")
+    c.add_argument("-f", "--format", choices=("text", "html", "pdf"), default="pdf")
+    c.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+
+    s = group("reports", "dashboard stats and revenue")
+    cmd(s, "stats", reports_stats, "dashboard figures")
+    _dates(cmd(s, "revenue", reports_revenue, "daily revenue for a date range"))
+
+    s = group("audit", "end-of-day night audit (see night_audit.py)")
+    c = cmd(s, "run", audit_run, "audit every business date up to --date (default today)")
+    c.add_argument("--date", help="YYYY-MM-DD")
+    cmd(s, "history", audit_history, "latest audit runs").add_argument("--limit", type=int, default=30)
+
+    s = group("data", "bulk export / import")
+    c = cmd(s, "export", data_export, "stream data as CSV / JSON lines (see export.py)")
+    c.add_argument("kind", choices=("bookings", "guests", "invoices", "revenue"))
+    c.add_argument("-o", "--output", default="-")
+    c.add_argument("-f", "--format", choices=("csv", "jsonl"))
+    c.add_argument("--status")
+    _dates(c, required=False)
+    c = cmd(s, "import", data_import, "bulk-load CSV / JSON lines (see importer.py)")
+    c.add_argument("kind", choices=("guests", "bookings"))
+    c.add_argument("path")
+    c.add_argument("--batch", type=int, default=5000)
+
+    s = group("users", "manage login accounts")
+    cmd(s, "list", users_list, "all users")
+    c = cmd(s, "add", users_add, "create a user")
+    c.add_argument("username")
+    c.add_argument("password", nargs="?", help="prompted for if omitted")
+    c.add_argument("--role", choices=("admin", "receptionist"), default="receptionist")
+    c.add_argument("--full-name")
+    c = cmd(s, "passwd", users_passwd, "change a password")
+    c.add_argument("username")
+    c.add_argument("old_password", nargs="?", help="prompted for if omitted")
+    c.add_argument("new_password", nargs="?")
+    cmd(s, "delete", users_delete, "delete a user").add_argument("user_id", type=int)
+
+    s = group("db", "maintenance")
+    cmd(s, "info", db_info, "path, schema version, journal mode")
+    cmd(s, "migrate", db_migrate, "apply pending schema migrations")
+    cmd(s, "check", db_check, "integrity, foreign keys, query plans, revenue totals, money drift")
+    cmd(s, "rebuild-revenue", db_rebuild_revenue, "recompute the daily_revenue table")
+    cmd(s, "refresh-statuses", db_refresh_statuses, "re-derive room statuses for today")
+    cmd(s, "checkpoint", db_checkpoint, "fold the WAL file back into the database")
+    cmd(s, "vacuum", db_vacuum, "rebuild the file to reclaim free space")
+    c = cmd(s, "slow-queries", db_slow_queries, "latest entries of the slow-query log")
+    c.add_argument("--tail", type=int, default=50)
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.db:
+        database.configure(db_path=args.db)
+    if args.slow_ms is not None:
+        query_stats.configure(slow_query_ms=args.slow_ms)
+    try:
+        # Full initialisation (creates tables, writes) only for a new or outdated file.
+        if (not os.path.exists(database.DB_PATH)
+                or database.schema_version() < len(database.MIGRATIONS)):
+            database.initialize_database()
+        result = args.fn(args)
+    except (ValueError, LookupError, database.sqlite3.Error, OSError) as e:
+        print(json.dumps({"error": str(e)}), file=sys.stderr)
+        return 1
+    finally:
+        if args.query_stats:
+            print(json.dumps(query_stats.snapshot(top=20), indent=args.indent), file=sys.stderr)
+    if result is not None:
+        json.dump(result, sys.stdout, indent=args.indent, ensure_ascii=False, default=json_default)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
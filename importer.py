@@ -0,0 +1,263 @@
+"""
+Hotel Management System - Bulk Import
+Loads guests and bookings from CSV or JSON-lines files (e.g. a history
+export from another PMS). Rows are validated one by one, guests are
+de-duplicated by phone number / NID, and valid rows go in with
+executemany() in one transaction per batch. Bad rows are reported with
+their line number and skipped; they never abort the import.
+
+Run: python importer.py guests old_guests.csv
+     python importer.py bookings old_bookings.jsonl --errors rejected.csv
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+from datetime import date, datetime
+
+import database
+from money import Money
+
+BATCH = 5000
+STATUSES = ("active", "checked_out", "cancelled")
+
+
+def read_rows(path):
+    """Yield (line_number, dict) from a .csv or .jsonl/.json-lines file."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.endswith((".jsonl", ".json")):
+            for n, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield n, json.loads(line)
+                    except ValueError as e:
+                        yield n, e
+        else:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+
+
+def _check_row(row):
+    """Reject lines read_rows() could not turn into a record."""
+    if isinstance(row, Exception):
+        raise ValueError(f"unreadable line: {row}")
+    if not isinstance(row, dict):       # valid JSON, but e.g. [1, 2] or "x"
+        raise ValueError("expected a JSON object")
+
+
+def _text(row, key):
+    value = row.get(key)
+    return str(value).strip() if value not in (None, "") else ""
+
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def _phone_key(phone):
+    return _NON_DIGITS.sub("", phone)
+
+
+def _date(value, field):
+    try:
+        return date.fromisoformat(value[:10]).isoformat()
+    except ValueError:
+        raise ValueError(f"{field} must be YYYY-MM-DD, got {value!r}")
+
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        raise ValueError(f"created_at must be YYYY-MM-DD[ HH:MM:SS], got {value!r}")
+
+
+def _money(row, key, default=None):
+    """Amount in paisa (database units); default is already in paisa."""
+    value = _text(row, key)
+    if not value:
+        if default is None:
+            raise ValueError(f"{key} is required")
+        return default
+    try:
+        return Money.parse(value).minor
+    except ValueError:
+        raise ValueError(f"{key} must be a number, got {value!r}")
+
+
+class _GuestIndex:
+    """phone digits / NID -> guest id, for everything in the database plus this import."""
+
+    def __init__(self, conn):
+        self.by_phone, self.by_nid = {}, {}
+        for gid, phone, nid in conn.execute("SELECT id, phone, nid FROM guests"):
+            self.add(gid, _phone_key(phone or ""), (nid or "").strip())
+
+    def add(self, gid, phone, nid):
+        if phone:
+            self.by_phone.setdefault(phone, gid)
+        if nid:
+            self.by_nid.setdefault(nid, gid)
+
+    def find(self, phone, nid):
+        return (phone and self.by_phone.get(phone)) or (nid and self.by_nid.get(nid)) or None
+
+
+def _report():
+    return {"inserted": 0, "duplicates": 0, "errors": []}
+
+
+def _next_guest_id(conn):
+    """First free guest id, honouring AUTOINCREMENT's never-reuse rule.
+    Only valid while the caller holds the write transaction (ids are handed
+    out in Python and inserted with database.add_guests)."""
+    return conn.execute("""
+        SELECT MAX(COALESCE((SELECT MAX(id) FROM guests), 0),
+                   COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'guests'), 0)) + 1
+    """).fetchone()[0]
+
+
+def import_guests(rows, batch=BATCH):
+    """
+    rows: iterable of (line_number, dict) with full_name, phone, email, nid, address.
+    A row whose phone digits or NID match an existing (or earlier imported)
+    guest is counted as a duplicate and skipped.
+    Returns {"inserted", "duplicates", "errors": [(line, msg)]}.
+    """
+    report = _report()
+    index = _GuestIndex(database.get_connection())
+    rows = iter(rows)
+    while True:
+        chunk = [r for _, r in zip(range(batch), rows)]
+        if not chunk:
+            break
+        with database.transaction() as conn:
+            next_id, guests = _next_guest_id(conn), []
+            for line, row in chunk:
+                try:
+                    _check_row(row)
+                    name = _text(row, "full_name")
+                    if not name:
+                        raise ValueError("full_name is required")
+                except ValueError as e:
+                    report["errors"].append((line, str(e)))
+                    continue
+                phone, nid = _text(row, "phone"), _text(row, "nid")
+                if index.find(_phone_key(phone), nid):
+                    report["duplicates"] += 1
+                    continue
+                index.add(next_id, _phone_key(phone), nid)
+                guests.append((next_id, name, phone or None, _text(row, "email") or None,
+                               nid or None, _text(row, "address") or None))
+                next_id += 1
+            database.add_guests(guests)
+        report["inserted"] += len(guests)
+    return report
+
+
+def import_bookings(rows, batch=BATCH):
+    """
+    rows: iterable of (line_number, dict) with room_number, check_in, check_out
+    and the guest as phone and/or nid (+ guest_name to create a new guest).
+    Optional: total_amount (default nights x room price), advance_paid, status
+    (default checked_out), notes, created_at. Active bookings must not overlap
+    another active booking.
+    Returns {"inserted", "duplicates" (always 0), "errors": [(line, msg)]}.
+    """
+    report = _report()
+    conn = database.get_connection()
+    rooms = {r["room_number"]: (r["id"], r["price_per_night"])
+             for r in conn.execute("SELECT id, room_number, price_per_night FROM rooms")}
+    index = _GuestIndex(conn)
+    rows = iter(rows)
+    while True:
+        chunk = [r for _, r in zip(range(batch), rows)]
+        if not chunk:
+            break
+        guests, bookings, active = [], [], {}   # active: room id -> [(ci, co)] this batch
+        with database.transaction() as conn:
+            next_id = _next_guest_id(conn)
+            for line, row in chunk:
+                try:
+                    _check_row(row)
+                    room = rooms.get(_text(row, "room_number"))
+                    if room is None:
+                        raise ValueError(f"unknown room {_text(row, 'room_number')!r}")
+                    ci = _date(_text(row, "check_in"), "check_in")
+                    co = _date(_text(row, "check_out"), "check_out")
+                    if co <= ci:
+                        raise ValueError("check_out must be after check_in")
+                    nights = (date.fromisoformat(co) - date.fromisoformat(ci)).days
+                    total = _money(row, "total_amount", nights * room[1])
+                    advance = _money(row, "advance_paid", 0)
+                    status = _text(row, "status") or "checked_out"
+                    if status not in STATUSES:
+                        raise ValueError(f"status must be one of {', '.join(STATUSES)}")
+                    if status == "active" and (
+                            not database.is_room_available(room[0], ci, co)
+                            or any(c < co and ci < o for c, o in active.get(room[0], ()))):
+                        raise ValueError(f"room {_text(row, 'room_number')} is already booked "
+                                         f"between {ci} and {co}")
+                    created = _text(row, "created_at")
+                    created = _timestamp(created) if created else None
+                    phone, nid = _text(row, "phone"), _text(row, "nid")
+                    guest = index.find(_phone_key(phone), nid)
+                    name = _text(row, "guest_name")
+                    if guest is None and not name:
+                        raise ValueError("no guest with this phone/NID; guest_name is "
+                                         "needed to create one")
+                except ValueError as e:
+                    report["errors"].append((line, str(e)))
+                    continue
+                if guest is None:
+                    guest, next_id = next_id, next_id + 1
+                    index.add(guest, _phone_key(phone), nid)
+                    guests.append((guest, name, phone or None, None, nid or None, None))
+                if status == "active":
+                    active.setdefault(room[0], []).append((ci, co))
+                bookings.append((room[0], guest, ci, co, nights, total, advance, status,
+                                 _text(row, "notes") or None, created))
+            database.add_guests(guests)
+            conn.executemany("""
+                INSERT INTO bookings (room_id, guest_id, check_in, check_out, nights,
+                                      total_amount, advance_paid, status, notes, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            """, bookings)
+            report["inserted"] += len(bookings)
+    database.refresh_room_statuses()    # also drops the stats cache
+    return report
+
+
+IMPORTERS = {"guests": import_guests, "bookings": import_bookings}
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Bulk-import guests or bookings from CSV / JSON lines.")
+    p.add_argument("kind", choices=sorted(IMPORTERS))
+    p.add_argument("path", help=".csv, or .jsonl with one JSON object per line")
+    p.add_argument("--errors", help="write rejected line numbers and reasons to this CSV")
+    p.add_argument("--batch", type=int, default=BATCH, help="rows per transaction")
+    p.add_argument("--db", help="database file (default: hotel.db)")
+    args = p.parse_args(argv)
+
+    if args.db:
+        database.configure(db_path=args.db)
+    database.initialize_database()
+    report = IMPORTERS[args.kind](read_rows(args.path), batch=args.batch)
+
+    print(f"{report['inserted']} inserted, {report['duplicates']} duplicates, "
+          f"{len(report['errors'])} rejected", file=sys.stderr)
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["line", "error"])
+            w.writerows(report["errors"])
+    else:
+        for line, msg in report["errors"][:20]:
+            print(f"  line {line}: {msg}", file=sys.stderr)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+Hotel Management System - Invoice Rendering
+Renders an invoice as plain text (the Billing preview), HTML or PDF from
+templates compiled once at import. Hotel settings come from the
+database's settings cache and issued invoices are cached by content, so
+Generate / Save on the same invoice does the work once. The PDF writer is
+plain Python (Courier, one of the 14 built-in PDF fonts): characters
+outside Windows-1252, e.g. Bangla names, print as "?".
+
+month_archive() renders every invoice issued in a month into one .zip,
+spreading the rendering over a process pool.
+
+Run: python invoice_render.py 2026-03 -o invoices_2026_03.zip [--format pdf]
+"""
+import argparse
+import functools
+import html
+import io
+import os
+import string
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import database
+from money import Money
+
+FORMATS = {"text": ".txt", "html": ".html", "pdf": ".pdf"}
+DRAFT = "DRAFT (not yet issued)"
+
+
+class Template:
+    """
+    A str.format-style template parsed once into literal / field parts.
+    Fields are "{name}" or "{name:spec}"; with escape=html.escape every
+    formatted value is escaped, which str.format_map cannot do.
+    """
+
+    def __init__(self, source, escape=None):
+        self.escape = escape
+        self.parts = [(literal, field, spec)
+                      for literal, field, spec, _ in string.Formatter().parse(source)]
+
+    def render(self, context):
+        out = []
+        for literal, field, spec in self.parts:
+            out.append(literal)
+            if field is not None:
+                value = format(context[field], spec)
+                out.append(self.escape(value) if self.escape else value)
+        return "".join(out)
+
+
+TEXT = Template("""\
+══════════════════════════════════════════════════
+          {hotel}
+          {address}
+          📞 {phone}
+══════════════════════════════════════════════════
+  INVOICE No: {number}
+  Date: {date}
+──────────────────────────────────────────────────
+  Guest  : {guest}
+  Phone  : {guest_phone}
+  Room   : {room} ({room_type})
+  Check-In : {check_in}
+  Check-Out: {check_out}
+  Nights : {nights}
+──────────────────────────────────────────────────
+  Sub-total : ৳{subtotal:>10,.2f}
+  Tax ({tax_rate:.0f}%)  : ৳{tax:>10,.2f}
+  TOTAL     : ৳{total:>10,.2f}
+  Advance   : ৳{advance:>10,.2f}
+  DUE       : ৳{due:>10,.2f}
+══════════════════════════════════════════════════
+  Thank you for staying with us!
+══════════════════════════════════════════════════""")
+
+# The PDF fonts only cover Windows-1252: ASCII rules and the currency code.
+PDF_TEXT = Template("""\
+==================================================
+          {hotel}
+          {address}
+          Tel: {phone}
+==================================================
+  INVOICE No: {number}
+  Date: {date}
+--------------------------------------------------
+  Guest  : {guest}
+  Phone  : {guest_phone}
+  Room   : {room} ({room_type})
+  Check-In : {check_in}
+  Check-Out: {check_out}
+  Nights : {nights}
+--------------------------------------------------
+  Sub-total : {currency} {subtotal:>10,.2f}
+  Tax ({tax_rate:.0f}%)  : {currency} {tax:>10,.2f}
+  TOTAL     : {currency} {total:>10,.2f}
+  Advance   : {currency} {advance:>10,.2f}
+  DUE       : {currency} {due:>10,.2f}
+==================================================
+  Thank you for staying with us!
+==================================================""")
+
+HTML = Template("""\
+<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Invoice {number}</title>
+<style>
+body {{ font-family: Arial, sans-serif; color: #0f172a; max-width: 640px; margin: 32px auto; }}
+h1 {{ margin: 0; }} .muted {{ color: #64748b; }}
+table {{ width: 100%; border-collapse: collapse; margin-top: 16px; }}
+td {{ padding: 6px 4px; border-bottom: 1px solid #e2e8f0; }}
+td.num {{ text-align: right; font-variant-numeric: tabular-nums; }}
+tr.total td {{ font-weight: bold; border-top: 2px solid #0f172a; }}
+</style></head>
+<body>
+<h1>{hotel}</h1>
+<div class="muted">{address}<br>&#128222; {phone}</div>
+<h2>Invoice {number}</h2>
+<div class="muted">{date}</div>
+<table>
+<tr><td>Guest</td><td>{guest}</td></tr>
+<tr><td>Phone</td><td>{guest_phone}</td></tr>
+<tr><td>Room</td><td>{room} ({room_type})</td></tr>
+<tr><td>Stay</td><td>{check_in} &rarr; {check_out} ({nights} nights)</td></tr>
+</table>
+<table>
+<tr><td>Sub-total</td><td class="num">&#2547;{subtotal:,.2f}</td></tr>
+<tr><td>Tax ({tax_rate:.0f}%)</td><td class="num">&#2547;{tax:,.2f}</td></tr>
+<tr class="total"><td>Total</td><td class="num">&#2547;{total:,.2f}</td></tr>
+<tr><td>Advance</td><td class="num">&#2547;{advance:,.2f}</td></tr>
+<tr class="total"><td>Due</td><td class="num">&#2547;{due:,.2f}</td></tr>
+</table>
+<p>Thank you for staying with us!</p>
+</body></html>
+""", escape=html.escape)
+
+
+# ── PDF ────────────────────────────────────────────────────────────────────
+PAGE_W, PAGE_H, MARGIN = 595, 842, 56      # A4 in points
+FONT_SIZE, LEADING = 10, 14
+
+
+def _pdf_string(line):
+    data = line.encode("cp1252", "replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def pdf_document(lines):
+    """A minimal PDF 1.4 file setting `lines` in Courier, paginated on A4."""
+    per_page = (PAGE_H - 2 * MARGIN) // LEADING
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier "
+               b"/Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for page in pages:
+        stream = b"BT /F1 %d Tf %d TL %d %d Td\n" % (FONT_SIZE, LEADING, MARGIN,
+                                                     PAGE_H - MARGIN - FONT_SIZE)
+        stream += b"".join(_pdf_string(line) + b" Tj T*\n" for line in page) + b"ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+                       % (PAGE_W, PAGE_H, len(objects)))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for n, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (n, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.writelines(b"%010d 00000 n \n" % o for o in offsets)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+              % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+# ── Context and caching ────────────────────────────────────────────────────
+def hotel_settings():
+    """(name, address, phone, tax rate, currency) from the settings cache."""
+    get = database.typed_settings().get
+    return (get("hotel_name", "Grand Hotel"), get("hotel_address", ""), get("hotel_phone", ""),
+            get("tax_rate", Decimal(0)), get("currency", "BDT"))
+
+
+@functools.lru_cache(maxsize=1024)
+def _issued(timestamp):
+    """issued_at is UTC (CURRENT_TIMESTAMP); show it in local time like the draft date."""
+    when = datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).astimezone()
+    return when.strftime("%d %b %Y  %H:%M")
+
+
+def invoice_context(booking, invoice, settings):
+    """Template fields for a booking (with room and guest columns) and its invoice or None."""
+    hotel, address, phone, tax_rate, currency = settings
+    subtotal = booking["total_amount"]
+    tax = subtotal * (tax_rate / 100)
+    advance = booking.get("advance_paid") or Money()
+    return {
+        "hotel": hotel, "address": address, "phone": phone, "currency": currency,
+        "number": invoice["invoice_number"] if invoice else DRAFT,
+        "date": (_issued(invoice["issued_at"]) if invoice
+                 else datetime.now().strftime("%d %b %Y  %H:%M")),
+        "guest": booking["guest_name"], "guest_phone": booking.get("phone") or "-",
+        "room": booking["room_number"], "room_type": booking["room_type"],
+        "check_in": booking["check_in"], "check_out": booking["check_out"],
+        "nights": booking["nights"],
+        "subtotal": subtotal, "tax_rate": tax_rate, "tax": tax,
+        "total": subtotal + tax, "advance": advance, "due": subtotal + tax - advance,
+    }
+
+
+def render_context(context, fmt="text"):
+    """Render a context as str (text, html) or bytes (pdf)."""
+    if fmt == "text":
+        return TEXT.render(context)
+    if fmt == "html":
+        return HTML.render(context)
+    if fmt == "pdf":
+        return pdf_document(PDF_TEXT.render(context).split("\n"))
+    raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+
+
+@functools.lru_cache(maxsize=256)
+def _render_cached(fmt, items):
+    return render_context(dict(items), fmt)
+
+
+def render(booking, fmt="text", invoice=None):
+    """
+    Render a booking's invoice. Pass the invoice row when the caller already
+    has it; otherwise it is looked up. Issued invoices are cached keyed by
+    everything that goes into them (invoice number, amounts, settings), so
+    an edit to any of those renders afresh. Drafts are never cached.
+    """
+    if invoice is None:
+        invoice = database.get_invoice_by_booking(booking["id"])
+    context = invoice_context(booking, invoice, hotel_settings())
+    if invoice is None:
+        return render_context(context, fmt)
+    return _render_cached(fmt, tuple(context.items()))
+
+
+def save(booking, path, invoice=None):
+    """Write the invoice to path in the format given by its extension (.txt/.html/.pdf)."""
+    ext = os.path.splitext(path)[1].lower()
+    fmt = {v: k for k, v in FORMATS.items()}.get(ext, "text")
+    data = render(booking, fmt, invoice)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+    return fmt
+
+
+# ── Month archive ──────────────────────────────────────────────────────────
+MONTH_INVOICES = """
+    SELECT i.invoice_number, i.issued_at, b.id, b.check_in, b.check_out, b.nights,
+           b.total_amount, b.advance_paid, r.room_number, r.room_type,
+           g.full_name AS guest_name, g.phone
+    FROM invoices i
+    JOIN bookings b ON i.booking_id = b.id
+    JOIN rooms r ON b.room_id = r.id
+    JOIN guests g ON b.guest_id = g.id
+    WHERE i.issued_at >= DATE(:month || '-01')
+      AND i.issued_at < DATE(:month || '-01', '+1 month')
+    ORDER BY i.id
+"""
+
+
+def _render_chunk(fmt, contexts):
+    """Process-pool worker: [(file name, bytes)] for a list of contexts."""
+    out = []
+    for context in contexts:
+        data = render_context(context, fmt)
+        out.append((context["number"] + FORMATS[fmt],
+                    data.encode("utf-8") if isinstance(data, str) else data))
+    return out
+
+
+def month_archive(month, path, fmt="pdf", workers=None, chunk=200):
+    """
+    Render every invoice issued in `month` (YYYY-MM) into the zip at path.
+    Rows are read here and rendered in `workers` processes (default: CPU
+    count; 1 renders in-process). Returns the number of invoices written.
+    """
+    datetime.strptime(month, "%Y-%m")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+    settings = hotel_settings()
+    rows = database.get_connection().execute(MONTH_INVOICES, {"month": month}).fetchall()
+    contexts = [invoice_context(database.row_dict(r), r, settings) for r in rows]
+    chunks = [(fmt, contexts[i:i + chunk]) for i in range(0, len(contexts), chunk)]
+
+    workers = workers or os.cpu_count() or 1
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        if workers == 1 or len(chunks) <= 1:
+            results = (_render_chunk(*c) for c in chunks)
+            _write_all(archive, results)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                _write_all(archive, pool.map(_render_chunk, *zip(*chunks)))
+    return len(contexts)
+
+
+def _write_all(archive, results):
+    for files in results:
+        for name, data in files:
+            archive.writestr(name, data)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Render a month's invoices into one zip archive.")
+    p.add_argument("month", help="YYYY-MM")
+    p.add_argument("-o", "--output", help="default: invoices_<YYYY>_<MM>.zip")
+    p.add_argument("-f", "--format", choices=FORMATS, default="pdf")
+    p.add_argument("--workers", type=int, help="render processes (default: CPU count)")
+    p.add_argument("--db", help="database file (default: hotel.db)")
+    args = p.parse_args(argv)
+
+    if args.db:
+        database.configure(db_path=args.db)
+    database.initialize_database()
+    path = args.output or f"invoices_{args.month.replace('-', '_')}.zip"
+    start = time.perf_counter()
+    try:
+        n = month_archive(args.month, path, args.format, args.workers)
+    except ValueError as e:
+        p.error(str(e))
+    print(f"{n} invoices -> {path} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import tkinter as tk
-from database import initialize_database
+from database import initialize_database, checkpoint
 
 
 def start_app():
@@ -33,6 +33,8 @@ def start_app():
 
     LoginWindow(root, on_login_success)
     root.mainloop()
+    # Shrink the -wal file when running in concurrency mode (no-op otherwise)
+    checkpoint()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""
+Hotel Management System - Money
+Amounts are stored as INTEGER minor units (paisa, 1/100 taka) and handled
+in Python as Money, so totals add up exactly and SQLite SUM()s integers.
+Money formats like a number ("{:,.2f}"), so display code is unchanged.
+"""
+import functools
+import sys
+from decimal import Decimal, ROUND_HALF_UP
+
+MINOR_UNITS = 100       # paisa per taka
+
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INVERSE = pow(MINOR_UNITS, -1, _HASH_MODULUS)
+
+
+@functools.total_ordering
+class Money:
+    """
+    An exact amount in minor units. Adds and subtracts with Money (and 0, so
+    sum() works); multiplies and divides by numbers, rounding half-up to the
+    minor unit; compares with Money or plain numbers (major units).
+    """
+
+    __slots__ = ("minor",)
+
+    def __init__(self, minor=0):
+        self.minor = int(minor)
+
+    @classmethod
+    def parse(cls, value):
+        """Money from major units: "1,500.50", 1500.5, Decimal("1500.5"), 1500 or Money."""
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, str):
+            value = value.replace(",", "").strip() or "0"
+        elif isinstance(value, float):
+            value = repr(value)         # shortest repr: 0.1 means 0.1, not 0.1000000000000000055
+        try:
+            amount = Decimal(value)
+        except (ArithmeticError, TypeError, ValueError):
+            raise ValueError(f"not an amount: {value!r}")
+        if not amount.is_finite():
+            raise ValueError(f"not an amount: {value!r}")
+        return cls(_round(amount * MINOR_UNITS))
+
+    def decimal(self):
+        return Decimal(self.minor) / MINOR_UNITS
+
+    # ── arithmetic ─────────────────────────────────────────────────────────
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.minor + other.minor)
+        if isinstance(other, int) and other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.minor - other.minor)
+        if isinstance(other, int) and other == 0:
+            return self
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int) and other == 0:
+            return -self
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.minor)
+
+    def __abs__(self):
+        return Money(abs(self.minor))
+
+    def __mul__(self, factor):
+        if isinstance(factor, int):
+            return Money(self.minor * factor)
+        if isinstance(factor, (Decimal, float)):
+            return Money(_round(self.minor * _decimal(factor)))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        if isinstance(divisor, (int, Decimal, float)):
+            return Money(_round(self.minor / _decimal(divisor)))
+        return NotImplemented
+
+    # ── comparison / conversion ────────────────────────────────────────────
+    def _other(self, other):
+        if isinstance(other, Money):
+            return other.minor
+        if isinstance(other, (int, float, Decimal)):
+            return _decimal(other) * MINOR_UNITS
+        return None
+
+    def __eq__(self, other):
+        other = self._other(other)
+        return NotImplemented if other is None else self.minor == other
+
+    def __lt__(self, other):
+        other = self._other(other)
+        return NotImplemented if other is None else self.minor < other
+
+    def __hash__(self):
+        # hash() of the same number (int, Decimal, Fraction), without building one:
+        # Python hashes p/q as p * q^-1 modulo a prime.
+        h = abs(self.minor) % _HASH_MODULUS * _HASH_INVERSE % _HASH_MODULUS
+        h = -h if self.minor < 0 else h
+        return -2 if h == -1 else h
+
+    def __bool__(self):
+        return self.minor != 0
+
+    def __float__(self):
+        return self.minor / MINOR_UNITS
+
+    def __format__(self, spec):
+        return format(self.decimal(), spec or ".2f")
+
+    def __str__(self):
+        return format(self, ".2f")
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+
+def _decimal(number):
+    return Decimal(repr(number)) if isinstance(number, float) else Decimal(number)
+
+
+def _round(amount):
+    return int(Decimal(amount).to_integral_value(ROUND_HALF_UP))
+
+
+def to_minor(value):
+    """Integer minor units for a Money or a major-unit number/string; None is 0."""
+    return 0 if value is None else Money.parse(value).minor
+
+
+def json_default(value):
+    """json.dumps(default=...) hook: Money as a number, anything else as str."""
+    if isinstance(value, Money):
+        return float(value)
+    return str(value)
@@ -0,0 +1,152 @@
+"""
+Hotel Management System - Night Audit
+End-of-day job, run once per business date (cron, or `python -m hotel audit run`):
+
+  1. post one night's room charge for every in-house booking (room_charges)
+  2. flag overstays: active bookings whose check-out date has passed
+  3. issue invoices for every checked-out booking that has none
+  4. roll room statuses forward to today
+  5. drop change_log entries older than database.CHANGE_LOG_KEEP_DAYS
+
+Each business date is one transaction of set-based statements, so the cost
+is a handful of queries however many bookings there are. Every step is
+keyed (one charge per booking and night, one invoice per booking), so a
+re-run, or a run after a crash rolled the last one back, never posts
+anything twice. run() catches up every date since the last completed audit.
+
+Run: python night_audit.py [--date 2026-03-31] [--db hotel.db]
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date, timedelta
+
+import database
+
+# Checked-out bookings still waiting for an invoice.
+PENDING_INVOICES = """
+    SELECT id, total_amount, advance_paid AS paid FROM bookings b
+    WHERE status = 'checked_out'
+      AND NOT EXISTS (SELECT 1 FROM invoices i WHERE i.booking_id = b.id)
+"""
+
+
+def _post_charges(conn, day):
+    """One night at the booking's average nightly rate for every guest in house on `day`."""
+    return conn.execute("""
+        INSERT INTO room_charges (booking_id, date, amount)
+        SELECT id, :day, CAST(ROUND(total_amount * 1.0 / MAX(nights, 1)) AS INTEGER) FROM bookings
+        WHERE status = 'active' AND check_in <= :day AND check_out > :day
+        ON CONFLICT DO NOTHING
+    """, {"day": day}).rowcount
+
+
+def overstays(conn, day):
+    """Active bookings that should have checked out on or before `day`."""
+    rows = conn.execute("""
+        SELECT b.id, r.room_number, g.full_name AS guest_name, b.check_out
+        FROM bookings b
+        JOIN rooms r ON b.room_id = r.id
+        JOIN guests g ON b.guest_id = g.id
+        WHERE b.status = 'active' AND b.check_out <= ?
+        ORDER BY b.check_out, b.id
+    """, (day,)).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _issue_invoices(conn, day):
+    """Invoice every pending booking with one block of consecutive numbers."""
+    count = conn.execute(f"SELECT COUNT(*) FROM ({PENDING_INVOICES})").fetchone()[0]
+    if not count:
+        return 0
+    stem, first = database.allocate_invoice_numbers(conn, count, year=int(day[:4]))
+    # Same defaults as the Billing page: full booking amount, advance as paid.
+    conn.execute(f"""
+        INSERT INTO invoices (booking_id, invoice_number, amount, discount, tax,
+                              paid_amount, status)
+        SELECT id, printf('%s%06d', ?, ? + ROW_NUMBER() OVER (ORDER BY id) - 1),
+               total_amount, 0, 0, paid,
+               CASE WHEN paid >= total_amount THEN 'paid' ELSE 'partial' END
+        FROM ({PENDING_INVOICES})
+    """, (stem, first))
+    return count
+
+
+@database.retry_on_lock
+def audit_day(day):
+    """Audit one business date (YYYY-MM-DD) in a single transaction; returns a summary."""
+    day = date.fromisoformat(str(day)).isoformat()
+    start = time.perf_counter()
+    with database.transaction() as conn:
+        charges = _post_charges(conn, day)
+        late = overstays(conn, day)
+        invoices = _issue_invoices(conn, day)
+        database.refresh_room_statuses()
+        seconds = round(time.perf_counter() - start, 3)
+        conn.execute("""
+            INSERT INTO audit_runs (business_date, charges, invoices, overstays, seconds)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(business_date) DO UPDATE SET
+                charges = charges + excluded.charges, invoices = invoices + excluded.invoices,
+                overstays = excluded.overstays, runs = runs + 1,
+                seconds = excluded.seconds, finished_at = CURRENT_TIMESTAMP
+        """, (day, charges, invoices, len(late), seconds))
+    database.invalidate_cache()
+    return {"date": day, "charges": charges, "invoices": invoices,
+            "overstays": late, "seconds": seconds}
+
+
+def last_audited():
+    """Latest business date with a completed audit, or None."""
+    return database.get_connection().execute(
+        "SELECT MAX(business_date) FROM audit_runs").fetchone()[0]
+
+
+def run(through=None):
+    """
+    Audit every business date after the last completed one up to `through`
+    (default today), oldest first, one transaction each. An interrupted
+    catch-up resumes at the first date it did not finish. A date that was
+    already audited is simply audited again (a no-op apart from overstays).
+    """
+    through = date.fromisoformat(str(through)) if through else date.today()
+    last = last_audited()
+    day = through
+    if last and date.fromisoformat(last) < through:
+        day = date.fromisoformat(last) + timedelta(days=1)
+    results = []
+    while day <= through:
+        results.append(audit_day(day))
+        day += timedelta(days=1)
+    database.prune_change_log()
+    return results
+
+
+def history(limit=30):
+    rows = database.get_connection().execute(
+        "SELECT * FROM audit_runs ORDER BY business_date DESC LIMIT ?", (limit,)).fetchall()
+    return [dict(r) for r in rows]
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Run the night audit up to a business date.")
+    p.add_argument("--date", help="last business date to audit, YYYY-MM-DD (default: today)")
+    p.add_argument("--db", help="database file (default: hotel.db)")
+    args = p.parse_args(argv)
+
+    if args.db:
+        database.configure(db_path=args.db)
+    database.enable_concurrency_mode()
+    database.initialize_database()
+    try:
+        results = run(args.date)
+    except ValueError as e:
+        p.error(str(e))
+    json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Hotel Management System - Query Statistics
+Every connection database.py opens is a TimedConnection: each statement is
+timed from execute() to its last fetch and counted per SQL text and per
+database.py helper (the outermost one on the stack, e.g. create_booking for
+the availability check it runs). Statements slower than the threshold go to
+a slow-query log (JSON lines, with EXPLAIN QUERY PLAN) next to the database.
+Statements that raise are only counted, per SQL text, not timed.
+
+Rows read by iterating a cursor are not timed past execute(); the helpers
+use fetchone()/fetchall(), which are.
+"""
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended.
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+ENABLED = True
+SLOW_QUERY_MS = 100
+SLOW_LOG = None         # path; database.configure() points it next to the database
+SLOW_LOG_KEEP = 200     # recent slow queries kept in memory for the Settings page
+
+_lock = threading.Lock()
+_own_globals = globals()
+
+
+def configure(enabled=None, slow_query_ms=None, slow_log=None):
+    """Turn recording on/off, change the slow-query threshold (ms) or log file."""
+    global ENABLED, SLOW_QUERY_MS, SLOW_LOG
+    if enabled is not None:
+        ENABLED = enabled
+    if slow_query_ms is not None:
+        SLOW_QUERY_MS = slow_query_ms
+    if slow_log is not None:
+        SLOW_LOG = slow_log
+
+
+class _Stat:
+    __slots__ = ("count", "seconds", "max", "rows", "hist")
+
+    def __init__(self):
+        self.count, self.seconds, self.max, self.rows = 0, 0.0, 0.0, 0
+        self.hist = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds, rows):
+        self.count += 1
+        self.seconds += seconds
+        self.rows += rows
+        if seconds > self.max:
+            self.max = seconds
+        ms = seconds * 1000
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.hist[i] += 1
+
+    def percentile(self, q):
+        """Upper bound (ms) of the bucket holding the q-th fraction of calls."""
+        target, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS_MS + (self.max * 1000,), self.hist):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max * 1000)
+        return self.max * 1000
+
+    def snapshot(self):
+        return {"count": self.count, "total_ms": round(self.seconds * 1000, 3),
+                "mean_ms": round(self.seconds * 1000 / self.count, 3) if self.count else 0,
+                "p50_ms": round(self.percentile(0.5), 3), "p95_ms": round(self.percentile(0.95), 3),
+                "max_ms": round(self.max * 1000, 3), "rows": self.rows,
+                "histogram": dict(zip([f"<={b}" for b in BUCKETS_MS] + [">"], self.hist))}
+
+
+_helpers = {}
+_statements = {}
+_failures = {}          # statement -> times it raised (not timed)
+_connections = {"opened": 0, "seconds": 0.0}
+_slow = []
+_since = time.time()
+
+
+_WALK, _CALLER = 0, 1
+_frames = {}            # code object -> (_WALK, helper name or None) / (_CALLER, label)
+
+
+def _classify(frame):
+    """What a frame of this code means to _helper(); cached per code object."""
+    code = frame.f_code
+    info = _frames.get(code)
+    if info is None:
+        module = frame.f_globals.get("__name__", "?")
+        if frame.f_globals is _own_globals:
+            info = (_WALK, None)
+        elif module in ("database", "contextlib"):
+            named = code.co_name in frame.f_globals and code.co_name != "transaction"
+            info = (_WALK, code.co_name if named else None)
+        else:   # co_qualname: 3.11+
+            info = (_CALLER, f"{module}.{getattr(code, 'co_qualname', code.co_name)}")
+        _frames[code] = info
+    return info
+
+
+def _helper(frame):
+    """
+    Who ran the statement: the outermost database.py function on the stack
+    that is a module-level name (so decorators' wrappers are skipped, and
+    BEGIN/COMMIT count towards the helper using transaction()), else the
+    first caller outside database.py. Each step is one dict lookup.
+    """
+    name = None
+    while frame is not None:
+        kind, label = _frames.get(frame.f_code) or _classify(frame)
+        if kind == _CALLER:
+            return name or label
+        if label:
+            name = label
+        frame = frame.f_back
+    return name or "?"
+
+
+_keys = {}
+
+
+def _statement_key(sql):
+    """SQL on one line; memoised, the helpers' statements are mostly constants."""
+    key = _keys.get(sql)
+    if key is None:
+        if len(_keys) > 5000:
+            _keys.clear()
+        key = _keys[sql] = " ".join(sql.split())
+    return key
+
+
+def _record(conn, sql, params, seconds, rows, helper):
+    key = _statement_key(sql)
+    with _lock:
+        for table, name in ((_helpers, helper), (_statements, key)):
+            stat = table.get(name)
+            if stat is None:
+                stat = table[name] = _Stat()
+            stat.add(seconds, rows)
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        _log_slow(conn, key, params, seconds, rows, helper)
+
+
+def _failed(sql):
+    key = _statement_key(sql)
+    with _lock:
+        _failures[key] = _failures.get(key, 0) + 1
+
+
+def _log_slow(conn, sql, params, seconds, rows, helper):
+    plan = []
+    if params is not None and not sql.upper().startswith(("BEGIN", "COMMIT", "ROLLBACK",
+                                                          "PRAGMA", "EXPLAIN")):
+        try:
+            plan = [r[3] for r in
+                    conn._plain_execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()]
+        except Exception:        # closed connection, temp table gone, ...
+            pass
+    entry = {"at": datetime.now().isoformat(timespec="seconds"),
+             "ms": round(seconds * 1000, 1), "helper": helper, "rows": rows,
+             "sql": sql, "plan": plan}
+    with _lock:
+        _slow.append(entry)
+        del _slow[:-SLOW_LOG_KEEP]
+        if SLOW_LOG:
+            try:
+                with open(SLOW_LOG, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError:
+                pass
+
+
+def connection_opened(seconds):
+    with _lock:
+        _connections["opened"] += 1
+        _connections["seconds"] += seconds
+
+
+def snapshot(top=None):
+    """
+    Everything recorded since start-up (or reset()): connection opens,
+    per-helper and per-statement stats sorted by total time (the `top`
+    most if given), statements that raised (counted, not timed, e.g.
+    "database is locked" before a retry), and the recent slow queries,
+    newest last.
+    """
+    def table(stats):
+        items = sorted(stats.items(), key=lambda kv: kv[1].seconds, reverse=True)
+        return {name: stat.snapshot() for name, stat in items[:top]}
+
+    with _lock:
+        return {"since": datetime.fromtimestamp(_since).isoformat(timespec="seconds"),
+                "enabled": ENABLED, "slow_query_ms": SLOW_QUERY_MS, "slow_log": SLOW_LOG,
+                "connections": {"opened": _connections["opened"],
+                                "total_ms": round(_connections["seconds"] * 1000, 3)},
+                "helpers": table(_helpers), "statements": table(_statements),
+                "failures": dict(sorted(_failures.items(), key=lambda kv: kv[1],
+                                        reverse=True)[:top]),
+                "slow": list(_slow)}
+
+
+def reset():
+    global _since
+    with _lock:
+        _helpers.clear()
+        _statements.clear()
+        _failures.clear()
+        _slow.clear()
+        _connections.update(opened=0, seconds=0.0)
+        _since = time.time()
+
+
+def read_slow_log(path=None, tail=50):
+    """The last `tail` entries of the slow-query log file."""
+    try:
+        with open(path or SLOW_LOG, encoding="utf-8") as f:
+            lines = f.readlines()[-tail:]
+    except (OSError, TypeError):
+        return []
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+# ── Timed connection and cursor ────────────────────────────────────────────
+class _Cursor(sqlite3.Cursor):
+    """Times execute() plus every fetch until the result is used up or dropped."""
+
+    _sql = None
+
+    def execute(self, sql, params=()):
+        self._finish()
+        helper = _helper(sys._getframe(1)) if ENABLED else None
+        start = time.perf_counter()
+        try:
+            super().execute(sql, params)
+        except BaseException:
+            if ENABLED:
+                _failed(sql)
+            raise
+        if ENABLED:
+            self._sql, self._params, self._helper = sql, params, helper
+            self._seconds, self._rows = time.perf_counter() - start, 0
+        return self
+
+    def executemany(self, sql, seq):
+        self._finish()
+        helper = _helper(sys._getframe(1)) if ENABLED else None
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, seq)
+        except BaseException:
+            if ENABLED:
+                _failed(sql)
+            raise
+        if ENABLED:
+            _record(self.connection, sql, None, time.perf_counter() - start,
+                    max(self.rowcount, 0), helper)
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        if self._sql is not None:
+            self._seconds += time.perf_counter() - start
+            if row is None:
+                self._finish()
+            else:
+                self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._sql is not None:
+            self._seconds += time.perf_counter() - start
+            self._rows += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        if self._sql is not None:
+            self._seconds += time.perf_counter() - start
+            self._rows += len(rows)
+            self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:       # interpreter shutdown
+            pass
+
+    def _finish(self):
+        if self._sql is None:
+            return
+        sql, self._sql = self._sql, None
+        rows = self._rows or max(self.rowcount, 0)
+        _record(self.connection, sql, self._params, self._seconds, rows, self._helper)
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3.Connection whose statements, commits and rollbacks are recorded."""
+
+    def cursor(self, factory=_Cursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq):
+        return self.cursor().executemany(sql, seq)
+
+    def commit(self):
+        self._timed(super().commit, "COMMIT")
+
+    def rollback(self):
+        self._timed(super().rollback, "ROLLBACK")
+
+    def _timed(self, fn, sql):
+        if not (ENABLED and self.in_transaction):
+            return fn()
+        helper = _helper(sys._getframe(2))
+        start = time.perf_counter()
+        try:
+            fn()
+        except BaseException:
+            _failed(sql)
+            raise
+        _record(self, sql, None, time.perf_counter() - start, 0, helper)
+
+    def _plain_execute(self, sql, params=()):
+        """Untimed execute, for the slow log's own EXPLAIN."""
+        return sqlite3.Connection.execute(self, sql, params)
@@ -0,0 +1,105 @@
+"""
+Hotel Management System - Background queries for Tk pages
+Debounces input, runs database calls off the Tk thread and hands only the
+newest result back to the page.
+"""
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from ui import profiler
+
+# Shared by every page. Worker threads keep their own SQLite connection
+# (see database.get_connection), so queries never touch the Tk thread's.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ui-query")
+
+POLL_MS = 30
+
+
+class AsyncQuery:
+    """
+    Debounced, cancellable background query.
+
+        q = AsyncQuery(frame, search_guests, self._fill)
+        search_var.trace("w", lambda *a: q.submit(search_var.get()))
+
+    submit() restarts the debounce timer; when it fires, query_fn runs on a
+    worker thread. Every submit bumps a sequence number, so a result that
+    arrives after a newer keystroke is dropped, and a request still waiting
+    for a worker is skipped altogether. Results reach on_result (or
+    on_error; without one the error is re-raised) on the Tk thread via
+    widget.after polling.
+    """
+
+    def __init__(self, widget, query_fn, on_result, delay_ms=250, on_error=None):
+        self.widget = widget
+        self.query_fn = query_fn
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self._seq = 0
+        self._done = 0          # newest sequence number that has finished
+        self._timer = None
+        self._polling = False
+        self._results = queue.Queue()
+        self._label = "result:" + getattr(on_result, "__qualname__", "?")
+
+    def submit(self, *args):
+        """Run query_fn(*args) once input has been quiet for delay_ms."""
+        self._schedule(self.delay_ms, args)
+
+    def run_now(self, *args):
+        """Run query_fn(*args) right away (e.g. after a save), still off-thread."""
+        self._schedule(0, args)
+
+    def cancel(self):
+        """Forget any pending or running query."""
+        self._seq += 1
+        self._done = self._seq
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+
+    def _schedule(self, delay, args):
+        self.cancel()
+        seq = self._seq
+        self._done = seq - 1
+        self._timer = self.widget.after(delay, lambda: self._start(seq, args))
+
+    def _start(self, seq, args):
+        self._timer = None
+        _executor.submit(self._work, seq, args)
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_MS, self._poll)
+
+    def _work(self, seq, args):
+        if seq != self._seq:        # superseded while queued
+            return
+        try:
+            self._results.put((seq, self.query_fn(*args), None))
+        except Exception as ex:
+            self._results.put((seq, None, ex))
+        self._done = max(self._done, seq)
+
+    def _poll(self):
+        if not self.widget.winfo_exists():
+            return
+        try:
+            while True:
+                seq, result, error = self._results.get_nowait()
+                if seq != self._seq:
+                    continue
+                if error is None:
+                    with profiler.activity(self._label):
+                        self.on_result(result)
+                elif self.on_error:
+                    self.on_error(error)
+                else:
+                    raise error
+        except queue.Empty:
+            pass
+        # Keep polling while the newest query may still be in flight.
+        if self._timer is None and self._done >= self._seq and self._results.empty():
+            self._polling = False
+        else:
+            self.widget.after(POLL_MS, self._poll)
@@ -3,11 +3,13 @@ Hotel Management System - Billing / Invoice Page
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from datetime import datetime
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database import (get_all_bookings, get_invoice_by_booking,
-                      create_invoice, get_settings)
+from database import (get_bookings_page, count_bookings, get_invoice_by_booking,
+                      create_invoice, get_bookings_by_ids)
+from ui.paged_table import PagedTable
+import events
+import invoice_render
 
 BG      = "#0f172a"
 CARD    = "#1e293b"
@@ -24,6 +26,7 @@ class BillingPage:
     def __init__(self, parent, user):
         self.parent = parent
         self.user = user
+        self.shown = None    # (booking id, invoice row) behind the preview
         self.frame = tk.Frame(parent, bg=BG)
         self.frame.pack(fill="both", expand=True, padx=24, pady=20)
         self._build()
@@ -35,7 +38,9 @@ class BillingPage:
                  font=("Arial", 11), bg=BG, fg=MUTED).pack(anchor="w", pady=(4, 14))
 
         # Booking table (active + checked out)
-        cols = ("#", "Room", "Guest", "Check-In", "Check-Out", "Total", "Status")
+        cols = [("#", 50, "id"), ("Room", 80, "room"), ("Guest", 180, "guest"),
+                ("Check-In", 100, "check_in"), ("Check-Out", 100, "check_out"),
+                ("Total", 100, "amount"), ("Status", 110, "status")]
         style = ttk.Style()
         style.configure("Bi.Treeview", background=CARD, foreground=TEXT,
                         fieldbackground=CARD, rowheight=30, font=("Arial", 10))
@@ -43,28 +48,20 @@ class BillingPage:
                         font=("Arial", 10, "bold"))
         style.map("Bi.Treeview", background=[("selected", "#2563eb")])
 
-        t_frame = tk.Frame(self.frame, bg=BG)
-        t_frame.pack(fill="both", expand=True)
-
-        self.tree = ttk.Treeview(t_frame, columns=cols, show="headings",
-                                 style="Bi.Treeview", height=12)
-        widths = [50, 80, 180, 100, 100, 100, 110]
-        for col, w in zip(cols, widths):
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=w, anchor="center")
-        sb = ttk.Scrollbar(t_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=sb.set)
-        self.tree.pack(side="left", fill="both", expand=True)
-        sb.pack(side="left", fill="y")
-
-        self.bookings = get_all_bookings()
-        for b in self.bookings:
-            self.tree.insert("", "end", iid=b["id"], values=(
-                b["id"], b["room_number"], b["guest_name"],
-                b["check_in"], b["check_out"],
-                f"৳{b['total_amount']:,.0f}",
-                b["status"].replace("_", " ").title()
-            ))
+        self.table = PagedTable(self.frame, cols, get_bookings_page, count_bookings,
+                                lambda b: ((
+                                    b["id"], b["room_number"], b["guest_name"],
+                                    b["check_in"], b["check_out"],
+                                    f"৳{b['total_amount']:,.0f}",
+                                    b["status"].replace("_", " ").title()
+                                ), ()),
+                                "Bi.Treeview", sort="created_at", descending=True, height=12,
+                                fetch_rows=get_bookings_by_ids)
+        self.table.frame.pack(fill="both", expand=True)
+        self.tree = self.table.tree
+        self.table.reload()
+        events.subscribe(("bookings", "rooms", "guests", "invoices"), self.on_changes,
+                         widget=self.frame)
 
         # Buttons
         act = tk.Frame(self.frame, bg=BG)
@@ -72,7 +69,7 @@ class BillingPage:
         tk.Button(act, text="🧾 Generate Invoice", font=("Arial", 11, "bold"),
                   bg=ACCENT, fg=TEXT, relief="flat", cursor="hand2", padx=14, pady=6,
                   command=self._generate_invoice).pack(side="left", padx=4)
-        tk.Button(act, text="💾 Save as TXT", font=("Arial", 11, "bold"),
+        tk.Button(act, text="💾 Save Invoice", font=("Arial", 11, "bold"),
                   bg=SUCCESS, fg=TEXT, relief="flat", cursor="hand2", padx=14, pady=6,
                   command=self._save_invoice).pack(side="left", padx=4)
 
@@ -85,56 +82,30 @@ class BillingPage:
                                highlightthickness=1, highlightbackground=BORDER)
         self.preview.pack(fill="x")
 
+    def refresh(self):
+        self.table.refresh()
+
+    def on_changes(self, changes):
+        # Any invoice change may be the previewed booking's: fetch it afresh next time.
+        if self.shown and any(c.entity == "invoices" for c in changes):
+            self.shown = None
+        if events.needs_reload(changes, "bookings"):
+            self.refresh()
+        else:
+            self.table.update_rows(events.booking_ids(changes, self.table.rows.values()))
+
     def _get_selected_booking(self):
         sel = self.tree.selection()
         if not sel:
             messagebox.showwarning("Select", "Please select a booking from the table.")
             return None
-        bid = int(sel[0])
-        return next((b for b in self.bookings if b["id"] == bid), None)
-
-    def _build_invoice_text(self, booking):
-        settings = get_settings()
-        hotel = settings.get("hotel_name", "Grand Hotel")
-        addr  = settings.get("hotel_address", "")
-        phone = settings.get("hotel_phone", "")
-        tax_rate = float(settings.get("tax_rate", 0))
-
-        subtotal = booking["total_amount"]
-        tax_amt  = subtotal * tax_rate / 100
-        total    = subtotal + tax_amt
-        adv      = booking.get("advance_paid", 0) or 0
-        due      = total - adv
+        return self.table.row(sel[0])
 
-        inv = get_invoice_by_booking(booking["id"])
-        inv_num = inv["invoice_number"] if inv else f"INV-{booking['id']:04d}"
-
-        lines = [
-            "═" * 50,
-            f"          {hotel}",
-            f"          {addr}",
-            f"          📞 {phone}",
-            "═" * 50,
-            f"  INVOICE No: {inv_num}",
-            f"  Date: {datetime.now().strftime('%d %b %Y  %H:%M')}",
-            "─" * 50,
-            f"  Guest  : {booking['guest_name']}",
-            f"  Phone  : {booking.get('phone') or '-'}",
-            f"  Room   : {booking['room_number']} ({booking['room_type']})",
-            f"  Check-In : {booking['check_in']}",
-            f"  Check-Out: {booking['check_out']}",
-            f"  Nights : {booking['nights']}",
-            "─" * 50,
-            f"  Sub-total : ৳{subtotal:>10,.2f}",
-            f"  Tax ({tax_rate:.0f}%)  : ৳{tax_amt:>10,.2f}",
-            f"  TOTAL     : ৳{total:>10,.2f}",
-            f"  Advance   : ৳{adv:>10,.2f}",
-            f"  DUE       : ৳{due:>10,.2f}",
-            "═" * 50,
-            "  Thank you for staying with us!",
-            "═" * 50,
-        ]
-        return "\n".join(lines)
+    def _invoice_for(self, booking):
+        """The booking's invoice, reusing the row fetched by the last Generate."""
+        if self.shown and self.shown[0] == booking["id"]:
+            return self.shown[1]
+        return get_invoice_by_booking(booking["id"])
 
     def _generate_invoice(self):
         booking = self._get_selected_booking()
@@ -145,8 +116,10 @@ class BillingPage:
         if not inv:
             create_invoice(booking["id"], booking["total_amount"], 0, 0,
                            booking.get("advance_paid", 0) or 0)
+            inv = get_invoice_by_booking(booking["id"])
+        self.shown = (booking["id"], inv)
 
-        text = self._build_invoice_text(booking)
+        text = invoice_render.render(booking, "text", inv)
         self.preview.configure(state="normal")
         self.preview.delete("1.0", "end")
         self.preview.insert("1.0", text)
@@ -155,13 +128,12 @@ class BillingPage:
     def _save_invoice(self):
         booking = self._get_selected_booking()
         if not booking: return
-        text = self._build_invoice_text(booking)
         path = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            initialfile=f"Invoice_{booking['room_number']}_{booking['guest_name']}.txt",
-            filetypes=[("Text files", "*.txt"), ("All", "*.*")]
+            defaultextension=".pdf",
+            initialfile=f"Invoice_{booking['room_number']}_{booking['guest_name']}.pdf",
+            filetypes=[("PDF", "*.pdf"), ("HTML", "*.html"), ("Text files", "*.txt"),
+                       ("All", "*.*")]
         )
         if path:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(text)
+            invoice_render.save(booking, path, self._invoice_for(booking))
             messagebox.showinfo("Saved", f"Invoice saved to:\n{path}")
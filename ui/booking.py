@@ -7,8 +7,13 @@ from tkinter import ttk, messagebox
 from datetime import date, datetime, timedelta
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database import (get_all_bookings, get_all_rooms, get_all_guests,
-                      create_booking, cancel_booking, checkout_booking, search_bookings)
+from database import (get_bookings_page, count_bookings, get_available_rooms, get_all_guests,
+                      create_booking, cancel_booking, checkout_booking, search_bookings,
+                      get_bookings_by_ids)
+import events
+from money import Money
+from ui.async_query import AsyncQuery
+from ui.paged_table import PagedTable
 
 BG      = "#0f172a"
 CARD    = "#1e293b"
@@ -22,10 +27,9 @@ BORDER  = "#334155"
 
 
 class BookingsPage:
-    def __init__(self, parent, user, refresh_cb=None):
+    def __init__(self, parent, user):
         self.parent = parent
         self.user = user
-        self.refresh_cb = refresh_cb
 
         self.frame = tk.Frame(parent, bg=BG)
         self.frame.pack(fill="both", expand=True, padx=24, pady=20)
@@ -43,14 +47,15 @@ class BookingsPage:
                   command=self._new_booking_dialog).pack(side="right", padx=6)
         tk.Button(hdr, text="🔄 Refresh", font=("Arial", 10),
                   bg=ACCENT, fg=TEXT, relief="flat", cursor="hand2", padx=10, pady=4,
-                  command=self._refresh).pack(side="right")
+                  command=self.refresh).pack(side="right")
 
         # Search bar
         search_row = tk.Frame(self.frame, bg=BG)
         search_row.pack(fill="x", pady=(0, 8))
         tk.Label(search_row, text="🔍 Search:", font=("Arial", 10), bg=BG, fg=MUTED).pack(side="left")
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", lambda *a: self._load_table())
+        self._query = AsyncQuery(self.frame, search_bookings, self._show_results)
+        self.search_var.trace("w", lambda *a: self._on_search())
         tk.Entry(search_row, textvariable=self.search_var, font=("Arial", 11),
                  bg=CARD, fg=TEXT, insertbackground=TEXT, relief="flat",
                  highlightthickness=1, highlightbackground=BORDER, width=30).pack(side="left", padx=8, ipady=4)
@@ -59,8 +64,10 @@ class BookingsPage:
         self._build_table()
 
     def _build_table(self):
-        cols = ("#", "Room", "Type", "Guest", "Phone", "Check-In", "Check-Out",
-                "Nights", "Amount", "Status")
+        cols = [("#", 40, "id"), ("Room", 70, "room"), ("Type", 80, "type"),
+                ("Guest", 150, "guest"), ("Phone", 110, None), ("Check-In", 100, "check_in"),
+                ("Check-Out", 100, "check_out"), ("Nights", 55, "nights"),
+                ("Amount", 90, "amount"), ("Status", 90, "status")]
         style = ttk.Style()
         style.theme_use("clam")
         style.configure("B.Treeview", background=CARD, foreground=TEXT,
@@ -69,22 +76,18 @@ class BookingsPage:
                         font=("Arial", 10, "bold"))
         style.map("B.Treeview", background=[("selected", "#2563eb")])
 
-        tbl_frame = tk.Frame(self.frame, bg=BG)
-        tbl_frame.pack(fill="both", expand=True)
-
-        self.tree = ttk.Treeview(tbl_frame, columns=cols, show="headings",
-                                 style="B.Treeview", height=14)
-        widths = [40, 70, 80, 150, 110, 100, 100, 55, 90, 90]
-        for col, w in zip(cols, widths):
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=w, anchor="center")
-
-        sb = ttk.Scrollbar(tbl_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=sb.set)
-        self.tree.pack(side="left", fill="both", expand=True)
-        sb.pack(side="left", fill="y")
+        self.table = PagedTable(self.frame, cols, get_bookings_page, count_bookings,
+                                self._row_values, "B.Treeview",
+                                sort="created_at", descending=True,
+                                fetch_rows=get_bookings_by_ids)
+        self.table.frame.pack(fill="both", expand=True)
+        self.tree = self.table.tree
+        self.tree.tag_configure("active",  background="#1d4034", foreground=TEXT)
+        self.tree.tag_configure("out",     background="#172554", foreground=TEXT)
+        self.tree.tag_configure("cancel",  background="#450a0a", foreground=TEXT)
 
         self._load_table()
+        events.subscribe(("bookings", "rooms", "guests"), self.on_changes, widget=self.frame)
 
         # Action buttons
         action_row = tk.Frame(self.frame, bg=BG)
@@ -96,22 +99,33 @@ class BookingsPage:
                   bg=DANGER, fg=TEXT, relief="flat", cursor="hand2", padx=12, pady=5,
                   command=self._cancel_selected).pack(side="left", padx=4)
 
+    def _on_search(self):
+        q = self.search_var.get().strip()
+        if q:
+            self._query.submit(q)
+        else:
+            self._query.cancel()
+            self.table.reload()
+
     def _load_table(self):
-        q = self.search_var.get().strip() if hasattr(self, "search_var") else ""
-        self.tree.delete(*self.tree.get_children())
-        bookings = search_bookings(q) if q else get_all_bookings()
+        q = self.search_var.get().strip()
+        if q:
+            self._query.run_now(q)
+        else:
+            self.table.refresh()
+
+    def _show_results(self, bookings):
+        self.table.show_rows(bookings)
+
+    @staticmethod
+    def _row_values(b):
         tag_map = {"active": "active", "checked_out": "out", "cancelled": "cancel"}
-        self.tree.tag_configure("active",  background="#1d4034", foreground=TEXT)
-        self.tree.tag_configure("out",     background="#172554", foreground=TEXT)
-        self.tree.tag_configure("cancel",  background="#450a0a", foreground=TEXT)
-        for b in bookings:
-            tag = tag_map.get(b["status"], "")
-            self.tree.insert("", "end", iid=b["id"], values=(
-                b["id"], b["room_number"], b["room_type"], b["guest_name"],
-                b["phone"] or "-", b["check_in"], b["check_out"],
-                b["nights"], f"৳{b['total_amount']:,.0f}",
-                b["status"].replace("_", " ").title()
-            ), tags=(tag,))
+        return (
+            b["id"], b["room_number"], b["room_type"], b["guest_name"],
+            b["phone"] or "-", b["check_in"], b["check_out"],
+            b["nights"], f"৳{b['total_amount']:,.0f}",
+            b["status"].replace("_", " ").title()
+        ), (tag_map.get(b["status"], ""),)
 
     def _get_selected_booking_id(self):
         sel = self.tree.selection()
@@ -124,19 +138,22 @@ class BookingsPage:
         bid = self._get_selected_booking_id()
         if bid and messagebox.askyesno("Check Out", "Mark this booking as checked out?"):
             checkout_booking(bid)
-            self._refresh()
-            if self.refresh_cb: self.refresh_cb()
 
     def _cancel_selected(self):
         bid = self._get_selected_booking_id()
         if bid and messagebox.askyesno("Cancel Booking", "Cancel this booking? The room will be freed."):
             cancel_booking(bid)
-            self._refresh()
-            if self.refresh_cb: self.refresh_cb()
 
-    def _refresh(self):
+    def refresh(self):
         self._load_table()
 
+    def on_changes(self, changes):
+        """New bookings re-read the list (or re-run the search); edits patch just their rows."""
+        if events.needs_reload(changes, "bookings"):
+            self.refresh()
+        else:
+            self.table.update_rows(events.booking_ids(changes, self.table.rows.values()))
+
     # ─── New Booking Dialog ─────────────────────────────────────────────────
     def _new_booking_dialog(self):
         dlg = tk.Toplevel(self.frame)
@@ -159,11 +176,10 @@ class BookingsPage:
             tk.Label(form, text=text, font=("Arial", 10, "bold"),
                      bg=CARD, fg=MUTED, anchor="w").pack(fill="x", pady=(10, 2))
 
-        # Room selector (only available rooms)
-        lbl("🛏  Room (Available Only)")
-        rooms = [r for r in get_all_rooms() if r["status"] == "available"]
-        room_labels = [f"Room {r['room_number']} — {r['room_type']} (৳{r['price_per_night']:,.0f}/night)"
-                       for r in rooms]
+        # Room selector (rooms free for the chosen dates, refreshed when they change)
+        lbl("🛏  Room (Free for Selected Dates)")
+        rooms = []
+        room_labels = []
         room_var = tk.StringVar()
         room_cb = ttk.Combobox(form, values=room_labels, textvariable=room_var,
                                font=("Arial", 11), state="readonly")
@@ -200,6 +216,26 @@ class BookingsPage:
         checkin_var  = date_field(left_f,  "📅  Check-In (YYYY-MM-DD)",  today)
         checkout_var = date_field(right_f, "📅  Check-Out (YYYY-MM-DD)", today + timedelta(days=1))
 
+        def load_rooms(*a):
+            try:
+                ci = datetime.strptime(checkin_var.get(), "%Y-%m-%d").date()
+                co = datetime.strptime(checkout_var.get(), "%Y-%m-%d").date()
+            except ValueError:
+                return
+            if co <= ci:
+                return
+            selected = room_var.get()
+            rooms[:] = get_available_rooms(ci, co)
+            room_labels[:] = [f"Room {r['room_number']} — {r['room_type']} (৳{r['price_per_night']:,.0f}/night)"
+                              for r in rooms]
+            room_cb.configure(values=room_labels)
+            if selected and selected not in room_labels:
+                room_var.set("")
+
+        load_rooms()
+        checkin_var.trace("w", load_rooms)
+        checkout_var.trace("w", load_rooms)
+
         # Advance paid
         lbl("💰  Advance Paid (৳)")
         advance_var = tk.StringVar(value="0")
@@ -255,12 +291,10 @@ class BookingsPage:
                 if nights <= 0:
                     err_lbl.config(text="Check-out must be after check-in."); return
                 total = nights * room["price_per_night"]
-                advance = float(advance_var.get() or 0)
+                advance = Money.parse(advance_var.get())
                 create_booking(room["id"], guest["id"], str(ci), str(co),
                                nights, total, advance, notes_var.get())
                 dlg.destroy()
-                self._refresh()
-                if self.refresh_cb: self.refresh_cb()
                 messagebox.showinfo("Success", f"Booking created!\nRoom {room['room_number']} → {guest['full_name']}")
             except Exception as ex:
                 err_lbl.config(text=f"Error: {ex}")
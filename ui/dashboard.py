@@ -3,7 +3,10 @@ Hotel Management System - Dashboard (Main Shell)
 Sidebar navigation + stats bar + content frame
 """
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk, messagebox
+from ui import profiler
+import events
 
 # Colour palette (shared)
 BG       = "#0f172a"
@@ -19,6 +22,10 @@ DANGER   = "#ef4444"
 BORDER   = "#334155"
 STAT_BG  = "#0f172a"
 
+# Built pages kept alive (hidden) between visits; the least recently shown
+# one beyond this is destroyed and rebuilt when next opened.
+PAGE_CACHE_SIZE = 5
+
 
 class Dashboard:
     def __init__(self, root, user):
@@ -29,7 +36,11 @@ class Dashboard:
         self.root.configure(bg=BG)
         self._center()
         self._active_btn = None
+        self._pages = OrderedDict()     # show method name -> [frame, page, data stamp]
+        self._shown = None
+        profiler.install(root)
         self._build()
+        events.watch(root)
 
     def _center(self):
         self.root.update_idletasks()
@@ -44,8 +55,13 @@ class Dashboard:
         topbar.pack(fill="x", side="top")
         topbar.pack_propagate(False)
 
-        tk.Label(topbar, text="🏨  Grand Hotel  Management System",
-                 font=("Arial", 14, "bold"), bg=SIDEBAR, fg=TEXT).pack(side="left", padx=20)
+        from database import get_setting, subscribe_settings
+        self.title_lbl = tk.Label(topbar, text=self._title(get_setting("hotel_name")),
+                                  font=("Arial", 14, "bold"), bg=SIDEBAR, fg=TEXT)
+        self.title_lbl.pack(side="left", padx=20)
+        self._unsubscribe = subscribe_settings(self._on_settings)
+        self.root.bind("<Destroy>", lambda e: e.widget is self.root and self._unsubscribe(), add="+")
+        self._poll_settings()
 
         tk.Label(topbar,
                  text=f"👤  {self.user['full_name'] or self.user['username']}  [{self.user['role'].upper()}]",
@@ -61,6 +77,8 @@ class Dashboard:
         self.stats_frame.pack(fill="x", side="top")
         self.stats_frame.pack_propagate(False)
         self._refresh_stats()
+        events.subscribe(("rooms", "bookings", "guests"), lambda changes: self._refresh_stats(),
+                         widget=self.stats_frame)
 
         # ── Body (sidebar + content) ──────────────────────
         body = tk.Frame(self.root, bg=BG)
@@ -109,11 +127,46 @@ class Dashboard:
         self._active_btn = btn
         if btn:
             btn.config(bg=ACCENT)
-        # Clear content
-        for w in self.content.winfo_children():
-            w.destroy()
-        cmd()
-
+        # The time until the page is drawn counts as its build (or show) time
+        with profiler.activity("page:" + cmd.__name__.replace("_show_", ""), kind="page"):
+            self._show_page(cmd)
+            self.root.update_idletasks()
+
+    def _show_page(self, cmd):
+        """Show a cached page; one that does not follow change events is rebuilt if data changed."""
+        from database import data_stamp
+        stamp = data_stamp()
+        if self._shown is not None:
+            self._shown.pack_forget()
+        key = cmd.__name__
+        entry = self._pages.get(key)
+        if entry is not None and not hasattr(entry[1], "on_changes") and entry[2] != stamp:
+            entry[0].destroy()
+            entry = None
+        if entry is None:
+            frame = tk.Frame(self.content, bg=BG)
+            entry = self._pages[key] = [frame, cmd(frame), stamp]
+        self._pages.move_to_end(key)
+        while len(self._pages) > PAGE_CACHE_SIZE:
+            self._pages.popitem(last=False)[1][0].destroy()
+        self._shown = entry[0]
+        self._shown.pack(fill="both", expand=True)
+
+    @staticmethod
+    def _title(hotel_name):
+        return f"🏨  {hotel_name or 'Grand Hotel'}  Management System"
+
+    def _on_settings(self, changed):
+        if "hotel_name" in changed:
+            self.title_lbl.config(text=self._title(changed["hotel_name"]))
+
+    def _poll_settings(self):
+        """Notice settings saved on another terminal (cheap when nothing changed)."""
+        from database import poll_settings
+        poll_settings()
+        self.root.after(3000, self._poll_settings)
+
+    @profiler.timed("dashboard:refresh_stats")
     def _refresh_stats(self):
         for w in self.stats_frame.winfo_children():
             w.destroy()
@@ -135,36 +188,38 @@ class Dashboard:
             tk.Label(card, text=label, font=("Arial", 9),
                      bg=CARD, fg=MUTED).pack()
 
-    # ─── Page loaders ────────────────────────────────────────────────────────
-    def _show_home(self):
-        self._refresh_stats()
+    # ─── Page loaders: build a page into `parent` and return it ──────────────
+    # Pages with on_changes() keep themselves current (see events.py; Settings
+    # follows subscribe_settings), even while hidden, so unsaved input survives
+    # navigation; the others are rebuilt when the data changed.
+    def _show_home(self, parent):
         from ui.home import HomePage
-        HomePage(self.content, self.user, self._nav_buttons, self._nav_click,
-                 self._show_rooms, self._show_bookings)
+        return HomePage(parent, self.user, self._nav_buttons, self._nav_click,
+                        self._show_rooms, self._show_bookings)
 
-    def _show_rooms(self):
+    def _show_rooms(self, parent):
         from ui.rooms import RoomsPage
-        RoomsPage(self.content, self.user, refresh_cb=self._refresh_stats)
+        return RoomsPage(parent, self.user)
 
-    def _show_bookings(self):
+    def _show_bookings(self, parent):
         from ui.booking import BookingsPage
-        BookingsPage(self.content, self.user, refresh_cb=self._refresh_stats)
+        return BookingsPage(parent, self.user)
 
-    def _show_guests(self):
+    def _show_guests(self, parent):
         from ui.guests import GuestsPage
-        GuestsPage(self.content, self.user)
+        return GuestsPage(parent, self.user)
 
-    def _show_billing(self):
+    def _show_billing(self, parent):
         from ui.billing import BillingPage
-        BillingPage(self.content, self.user)
+        return BillingPage(parent, self.user)
 
-    def _show_reports(self):
+    def _show_reports(self, parent):
         from ui.reports import ReportsPage
-        ReportsPage(self.content, self.user)
+        return ReportsPage(parent, self.user)
 
-    def _show_settings(self):
+    def _show_settings(self, parent):
         from ui.settings import SettingsPage
-        SettingsPage(self.content, self.user)
+        return SettingsPage(parent, self.user)
 
     def _logout(self):
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
@@ -5,7 +5,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database import get_all_guests, add_guest, update_guest, delete_guest, search_guests
+from database import (get_guests_page, count_guests, add_guest, update_guest,
+                      delete_guest, search_guests, get_guests_by_ids)
+import events
+from ui.async_query import AsyncQuery
+from ui.paged_table import PagedTable
 
 BG      = "#0f172a"
 CARD    = "#1e293b"
@@ -39,14 +43,17 @@ class GuestsPage:
         sr.pack(fill="x", pady=(0, 8))
         tk.Label(sr, text="🔍 Search:", font=("Arial", 10), bg=BG, fg=MUTED).pack(side="left")
         self.search_var = tk.StringVar()
-        self.search_var.trace("w", lambda *a: self._load())
+        self._query = AsyncQuery(self.frame, search_guests, self._show_results)
+        self.search_var.trace("w", lambda *a: self._on_search())
         tk.Entry(sr, textvariable=self.search_var, font=("Arial", 11),
                  bg=CARD, fg=TEXT, insertbackground=TEXT, relief="flat",
                  highlightthickness=1, highlightbackground=BORDER, width=30).pack(
                      side="left", padx=8, ipady=4)
 
         # Table
-        cols = ("#", "Full Name", "Phone", "Email", "NID", "Address", "Joined")
+        cols = [("#", 40, "id"), ("Full Name", 180, "name"), ("Phone", 120, None),
+                ("Email", 180, None), ("NID", 130, None), ("Address", 200, None),
+                ("Joined", 120, "created_at")]
         style = ttk.Style()
         style.configure("G.Treeview", background=CARD, foreground=TEXT,
                         fieldbackground=CARD, rowheight=30, font=("Arial", 10))
@@ -54,20 +61,13 @@ class GuestsPage:
                         font=("Arial", 10, "bold"))
         style.map("G.Treeview", background=[("selected", "#2563eb")])
 
-        t_frame = tk.Frame(self.frame, bg=BG)
-        t_frame.pack(fill="both", expand=True)
-
-        self.tree = ttk.Treeview(t_frame, columns=cols, show="headings",
-                                 style="G.Treeview", height=14)
-        widths = [40, 180, 120, 180, 130, 200, 120]
-        for col, w in zip(cols, widths):
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=w, anchor="center")
-        sb = ttk.Scrollbar(t_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=sb.set)
-        self.tree.pack(side="left", fill="both", expand=True)
-        sb.pack(side="left", fill="y")
-        self._load()
+        self.table = PagedTable(self.frame, cols, get_guests_page, count_guests,
+                                self._row_values, "G.Treeview", sort="name",
+                                fetch_rows=get_guests_by_ids)
+        self.table.frame.pack(fill="both", expand=True)
+        self.tree = self.table.tree
+        self.refresh()
+        events.subscribe(("guests",), self.on_changes, widget=self.frame)
 
         # Actions
         act = tk.Frame(self.frame, bg=BG)
@@ -79,17 +79,38 @@ class GuestsPage:
                   bg=DANGER, fg=TEXT, relief="flat", cursor="hand2", padx=12, pady=5,
                   command=self._delete_selected).pack(side="left", padx=4)
 
-    def _load(self):
+    def _on_search(self):
         q = self.search_var.get().strip()
-        self.tree.delete(*self.tree.get_children())
-        rows = search_guests(q) if q else get_all_guests()
-        for g in rows:
-            self.tree.insert("", "end", iid=g["id"], values=(
-                g["id"], g["full_name"], g["phone"] or "-",
-                g["email"] or "-", g["nid"] or "-",
-                g["address"] or "-",
-                g["created_at"][:10] if g.get("created_at") else "-"
-            ))
+        if q:
+            self._query.submit(q)
+        else:
+            self._query.cancel()
+            self.table.reload()
+
+    def refresh(self):
+        q = self.search_var.get().strip()
+        if q:
+            self._query.run_now(q)
+        else:
+            self.table.refresh()
+
+    def on_changes(self, changes):
+        if events.needs_reload(changes, "guests"):
+            self.refresh()
+        else:
+            self.table.update_rows(c.id for c in changes)
+
+    def _show_results(self, rows):
+        self.table.show_rows(rows)
+
+    @staticmethod
+    def _row_values(g):
+        return (
+            g["id"], g["full_name"], g["phone"] or "-",
+            g["email"] or "-", g["nid"] or "-",
+            g["address"] or "-",
+            g["created_at"][:10] if g.get("created_at") else "-"
+        ), ()
 
     def _get_selected(self):
         sel = self.tree.selection()
@@ -101,15 +122,13 @@ class GuestsPage:
     def _edit_selected(self):
         gid = self._get_selected()
         if gid:
-            guests = get_all_guests()
-            g = next((x for x in guests if x["id"] == gid), None)
+            g = self.table.row(gid)
             if g: self._open_form(g)
 
     def _delete_selected(self):
         gid = self._get_selected()
         if gid and messagebox.askyesno("Delete", "Delete this guest? This cannot be undone."):
             delete_guest(gid)
-            self._load()
 
     def _open_form(self, guest=None):
         dlg = tk.Toplevel(self.frame)
@@ -156,7 +175,6 @@ class GuestsPage:
             else:
                 add_guest(name, v_phone.get(), v_email.get(), v_nid.get(), v_addr.get())
             dlg.destroy()
-            self._load()
 
         tk.Button(form, text="💾  Save Guest", font=("Arial", 12, "bold"),
                   bg=SUCCESS, fg=TEXT, relief="flat", cursor="hand2", pady=10,
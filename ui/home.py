@@ -3,7 +3,9 @@ Hotel Management System - Home Page (Overview)
 """
 import tkinter as tk
 from tkinter import ttk
-from database import get_dashboard_stats, get_active_bookings
+from database import get_dashboard_stats, get_bookings_page, count_bookings, get_bookings_by_ids
+from ui.paged_table import PagedTable
+import events
 
 BG    = "#0f172a"
 CARD  = "#1e293b"
@@ -32,7 +34,9 @@ class HomePage:
         tk.Label(frame, text="📋  Today's Active Bookings", font=("Arial", 13, "bold"),
                  bg=BG, fg=TEXT).pack(anchor="w", pady=(10, 6))
 
-        cols = ("Room", "Guest", "Phone", "Check-In", "Check-Out", "Nights", "Amount")
+        cols = [("Room", 80, "room"), ("Guest", 160, "guest"), ("Phone", 120, None),
+                ("Check-In", 110, "check_in"), ("Check-Out", 110, "check_out"),
+                ("Nights", 60, "nights"), ("Amount", 100, "amount")]
         style = ttk.Style()
         style.theme_use("clam")
         style.configure("Dark.Treeview", background=CARD, foreground=TEXT,
@@ -41,26 +45,36 @@ class HomePage:
                         font=("Arial", 10, "bold"))
         style.map("Dark.Treeview", background=[("selected", ACCENT)])
 
-        tree = ttk.Treeview(frame, columns=cols, show="headings",
-                            style="Dark.Treeview", height=10)
-        widths = [80, 160, 120, 110, 110, 60, 100]
-        for col, w in zip(cols, widths):
-            tree.heading(col, text=col)
-            tree.column(col, width=w, anchor="center")
-
-        bookings = get_active_bookings()
-        for b in bookings:
-            tree.insert("", "end", values=(
+        self.table = table = PagedTable(
+            frame, cols,
+            lambda after, limit, sort, desc: get_bookings_page(after, limit, sort, desc, status="active"),
+            lambda: count_bookings("active"),
+            lambda b: ((
                 b["room_number"], b["guest_name"], b["phone"] or "-",
                 b["check_in"], b["check_out"], b["nights"],
                 f"৳{b['total_amount']:,.0f}"
-            ))
+            ), ()),
+            "Dark.Treeview", sort="check_in", height=10,
+            fetch_rows=lambda ids: get_bookings_by_ids(ids, status="active"))
+        table.frame.pack(fill="both", expand=True)
+        self.empty_lbl = tk.Label(frame, text="No active bookings today.",
+                                  font=("Arial", 11), bg=BG, fg=MUTED)
+        self.refresh()
+        events.subscribe(("bookings", "rooms", "guests"), self.on_changes, widget=frame)
+
+    def refresh(self):
+        self.table.refresh()
+        self._show_empty()
 
-        sb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=sb.set)
-        tree.pack(side="left", fill="both", expand=True)
-        sb.pack(side="left", fill="y")
+    def on_changes(self, changes):
+        if events.needs_reload(changes, "bookings"):
+            self.table.refresh()
+        else:
+            self.table.update_rows(events.booking_ids(changes, self.table.rows.values()))
+        self._show_empty()
 
-        if not bookings:
-            tk.Label(frame, text="No active bookings today.",
-                     font=("Arial", 11), bg=BG, fg=MUTED).pack(pady=10)
+    def _show_empty(self):
+        if self.table.rows:
+            self.empty_lbl.pack_forget()
+        else:
+            self.empty_lbl.pack(pady=10)
@@ -0,0 +1,168 @@
+"""
+Hotel Management System - Paged Table
+Treeview that pulls rows from a keyset-paginated query as the user scrolls,
+with a total-count line and click-to-sort headings done in SQL.
+"""
+import tkinter as tk
+from tkinter import ttk
+from ui.table_sync import TreeSync
+from ui import profiler
+
+BG    = "#0f172a"
+MUTED = "#94a3b8"
+
+PAGE_SIZE = 100
+
+
+class PagedTable:
+    """
+    columns:    [(heading, width, sort_key or None), ...]
+    fetch_page: fetch_page(after, limit, sort, descending) -> (rows, next_cursor)
+    count:      count() -> total number of rows
+    row_values: row_values(row) -> (values, tags); rows are keyed by row["id"]
+    fetch_rows: fetch_rows(ids) -> the rows among ids that belong in the table
+
+    Only the rows scrolled into view so far are kept, both in the tree and
+    in self.rows. show_rows() switches to a fixed result set (e.g. search
+    hits); reload() goes back to paging from the top; refresh() re-reads
+    the loaded range and patches only the rows that changed; update_rows()
+    re-reads just the given rows.
+    """
+
+    def __init__(self, parent, columns, fetch_page, count, row_values, style,
+                 sort=None, descending=False, height=14, page_size=PAGE_SIZE,
+                 fetch_rows=None):
+        self.fetch_page = fetch_page
+        self.fetch_rows = fetch_rows
+        self.count = count
+        self.row_values = row_values
+        self.sort = sort
+        self.descending = descending
+        self.page_size = page_size
+        self.rows = {}
+        self._headings = {}
+        self._cursor = None
+        self._paged = False
+        self._loading = False
+
+        self.frame = tk.Frame(parent, bg=BG)
+        t_frame = tk.Frame(self.frame, bg=BG)
+        t_frame.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(t_frame, columns=[c[0] for c in columns], show="headings",
+                                 style=style, height=height)
+        for heading, width, key in columns:
+            self._headings[key] = heading
+            cmd = (lambda k=key: self._sort_by(k)) if key else ""
+            self.tree.heading(heading, text=heading, command=cmd)
+            self.tree.column(heading, width=width, anchor="center")
+        self.sb = ttk.Scrollbar(t_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.sb.pack(side="left", fill="y")
+        self.sync = TreeSync(self.tree, row_values)
+
+        self.count_lbl = tk.Label(self.frame, text="", font=("Arial", 9), bg=BG, fg=MUTED)
+        self.count_lbl.pack(anchor="w", pady=(4, 0))
+        self._mark_sort()
+
+    # ── Public API ──────────────────────────────────────────────────────────
+    def reload(self):
+        """Drop loaded rows and page in from the top again."""
+        self._clear()
+        self._paged = True
+        self._cursor = None
+        self._total = self.count()
+        self._load_page()
+
+    @profiler.timed("table:refresh")
+    def refresh(self):
+        """Re-read the rows already loaded; keeps scroll position and selection."""
+        if not self._paged:
+            self.reload()
+            return
+        rows, self._cursor = self.fetch_page(None, max(len(self.rows), self.page_size),
+                                             self.sort, self.descending)
+        self._total = self.count()
+        self.rows = {r["id"]: r for r in rows}
+        self.sync.apply(rows)
+        self._update_count()
+
+    def show_rows(self, rows):
+        """Show a fixed, already ranked result set (search hits) instead of paging."""
+        self._paged = False
+        self.rows = {r["id"]: r for r in rows}
+        self.sync.apply(rows)
+        self.count_lbl.config(text=f"{len(rows):,} matching")
+
+    def update_rows(self, ids):
+        """
+        Re-read the shown rows among `ids` and patch them; rows no longer
+        returned by fetch_rows (deleted, or e.g. no longer active) go away.
+        Without fetch_rows the paged view re-reads its loaded range instead.
+        """
+        shown = [i for i in ids if i in self.rows]
+        if not shown:
+            return
+        if self.fetch_rows is None:
+            if self._paged:
+                self.refresh()
+            return
+        rows = {r["id"]: r for r in self.fetch_rows(shown)}
+        gone = [i for i in shown if i not in rows]
+        for i in gone:
+            del self.rows[i]
+        self.rows.update(rows)
+        self.sync.patch(rows.values(), gone)
+        if self._paged:
+            if gone:
+                self._total = self.count()
+            self._update_count()
+        else:
+            self.count_lbl.config(text=f"{len(self.rows):,} matching")
+
+    def row(self, iid):
+        return self.rows.get(int(iid))
+
+    def selected_id(self):
+        sel = self.tree.selection()
+        return int(sel[0]) if sel else None
+
+    # ── Internals ───────────────────────────────────────────────────────────
+    def _clear(self):
+        self.sync.clear()
+        self.rows.clear()
+
+    @profiler.timed("table:load_page")
+    def _load_page(self):
+        rows, self._cursor = self.fetch_page(self._cursor, self.page_size,
+                                             self.sort, self.descending)
+        self.rows.update((r["id"], r) for r in rows)
+        self.sync.append(rows)
+        self._update_count()
+        self._loading = False
+
+    def _update_count(self):
+        self.count_lbl.config(text=f"Showing {len(self.rows):,} of {self._total:,}")
+
+    def _on_scroll(self, first, last):
+        self.sb.set(first, last)
+        # Near the bottom (or the view is not full yet): fetch the next page.
+        if self._paged and self._cursor is not None and not self._loading and float(last) > 0.9:
+            self._loading = True
+            self.tree.after_idle(self._load_page)
+
+    def _sort_by(self, key):
+        if not self._paged:     # search hits keep their ranking
+            return
+        if key == self.sort:
+            self.descending = not self.descending
+        else:
+            self.sort, self.descending = key, False
+        self._mark_sort()
+        self.reload()
+
+    def _mark_sort(self):
+        for key, heading in self._headings.items():
+            arrow = (" ▼" if self.descending else " ▲") if key == self.sort and key else ""
+            self.tree.heading(heading, text=heading + arrow)
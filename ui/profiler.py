@@ -0,0 +1,199 @@
+"""
+Hotel Management System - UI responsiveness monitor
+A heartbeat `after` callback notices when the Tk main loop was blocked
+(a stall) and a watchdog thread samples what the Tk thread was doing at
+the time: the innermost labelled activity (page build, handler) and the
+line of project code it was on. Page builds and labelled handlers are
+timed; with a profile directory, the slowest run of each is also captured
+with cProfile and written there as <label>.prof (open with pstats or
+snakeviz).
+
+    profiler.install(root)                  # once, from the Dashboard
+    with profiler.activity("page:rooms", kind="page"):
+        RoomsPage(...)
+
+    @profiler.timed("rooms:build_grid")
+    def _build_grid(self): ...
+
+HOTEL_UI_STALL_MS sets the stall threshold (default 200 ms) and
+HOTEL_UI_PROFILE=<dir> turns on the cProfile captures.
+"""
+import contextlib
+import cProfile
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+HEARTBEAT_MS = 50
+STALL_MS = float(os.environ.get("HOTEL_UI_STALL_MS", 200))
+PROFILE_DIR = os.environ.get("HOTEL_UI_PROFILE") or None
+STALLS_KEEP = 100
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_lock = threading.Lock()
+_stack = []             # labels of the activities running on the Tk thread
+_stats = {"page": {}, "handler": {}}
+_stalls = []
+_profiled = {}          # label -> seconds of the run saved as <label>.prof
+_profiling = False
+_monitor = None
+
+
+class _Timing:
+    __slots__ = ("count", "seconds", "max", "last")
+
+    def __init__(self):
+        self.count, self.seconds, self.max, self.last = 0, 0.0, 0.0, 0.0
+
+    def snapshot(self):
+        return {"count": self.count, "total_ms": round(self.seconds * 1000, 1),
+                "mean_ms": round(self.seconds * 1000 / self.count, 1) if self.count else 0,
+                "max_ms": round(self.max * 1000, 1), "last_ms": round(self.last * 1000, 1)}
+
+
+@contextlib.contextmanager
+def activity(label, kind="handler"):
+    """Time the block as `label` (kind "page" or "handler"); stalls inside are blamed on it."""
+    global _profiling
+    profile = None
+    if PROFILE_DIR and not _profiling:
+        profile, _profiling = cProfile.Profile(), True
+    _stack.append(label)
+    start = time.perf_counter()
+    if profile:
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile:
+            profile.disable()
+            _profiling = False
+        seconds = time.perf_counter() - start
+        _stack.pop()
+        with _lock:
+            t = _stats[kind].get(label)
+            if t is None:
+                t = _stats[kind][label] = _Timing()
+            t.count += 1
+            t.seconds += seconds
+            t.last = seconds
+            t.max = max(t.max, seconds)
+        if profile and seconds > _profiled.get(label, 0):
+            _profiled[label] = seconds
+            _dump(profile, label)
+
+
+def timed(label=None, kind="handler"):
+    """Decorator form of activity(); the label defaults to the function's qualified name."""
+    def wrap(fn):
+        name = label or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with activity(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return wrap
+
+
+def _dump(profile, label):
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profile.dump_stats(os.path.join(PROFILE_DIR, re.sub(r"[^\w.-]+", "_", label) + ".prof"))
+    except OSError:
+        pass
+
+
+def _where(frame):
+    """Innermost line of project code (not this module, not the stdlib) in a stack."""
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if (path.startswith(_ROOT) and path != __file__
+                and os.sep + "site-packages" + os.sep not in path):
+            return f"{os.path.relpath(path, _ROOT)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "?"
+
+
+class Monitor:
+    """Heartbeat on the Tk thread plus a watchdog thread that samples it when late."""
+
+    def __init__(self, root, heartbeat_ms=HEARTBEAT_MS, stall_ms=STALL_MS):
+        self.root = root
+        self.heartbeat = heartbeat_ms / 1000
+        self.stall = stall_ms / 1000
+        self._thread_id = threading.get_ident()
+        self._due = time.perf_counter() + self.heartbeat
+        self._sample = None
+        self._running = True
+        root.after(heartbeat_ms, self._tick)
+        threading.Thread(target=self._watch, name="ui-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._running = False
+
+    def _tick(self):
+        if not self._running:
+            return
+        now = time.perf_counter()
+        late = now - self._due
+        with _lock:
+            sample, self._sample = self._sample, None
+        if late >= self.stall:
+            activity, where = sample or ("unknown", "?")
+            entry = {"at": datetime.now().isoformat(timespec="seconds"),
+                     "ms": round(late * 1000), "activity": activity, "where": where}
+            with _lock:
+                _stalls.append(entry)
+                del _stalls[:-STALLS_KEEP]
+        self._due = now + self.heartbeat
+        try:
+            self.root.after(int(self.heartbeat * 1000), self._tick)
+        except Exception:       # window destroyed
+            self._running = False
+
+    def _watch(self):
+        while self._running:
+            time.sleep(self.heartbeat)
+            if time.perf_counter() - self._due < self.stall or self._sample is not None:
+                continue
+            frame = sys._current_frames().get(self._thread_id)
+            label = _stack[-1] if _stack else "unlabelled"
+            with _lock:
+                if self._sample is None:
+                    self._sample = (label, _where(frame))
+
+
+def install(root, **kwargs):
+    """Start (or restart, for a new root window) the stall monitor."""
+    global _monitor
+    if _monitor is not None:
+        _monitor.stop()
+    _monitor = monitor = Monitor(root, **kwargs)
+    root.bind("<Destroy>", lambda e: e.widget is root and monitor.stop(), add="+")
+    return monitor
+
+
+def snapshot():
+    """Page build and handler timings (slowest first) and recent stalls, newest last."""
+    def table(stats):
+        items = sorted(stats.items(), key=lambda kv: kv[1].max, reverse=True)
+        return {name: t.snapshot() for name, t in items}
+
+    with _lock:
+        return {"stall_ms": STALL_MS, "profile_dir": PROFILE_DIR,
+                "pages": table(_stats["page"]), "handlers": table(_stats["handler"]),
+                "stalls": list(_stalls),
+                "profiles": {k: round(v * 1000, 1) for k, v in _profiled.items()}}
+
+
+def reset():
+    with _lock:
+        for stats in _stats.values():
+            stats.clear()
+        _stalls.clear()
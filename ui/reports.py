@@ -4,10 +4,14 @@ Daily/Monthly revenue and occupancy statistics.
 """
 import tkinter as tk
 from tkinter import ttk, filedialog
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database import get_revenue_report, get_dashboard_stats
+import events
+import export
+from ui.table_sync import TreeSync
 
 BG      = "#0f172a"
 CARD    = "#1e293b"
@@ -19,6 +23,11 @@ DANGER  = "#ef4444"
 WARNING = "#f59e0b"
 BORDER  = "#334155"
 
+# One long-lived worker, so exports reuse its database connection.
+_export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+STATUSES = {"bookings": ("", "active", "checked_out", "cancelled"),
+            "invoices": ("", "paid", "partial", "unpaid")}
+
 
 class ReportsPage:
     def __init__(self, parent, user):
@@ -33,21 +42,9 @@ class ReportsPage:
                  font=("Arial", 11), bg=BG, fg=MUTED).pack(anchor="w", pady=(4, 16))
 
         # Quick stats
-        s = get_dashboard_stats()
-        stat_row = tk.Frame(self.frame, bg=BG)
-        stat_row.pack(fill="x", pady=(0, 16))
-        quick_stats = [
-            ("🛏 Total Rooms",   s["total_rooms"],        ACCENT),
-            ("🔴 Booked Now",    s["booked"],             DANGER),
-            ("🟢 Available",     s["available"],          SUCCESS),
-            ("👥 Total Guests",  s["total_guests"],       "#a855f7"),
-            ("💰 Today",        f"৳{s['today_revenue']:,.0f}", SUCCESS),
-        ]
-        for label, val, color in quick_stats:
-            c = tk.Frame(stat_row, bg=CARD, padx=18, pady=10)
-            c.pack(side="left", padx=(0, 12))
-            tk.Label(c, text=str(val), font=("Arial", 20, "bold"), bg=CARD, fg=color).pack()
-            tk.Label(c, text=label, font=("Arial", 9), bg=CARD, fg=MUTED).pack()
+        self.stat_row = tk.Frame(self.frame, bg=BG)
+        self.stat_row.pack(fill="x", pady=(0, 16))
+        self._build_stats()
 
         # Date range selector
         dr = tk.Frame(self.frame, bg=BG)
@@ -69,6 +66,9 @@ class ReportsPage:
         tk.Button(dr, text="💾 Export TXT", font=("Arial", 10),
                   bg=SUCCESS, fg=TEXT, relief="flat", cursor="hand2", padx=10, pady=4,
                   command=self._export).pack(side="left", padx=4)
+        tk.Button(dr, text="⬇ Export Data", font=("Arial", 10),
+                  bg=CARD, fg=TEXT, relief="flat", cursor="hand2", padx=10, pady=4,
+                  command=self._export_data_dialog).pack(side="left", padx=4)
 
         # Shortcut buttons
         shortcuts = tk.Frame(self.frame, bg=BG)
@@ -99,6 +99,10 @@ class ReportsPage:
         self.tree.configure(yscrollcommand=sb.set)
         self.tree.pack(side="left", fill="both", expand=True)
         sb.pack(side="left", fill="y")
+        self.sync = TreeSync(self.tree, lambda r: ((
+            r["date"], r["bookings"],
+            f"৳{r['revenue'] or 0:,.2f}", f"৳{r['collected'] or 0:,.2f}"
+        ), ()), key="date")
 
         # Total label
         self.total_lbl = tk.Label(self.frame, text="",
@@ -106,6 +110,33 @@ class ReportsPage:
         self.total_lbl.pack(anchor="w", pady=6)
 
         self._generate()
+        # daily_revenue follows bookings and the cards count rooms and guests;
+        # both are a few indexed queries, so any change simply re-reads them.
+        events.subscribe(("bookings", "rooms", "guests"), self.on_changes, widget=self.frame)
+
+    def refresh(self):
+        self._build_stats()
+        self._generate()
+
+    def on_changes(self, changes):
+        self.refresh()
+
+    def _build_stats(self):
+        for child in self.stat_row.winfo_children():
+            child.destroy()
+        s = get_dashboard_stats()
+        quick_stats = [
+            ("🛏 Total Rooms",   s["total_rooms"],        ACCENT),
+            ("🔴 Booked Now",    s["booked"],             DANGER),
+            ("🟢 Available",     s["available"],          SUCCESS),
+            ("👥 Total Guests",  s["total_guests"],       "#a855f7"),
+            ("💰 Today",        f"৳{s['today_revenue']:,.0f}", SUCCESS),
+        ]
+        for label, val, color in quick_stats:
+            c = tk.Frame(self.stat_row, bg=CARD, padx=18, pady=10)
+            c.pack(side="left", padx=(0, 12))
+            tk.Label(c, text=str(val), font=("Arial", 20, "bold"), bg=CARD, fg=color).pack()
+            tk.Label(c, text=label, font=("Arial", 9), bg=CARD, fg=MUTED).pack()
 
     def _shortcut(self, delta, label):
         today = date.today()
@@ -118,24 +149,24 @@ class ReportsPage:
         self._generate()
 
     def _generate(self):
-        self.tree.delete(*self.tree.get_children())
+        rng = (self.from_var.get(), self.to_var.get())
         try:
-            rows = get_revenue_report(self.from_var.get(), self.to_var.get())
+            rows = get_revenue_report(*rng)
         except Exception:
+            self.report = (rng, [])
+            self.sync.apply([])
             return
-        total_rev = 0; total_col = 0
-        for r in rows:
-            rev = r["revenue"] or 0; col = r["collected"] or 0
-            total_rev += rev; total_col += col
-            self.tree.insert("", "end", values=(
-                r["date"], r["bookings"],
-                f"৳{rev:,.2f}", f"৳{col:,.2f}"
-            ))
+        self.report = (rng, rows)   # reused by _export
+        self.sync.apply(rows)
+        total_rev = sum(r["revenue"] or 0 for r in rows)
+        total_col = sum(r["collected"] or 0 for r in rows)
         self.total_lbl.config(
             text=f"Total Revenue: ৳{total_rev:,.2f}  |  Total Collected: ৳{total_col:,.2f}")
 
     def _export(self):
-        rows = get_revenue_report(self.from_var.get(), self.to_var.get())
+        if self.report[0] != (self.from_var.get(), self.to_var.get()):
+            self._generate()
+        rows = self.report[1]
         if not rows:
             from tkinter import messagebox
             messagebox.showinfo("No Data", "No data for selected range."); return
@@ -155,3 +186,100 @@ class ReportsPage:
             with open(path, "w", encoding="utf-8") as f: f.write("\n".join(lines))
             from tkinter import messagebox
             messagebox.showinfo("Saved", f"Report saved:\n{path}")
+
+    def _export_data_dialog(self):
+        """Stream bookings/guests/invoices/revenue for the selected dates to CSV or JSONL."""
+        dlg = tk.Toplevel(self.frame)
+        dlg.title("Export Data")
+        dlg.configure(bg=CARD)
+        dlg.geometry("420x360")
+        dlg.resizable(False, False)
+        dlg.grab_set()
+
+        tk.Label(dlg, text="⬇  Export Data", font=("Arial", 16, "bold"),
+                 bg=CARD, fg=TEXT).pack(pady=(20, 4))
+        tk.Label(dlg, text=f"{self.from_var.get()}  →  {self.to_var.get()}",
+                 font=("Arial", 10), bg=CARD, fg=MUTED).pack()
+
+        form = tk.Frame(dlg, bg=CARD, padx=30)
+        form.pack(fill="both", expand=True)
+
+        def combo(label, values, default):
+            tk.Label(form, text=label, font=("Arial", 10, "bold"),
+                     bg=CARD, fg=MUTED, anchor="w").pack(fill="x", pady=(10, 2))
+            var = tk.StringVar(value=default)
+            cb = ttk.Combobox(form, values=values, textvariable=var,
+                              font=("Arial", 11), state="readonly")
+            cb.pack(fill="x", ipady=3)
+            return var, cb
+
+        kind_var, _ = combo("Data", list(export.EXPORTS), "bookings")
+        fmt_var, _ = combo("Format", list(export.FORMATS), "csv")
+        status_var, status_cb = combo("Status", STATUSES["bookings"], "")
+        kind_var.trace_add("write", lambda *a: (
+            status_cb.configure(values=STATUSES.get(kind_var.get(), ("",))), status_var.set("")))
+
+        bar = ttk.Progressbar(form, mode="determinate")
+        bar.pack(fill="x", pady=(16, 4))
+        msg = tk.Label(form, text="", font=("Arial", 9), bg=CARD, fg=MUTED)
+        msg.pack(anchor="w")
+
+        job = {"done": 0, "stop": False}
+
+        def progress(done):
+            job["done"] = done          # read by poll() on the Tk thread
+            return not job["stop"]
+
+        def run(kind, path, fmt, filters):
+            total = export.count_rows(kind, **filters)
+            job["total"] = total
+            return export.export_file(kind, path, fmt, progress=progress, **filters)
+
+        def poll(future, path):
+            if not dlg.winfo_exists():
+                return
+            total = job.get("total")
+            if total:
+                bar.configure(maximum=total, value=job["done"])
+                msg.config(text=f"{job['done']:,} / {total:,} rows")
+            if not future.done():
+                dlg.after(100, poll, future, path)
+                return
+            go_btn.config(state="normal")
+            try:
+                n = future.result()
+            except Exception as e:
+                msg.config(text=f"Export failed: {e}", fg=DANGER)
+                return
+            state = "Stopped after" if job["stop"] else "Saved"
+            msg.config(text=f"{state} {n:,} rows → {os.path.basename(path)}", fg=SUCCESS)
+
+        def start():
+            kind, fmt = kind_var.get(), fmt_var.get()
+            path = filedialog.asksaveasfilename(
+                parent=dlg, defaultextension="." + fmt, initialfile=f"{kind}.{fmt}",
+                filetypes=[(fmt.upper(), "*." + fmt), ("All", "*.*")])
+            if not path:
+                return
+            filters = dict(from_date=self.from_var.get() or None,
+                           to_date=self.to_var.get() or None,
+                           status=status_var.get() or None)
+            job.update(done=0, stop=False, total=None)
+            go_btn.config(state="disabled")
+            msg.config(text="Counting rows…", fg=MUTED)
+            poll(_export_pool.submit(run, kind, path, fmt, filters), path)
+
+        def close():
+            job["stop"] = True          # the worker stops after its current batch
+            dlg.destroy()
+
+        btns = tk.Frame(dlg, bg=CARD)
+        btns.pack(pady=14)
+        go_btn = tk.Button(btns, text="Export…", font=("Arial", 10, "bold"),
+                           bg=SUCCESS, fg=TEXT, relief="flat", cursor="hand2", padx=14, pady=4,
+                           command=start)
+        go_btn.pack(side="left", padx=6)
+        tk.Button(btns, text="Close", font=("Arial", 10),
+                  bg=BORDER, fg=TEXT, relief="flat", cursor="hand2", padx=14, pady=4,
+                  command=close).pack(side="left", padx=6)
+        dlg.protocol("WM_DELETE_WINDOW", close)
@@ -0,0 +1,153 @@
+"""
+Hotel Management System - Room Map
+Every room drawn on a single Canvas (one rectangle + four text items per
+room), grouped by floor, with hit-testing, hover and click handling.
+A status change recolours just that room's items.
+"""
+import bisect
+import tkinter as tk
+from tkinter import ttk
+
+BG    = "#0f172a"
+TEXT  = "#f1f5f9"
+MUTED = "#94a3b8"
+
+STATUS_COLOR = {
+    "available":   "#10b981",
+    "booked":      "#ef4444",
+    "maintenance": "#f59e0b",
+}
+FLOOR_LABEL = {1: "Floor 1 — Standard", 2: "Floor 2 — Deluxe", 3: "Floor 3 — Suite"}
+
+CARD    = 110       # card width/height
+GAP     = 16
+PAD     = 8
+HEADER  = 44        # floor title band
+COLUMNS = 10        # cards per row before wrapping
+
+
+class RoomMap:
+    """
+    rm = RoomMap(parent, on_click=self._room_detail)
+    rm.draw(get_all_rooms())        # full layout
+    rm.update_room(room)            # recolour / relabel one room in place
+    rm.sync(get_all_rooms())        # patch changed rooms, relayout only if the set changed
+    """
+
+    def __init__(self, parent, on_click=None, columns=COLUMNS):
+        self.on_click = on_click
+        self.columns = columns
+        self.rooms = {}         # room id -> room dict as drawn
+        self._items = {}        # room id -> (rect, icon, number, type, price)
+        self._bands = []        # y of each card row, sorted (for bisect)
+        self._band_rooms = []   # room ids in each card row, left to right
+        self._hover = None
+
+        self.frame = tk.Frame(parent, bg=BG)
+        self.canvas = tk.Canvas(self.frame, bg=BG, highlightthickness=0)
+        sb = ttk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=sb.set)
+        sb.pack(side="right", fill="y")
+        self.canvas.pack(fill="both", expand=True)
+
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", lambda e: self._set_hover(None))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>",
+                         lambda e: self.canvas.yview_scroll(-1 * (e.delta // 120), "units"))
+
+    # ── Drawing ─────────────────────────────────────────────────────────────
+    def draw(self, rooms):
+        c = self.canvas
+        c.delete("all")
+        self.rooms.clear()
+        self._items.clear()
+        self._bands, self._band_rooms = [], []
+        self._hover = None
+
+        floors = {}
+        for r in rooms:
+            floors.setdefault(r["floor"], []).append(r)
+
+        y = 0
+        for floor in sorted(floors):
+            c.create_text(PAD, y + 26, anchor="w", fill=MUTED, font=("Arial", 12, "bold"),
+                          text=f"  🏢  {FLOOR_LABEL.get(floor, f'Floor {floor}')}")
+            y += HEADER
+            floor_rooms = floors[floor]
+            for start in range(0, len(floor_rooms), self.columns):
+                row = floor_rooms[start:start + self.columns]
+                self._bands.append(y)
+                self._band_rooms.append([r["id"] for r in row])
+                for col, room in enumerate(row):
+                    self._draw_room(room, PAD + col * (CARD + GAP), y)
+                y += CARD + GAP
+        c.configure(scrollregion=(0, 0, PAD + self.columns * (CARD + GAP), y))
+
+    def _draw_room(self, room, x, y):
+        c = self.canvas
+        cx = x + CARD // 2
+        rect = c.create_rectangle(x, y, x + CARD, y + CARD, width=0,
+                                  fill=STATUS_COLOR.get(room["status"], "#334155"))
+        icon = c.create_text(cx, y + 28, text="🏠", font=("Arial", 20), fill=TEXT)
+        number = c.create_text(cx, y + 58, font=("Arial", 10, "bold"), fill=TEXT)
+        rtype = c.create_text(cx, y + 76, font=("Arial", 8), fill=TEXT)
+        price = c.create_text(cx, y + 92, font=("Arial", 9), fill=TEXT)
+        self._items[room["id"]] = (rect, icon, number, rtype, price)
+        self._label(room)
+
+    def _label(self, room):
+        rect, _, number, rtype, price = self._items[room["id"]]
+        c = self.canvas
+        c.itemconfigure(rect, fill=STATUS_COLOR.get(room["status"], "#334155"))
+        c.itemconfigure(number, text=f"Room {room['room_number']}")
+        c.itemconfigure(rtype, text=room["room_type"])
+        c.itemconfigure(price, text=f"৳{room['price_per_night']:,.0f}")
+        self.rooms[room["id"]] = dict(room)
+
+    def update_room(self, room):
+        """Redraw one room's colour and labels; other rooms are untouched."""
+        if room["id"] in self._items and self.rooms[room["id"]] != room:
+            self._label(room)
+
+    def sync(self, rooms):
+        """Apply a fresh room list: patch changed rooms, full relayout only if rooms
+        were added/removed or moved floor."""
+        layout = {r["id"]: r["floor"] for r in rooms}
+        if layout != {i: r["floor"] for i, r in self.rooms.items()}:
+            self.draw(rooms)
+            return
+        for r in rooms:
+            self.update_room(r)
+
+    # ── Hit-testing & events ────────────────────────────────────────────────
+    def room_at(self, x, y):
+        """Room id under canvas coordinates (x, y), or None (gaps and headers miss)."""
+        i = bisect.bisect_right(self._bands, y) - 1
+        if i < 0 or y - self._bands[i] > CARD:
+            return None
+        col, off = divmod(x - PAD, CARD + GAP)
+        if col < 0 or off > CARD or col >= len(self._band_rooms[i]):
+            return None
+        return self._band_rooms[i][int(col)]
+
+    def _event_room(self, e):
+        return self.room_at(self.canvas.canvasx(e.x), self.canvas.canvasy(e.y))
+
+    def _on_motion(self, e):
+        self._set_hover(self._event_room(e))
+
+    def _set_hover(self, room_id):
+        if room_id == self._hover:
+            return
+        if self._hover in self._items:
+            self.canvas.itemconfigure(self._items[self._hover][0], width=0)
+        if room_id is not None:
+            self.canvas.itemconfigure(self._items[room_id][0], outline=TEXT, width=2)
+        self.canvas.configure(cursor="hand2" if room_id is not None else "")
+        self._hover = room_id
+
+    def _on_click(self, e):
+        room_id = self._event_room(e)
+        if room_id is not None and self.on_click:
+            self.on_click(self.rooms[room_id])
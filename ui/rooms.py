@@ -4,7 +4,10 @@ Visual grid of room cards: Green=Available, Red=Booked, Yellow=Maintenance
 """
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from database import get_all_rooms, update_room_status, update_room
+from database import get_all_rooms, get_room, update_room_status, update_room
+from ui.room_map import RoomMap
+import events
+from ui import profiler
 
 BG      = "#0f172a"
 CARD    = "#1e293b"
@@ -29,10 +32,9 @@ STATUS_LABEL = {
 
 
 class RoomsPage:
-    def __init__(self, parent, user, refresh_cb=None):
+    def __init__(self, parent, user):
         self.parent = parent
         self.user = user
-        self.refresh_cb = refresh_cb
 
         self.frame = tk.Frame(parent, bg=BG)
         self.frame.pack(fill="both", expand=True, padx=24, pady=20)
@@ -40,6 +42,7 @@ class RoomsPage:
         self._build_header()
         self._build_legend()
         self._build_grid()
+        events.subscribe(("rooms",), self.on_changes, widget=self.frame)
 
     def _build_header(self):
         hdr = tk.Frame(self.frame, bg=BG)
@@ -48,7 +51,7 @@ class RoomsPage:
                  bg=BG, fg=TEXT).pack(side="left")
         tk.Button(hdr, text="🔄 Refresh", font=("Arial", 10),
                   bg=ACCENT, fg=TEXT, relief="flat", cursor="hand2",
-                  command=self._refresh, padx=10, pady=4).pack(side="right")
+                  command=self.refresh, padx=10, pady=4).pack(side="right")
         tk.Label(self.frame, text="Click any room card to view details or change status.",
                  font=("Arial", 11), bg=BG, fg=MUTED).pack(anchor="w", pady=(4, 10))
 
@@ -60,66 +63,11 @@ class RoomsPage:
                            font=("Arial", 10, "bold"), bg=BG, fg=bg)
             dot.pack(side="left", padx=10)
 
+    @profiler.timed("rooms:build_grid")
     def _build_grid(self):
-        # Scrollable canvas
-        canvas = tk.Canvas(self.frame, bg=BG, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=canvas.yview)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
-        canvas.pack(fill="both", expand=True)
-
-        self.grid_frame = tk.Frame(canvas, bg=BG)
-        window = canvas.create_window((0, 0), window=self.grid_frame, anchor="nw")
-
-        def _on_configure(e):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-        self.grid_frame.bind("<Configure>", _on_configure)
-
-        canvas.bind("<MouseWheel>", lambda e: canvas.yview_scroll(-1*(e.delta//120), "units"))
-
-        rooms = get_all_rooms()
-        # Group by floor
-        floors = {}
-        for r in rooms:
-            floors.setdefault(r["floor"], []).append(r)
-
-        for floor in sorted(floors.keys()):
-            floor_rooms = floors[floor]
-            floor_label = {1: "Floor 1 — Standard", 2: "Floor 2 — Deluxe", 3: "Floor 3 — Suite"}
-            tk.Label(self.grid_frame, text=f"  🏢  {floor_label.get(floor, f'Floor {floor}')}",
-                     font=("Arial", 12, "bold"), bg=BG, fg=MUTED).grid(
-                         row=(floor-1)*3, column=0, columnspan=10,
-                         sticky="w", pady=(14, 4), padx=8)
-            for i, room in enumerate(floor_rooms):
-                self._room_card(room, row=(floor-1)*3+1, col=i)
-
-    def _room_card(self, room, row, col):
-        status = room["status"]
-        bg_color, _ = STATUS_COLOR.get(status, ("#334155", TEXT))
-
-        card = tk.Frame(self.grid_frame, bg=bg_color, width=110, height=110,
-                        cursor="hand2", relief="flat")
-        card.grid(row=row, column=col, padx=8, pady=6, sticky="nsew")
-        card.pack_propagate(False)
-
-        tk.Label(card, text=f"🏠", font=("Arial", 20), bg=bg_color, fg=TEXT).pack(pady=(12, 0))
-        tk.Label(card, text=f"Room {room['room_number']}", font=("Arial", 10, "bold"),
-                 bg=bg_color, fg=TEXT).pack()
-        tk.Label(card, text=room["room_type"], font=("Arial", 8),
-                 bg=bg_color, fg=TEXT).pack()
-        tk.Label(card, text=f"৳{room['price_per_night']:,.0f}", font=("Arial", 9),
-                 bg=bg_color, fg=TEXT).pack()
-
-        for widget in [card] + card.winfo_children():
-            widget.bind("<Button-1>", lambda e, r=room: self._room_detail(r))
-
-        # Hover effect
-        def on_enter(e, f=card, c=bg_color):
-            f.config(highlightbackground=TEXT, highlightthickness=2, relief="solid")
-        def on_leave(e, f=card, c=bg_color):
-            f.config(highlightthickness=0, relief="flat")
-        card.bind("<Enter>", on_enter)
-        card.bind("<Leave>", on_leave)
+        self.room_map = RoomMap(self.frame, on_click=self._room_detail)
+        self.room_map.frame.pack(fill="both", expand=True)
+        self.room_map.draw(get_all_rooms())
 
     def _room_detail(self, room):
         dlg = tk.Toplevel(self.frame)
@@ -161,9 +109,9 @@ class RoomsPage:
         btn_frame = tk.Frame(details, bg=CARD)
         btn_frame.pack(fill="x", pady=16)
 
+        # "Booked" follows the room's bookings; it is not set by hand.
         status_options = [
             ("✅ Available", "available", SUCCESS),
-            ("🔴 Booked",   "booked",   DANGER),
             ("🟡 Maintenance", "maintenance", WARNING),
         ]
         for label, st, color in status_options:
@@ -175,13 +123,19 @@ class RoomsPage:
     def _change_status(self, room_id, status, dlg):
         update_room_status(room_id, status)
         dlg.destroy()
-        if self.refresh_cb:
-            self.refresh_cb()
-        self._refresh()
 
-    def _refresh(self):
-        for w in self.frame.winfo_children():
-            w.destroy()
-        self._build_header()
-        self._build_legend()
-        self._build_grid()
+    def refresh(self):
+        self.room_map.sync(get_all_rooms())
+
+    def on_changes(self, changes):
+        """Recolour just the changed rooms; added, removed or re-floored rooms redraw the map."""
+        if events.needs_reload(changes, "rooms") or any(c.kind == "delete" for c in changes):
+            self.refresh()
+            return
+        for room_id in {c.id for c in changes}:
+            room = get_room(room_id)
+            shown = self.room_map.rooms.get(room_id)
+            if room is None or shown is None or shown["floor"] != room["floor"]:
+                self.refresh()
+                return
+            self.room_map.update_room(room)
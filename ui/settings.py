@@ -1,13 +1,17 @@
 """
 Hotel Management System - Settings Page
-Hotel info, password change, user management (admin only).
+Hotel info, password change, user management and query statistics (admin only).
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database import get_settings, set_setting, get_all_rooms, update_room
+from database import get_settings, set_settings, get_all_rooms, update_room, subscribe_settings
 from auth import change_password, get_all_users, delete_user
+import events
+import query_stats
+from ui import profiler
+from ui.table_sync import TreeSync
 
 BG      = "#0f172a"
 CARD    = "#1e293b"
@@ -24,7 +28,31 @@ class SettingsPage:
         self.user = user
         self.frame = tk.Frame(parent, bg=BG)
         self.frame.pack(fill="both", expand=True, padx=24, pady=20)
+        self._fields, self._loaded = [], {}
+        self._load_users = None
         self._build()
+        # The Dashboard keeps pages with on_changes() instead of rebuilding
+        # them, so every tab keeps itself current: Hotel Info follows the
+        # settings, Users the users table, Performance reloads when shown.
+        unsubscribe = subscribe_settings(self._on_settings)
+        self.frame.bind("<Destroy>", lambda e: e.widget is self.frame and unsubscribe(), add="+")
+        if self._load_users:
+            events.subscribe(("users",), self.on_changes, widget=self.frame)
+
+    def on_changes(self, changes):
+        """User accounts added, edited or deleted anywhere: reload the list."""
+        self._load_users()
+
+    def _on_settings(self, changed):
+        """
+        Settings saved elsewhere (another terminal, the CLI, this page): show
+        them in the Hotel Info fields, except where the user has unsaved edits.
+        """
+        settings = get_settings()
+        for var, key in self._fields:
+            if key in changed and var.get().strip() in (self._loaded[key], settings.get(key, "")):
+                self._loaded[key] = settings.get(key, "")
+                var.set(self._loaded[key])
 
     def _build(self):
         tk.Label(self.frame, text="⚙  Settings", font=("Arial", 18, "bold"),
@@ -56,6 +84,10 @@ class SettingsPage:
             nb.add(t3, text="  👤 Users  ")
             self._build_users(t3)
 
+            t4 = tk.Frame(nb, bg=CARD)
+            nb.add(t4, text="  📈 Performance  ")
+            self._build_performance(t4)
+
     # ── Hotel Info ──────────────────────────────────────────────────────────
     def _build_hotel_info(self, parent):
         tk.Label(parent, text="Hotel Configuration", font=("Arial", 14, "bold"),
@@ -70,27 +102,41 @@ class SettingsPage:
         def field(label, key):
             tk.Label(form, text=label, font=("Arial", 10, "bold"),
                      bg=CARD, fg=MUTED, anchor="w").pack(fill="x", pady=(8, 2))
-            v = tk.StringVar(value=settings.get(key, ""))
+            self._loaded[key] = settings.get(key, "")
+            v = tk.StringVar(value=self._loaded[key])
             tk.Entry(form, textvariable=v, font=("Arial", 11),
                      bg=BG, fg=TEXT, insertbackground=TEXT, relief="flat",
                      highlightthickness=1, highlightbackground=BORDER).pack(fill="x", ipady=5)
             return v, key
 
-        fields = [
+        fields = self._fields = [
             field("🏨  Hotel Name",   "hotel_name"),
             field("📍  Address",       "hotel_address"),
             field("📞  Phone",         "hotel_phone"),
             field("📧  Email",         "hotel_email"),
             field("💱  Tax Rate (%)",  "tax_rate"),
+            field("🧾  Invoice Prefix", "invoice_prefix"),
+            field("🔁  Invoice Numbering Reset (yearly / never)", "invoice_reset"),
         ]
 
         msg = tk.Label(form, text="", font=("Arial", 10), bg=CARD, fg=SUCCESS)
         msg.pack(pady=(6, 0))
 
         def save():
+            values = {key: var.get().strip() for var, key in fields}
+            values["invoice_reset"] = values["invoice_reset"].lower()
+            if values["invoice_reset"] not in ("yearly", "never"):
+                msg.config(text="⚠  Invoice numbering reset must be 'yearly' or 'never'.", fg=DANGER)
+                return
+            try:
+                set_settings(values)
+            except ValueError:
+                msg.config(text="⚠  Tax rate must be a number, e.g. 7.5", fg=DANGER)
+                return
             for var, key in fields:
-                set_setting(key, var.get())
-            msg.config(text="✅  Settings saved successfully!")
+                self._loaded[key] = values[key]
+                var.set(values[key])
+            msg.config(text="✅  Settings saved successfully!", fg=SUCCESS)
 
         tk.Button(form, text="💾  Save Settings", font=("Arial", 11, "bold"),
                   bg=SUCCESS, fg=TEXT, relief="flat", cursor="hand2", pady=8,
@@ -157,15 +203,16 @@ class SettingsPage:
             tree.column(col, width=150, anchor="center")
         tree.pack(fill="both", expand=True)
 
+        sync = TreeSync(tree, lambda u: ((
+            u["id"], u["username"], u["full_name"] or "-",
+            u["role"].title(),
+            u["created_at"][:10] if u.get("created_at") else "-"
+        ), ()))
+
         def load():
-            tree.delete(*tree.get_children())
-            for u in get_all_users():
-                tree.insert("", "end", iid=u["id"], values=(
-                    u["id"], u["username"], u["full_name"] or "-",
-                    u["role"].title(),
-                    u["created_at"][:10] if u.get("created_at") else "-"
-                ))
+            sync.apply(get_all_users())
         load()
+        self._load_users = load
 
         def del_user():
             sel = tree.selection()
@@ -185,3 +232,101 @@ class SettingsPage:
         tk.Button(act, text="🔄 Refresh", font=("Arial", 10),
                   bg=ACCENT, fg=TEXT, relief="flat", cursor="hand2", padx=10, pady=5,
                   command=load).pack(side="left", padx=6)
+
+    # ── Performance (query statistics) ──────────────────────────────────────
+    def _build_performance(self, parent):
+        tk.Label(parent, text="Database Performance", font=("Arial", 14, "bold"),
+                 bg=CARD, fg=TEXT).pack(pady=(20, 4), padx=30, anchor="w")
+        summary = tk.Label(parent, text="", font=("Arial", 10), bg=CARD, fg=MUTED,
+                           justify="left", anchor="w")
+        summary.pack(padx=30, anchor="w", pady=(0, 8))
+
+        style = ttk.Style()
+        style.configure("Q.Treeview", background=CARD, foreground=TEXT,
+                        fieldbackground=BG, rowheight=24, font=("Arial", 9))
+        style.configure("Q.Treeview.Heading", background=ACCENT, foreground=TEXT,
+                        font=("Arial", 9, "bold"))
+        style.map("Q.Treeview", background=[("selected", "#2563eb")])
+
+        def table(title, cols, widths, height):
+            tk.Label(parent, text=title, font=("Arial", 10, "bold"),
+                     bg=CARD, fg=MUTED).pack(padx=30, anchor="w", pady=(6, 2))
+            frame = tk.Frame(parent, bg=CARD, padx=30)
+            frame.pack(fill="both", expand=True)
+            tree = ttk.Treeview(frame, columns=cols, show="headings",
+                                style="Q.Treeview", height=height)
+            for col, width in zip(cols, widths):
+                tree.heading(col, text=col)
+                tree.column(col, width=width, anchor="w" if width > 150 else "e")
+            sb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+            tree.configure(yscrollcommand=sb.set)
+            tree.pack(side="left", fill="both", expand=True)
+            sb.pack(side="left", fill="y")
+            return tree
+
+        helpers = table("Slowest helpers (total time)",
+                        ("Helper", "Calls", "Total ms", "Mean ms", "p95 ms", "Max ms", "Rows"),
+                        (220, 70, 90, 80, 80, 80, 80), 8)
+        slow = table("Slow queries (newest first, select one for its plan)",
+                     ("When", "ms", "Helper", "SQL"), (140, 70, 160, 420), 5)
+        plan = tk.Label(parent, text="", font=("Courier", 9), bg=CARD, fg=TEXT,
+                        justify="left", anchor="w", wraplength=760)
+        plan.pack(padx=30, anchor="w", fill="x", pady=(4, 0))
+
+        helper_sync = TreeSync(helpers, lambda h: ((
+            h["name"], f"{h['count']:,}", f"{h['total_ms']:,.1f}", f"{h['mean_ms']:.2f}",
+            f"{h['p95_ms']:.2f}", f"{h['max_ms']:.1f}", f"{h['rows']:,}"), ()), key="name")
+        slow_sync = TreeSync(slow, lambda q: ((
+            q["at"].replace("T", " "), f"{q['ms']:,.1f}", q["helper"], q["sql"][:200]), ()))
+        entries = {}
+
+        def load():
+            snap = query_stats.snapshot(top=50)
+            conns = snap["connections"]
+            summary.config(text=(
+                f"Since {snap['since'].replace('T', ' ')}  ·  {conns['opened']} connection(s) "
+                f"opened ({conns['total_ms']:.1f} ms)  ·  slow-query threshold "
+                f"{snap['slow_query_ms']} ms  ·  log: {snap['slow_log'] or 'off'}\n"
+                + self._ui_summary(profiler.snapshot())))
+            helper_sync.apply([{"name": k, **v} for k, v in snap["helpers"].items()])
+            entries.clear()
+            rows = []
+            for i, q in enumerate(reversed(snap["slow"])):
+                entries[str(i)] = q
+                rows.append({"id": i, **q})
+            slow_sync.apply(rows)
+            plan.config(text="")
+
+        def show_plan(_event=None):
+            sel = slow.selection()
+            if sel and sel[0] in entries:
+                q = entries[sel[0]]
+                plan.config(text="\n".join([q["sql"]] + [f"  {p}" for p in q["plan"]]))
+        slow.bind("<<TreeviewSelect>>", show_plan)
+
+        def reset():
+            query_stats.reset()
+            profiler.reset()
+            load()
+
+        act = tk.Frame(parent, bg=CARD, padx=30)
+        act.pack(fill="x", pady=10)
+        tk.Button(act, text="🔄 Refresh", font=("Arial", 10),
+                  bg=ACCENT, fg=TEXT, relief="flat", cursor="hand2", padx=10, pady=5,
+                  command=load).pack(side="left")
+        tk.Button(act, text="🧹 Reset", font=("Arial", 10),
+                  bg=BORDER, fg=TEXT, relief="flat", cursor="hand2", padx=10, pady=5,
+                  command=reset).pack(side="left", padx=6)
+        load()
+        # Shown again (tab selected, or back from another page): take a fresh snapshot.
+        parent.bind("<Map>", lambda e: e.widget is parent and load(), add="+")
+
+    @staticmethod
+    def _ui_summary(ui):
+        pages = ", ".join(f"{name[5:]} {t['max_ms']:,.0f} ms"
+                          for name, t in list(ui["pages"].items())[:4]) or "none yet"
+        text = f"Slowest page builds: {pages}  ·  {len(ui['stalls'])} UI stall(s) over {ui['stall_ms']:.0f} ms"
+        if ui["stalls"]:
+            worst = max(ui["stalls"], key=lambda s: s["ms"])
+            text += f", worst {worst['ms']:,} ms in {worst['activity']} at {worst['where']}"
+        return text
@@ -0,0 +1,97 @@
+"""
+Hotel Management System - Incremental Treeview refresh
+Applies only the inserts, updates, deletes and moves needed to make a
+Treeview show a new row set, keeping scroll position and selection.
+"""
+
+
+class TreeSync:
+    """
+    Owns the rows of one Treeview.
+
+        sync = TreeSync(tree, lambda u: ((u["id"], u["username"]), ()))
+        sync.apply(get_all_users())
+
+    row_values(row) -> (values, tags). Rows are keyed by row[key], which
+    becomes the Treeview iid. The values last written for each iid are
+    remembered, so apply() never has to read rows back out of Tk: an
+    unchanged row costs no Tk call at all.
+    """
+
+    def __init__(self, tree, row_values, key="id"):
+        self.tree = tree
+        self.row_values = row_values
+        self.key = key
+        self.rendered = {}      # iid -> (values, tags) as last written
+        self.order = []         # iids in display order
+
+    def apply(self, rows):
+        """Make the tree show exactly `rows`, in order. Returns (inserted, updated, deleted)."""
+        new = {}
+        for r in rows:
+            values, tags = self.row_values(r)
+            new[str(r[self.key])] = (tuple(values), tuple(tags))
+        new_order = list(new)
+
+        stale = [iid for iid in self.order if iid not in new]
+        if stale:
+            self.tree.delete(*stale)
+        survivors = [iid for iid in self.order if iid in new]
+        # Survivors keep their relative order unless the sort changed.
+        reorder = survivors != [iid for iid in new_order if iid in self.rendered]
+
+        inserted = updated = 0
+        for index, iid in enumerate(new_order):
+            values, tags = new[iid]
+            old = self.rendered.get(iid)
+            if old is None:
+                self.tree.insert("", index, iid=iid, values=values, tags=tags)
+                inserted += 1
+                continue
+            if old != (values, tags):
+                self.tree.item(iid, values=values, tags=tags)
+                updated += 1
+            if reorder:
+                self.tree.move(iid, "", index)
+
+        self.rendered = new
+        self.order = new_order
+        return inserted, updated, len(stale)
+
+    def append(self, rows):
+        """Add rows at the end (next page of a paged table)."""
+        for r in rows:
+            iid = str(r[self.key])
+            values, tags = self.row_values(r)
+            values, tags = tuple(values), tuple(tags)
+            if iid in self.rendered:
+                if self.rendered[iid] != (values, tags):
+                    self.tree.item(iid, values=values, tags=tags)
+            else:
+                self.tree.insert("", "end", iid=iid, values=values, tags=tags)
+                self.order.append(iid)
+            self.rendered[iid] = (values, tags)
+
+    def patch(self, rows, removed=()):
+        """Rewrite the given rows where shown and delete the `removed` keys; the rest is untouched."""
+        gone = [str(k) for k in removed if str(k) in self.rendered]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self.rendered[iid]
+            self.order = [iid for iid in self.order if iid in self.rendered]
+        for r in rows:
+            iid = str(r[self.key])
+            if iid not in self.rendered:
+                continue
+            values, tags = self.row_values(r)
+            values, tags = tuple(values), tuple(tags)
+            if self.rendered[iid] != (values, tags):
+                self.tree.item(iid, values=values, tags=tags)
+                self.rendered[iid] = (values, tags)
+
+    def clear(self):
+        if self.order:
+            self.tree.delete(*self.order)
+        self.rendered = {}
+        self.order = []